@@ -8,6 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.infrastructure.database.connection import init_db, close_db
 from src.infrastructure.cache.redis_client import redis_client
+from src.infrastructure.browser.pool import browser_pool
+from src.infrastructure.queue.task_queue import task_queue
 from src.infrastructure.utils.config import settings
 from src.infrastructure.utils.logger import setup_logger
 
@@ -29,9 +31,17 @@ async def lifespan(app: FastAPI):
     # 初始化 Redis
     await redis_client.connect()
 
+    # 预热浏览器池
+    await browser_pool.start()
+
+    # 启动收集任务队列（恢复未完成任务）
+    await task_queue.start()
+
     yield
 
     # 关闭时
+    await task_queue.stop()
+    await browser_pool.close()
     await redis_client.close()
     await close_db()
     logger.info("应用已关闭")
@@ -2,12 +2,15 @@
 旅游攻略路由
 """
 
-from typing import List
+from typing import Any, Dict, List, Optional
+import json
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.core.services.guide_collector import GuideCollectorService
 from src.core.domain.models.post import PostDetail
+from src.infrastructure.queue.task_queue import task_queue
 from src.infrastructure.utils.logger import setup_logger
 
 
@@ -37,10 +40,75 @@ class PostResponse(BaseModel):
     tags: List[str]
 
 
+class TaskSubmitResponse(BaseModel):
+    """任务提交响应"""
+    task_id: str
+    status: str
+
+
+class TaskStatusResponse(BaseModel):
+    """任务状态响应"""
+    task_id: str
+    task_type: str
+    status: str
+    parameters: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+
+def to_post_response(post: PostDetail) -> PostResponse:
+    """PostDetail 转换为响应模型"""
+    return PostResponse(
+        post_id=post.post_id,
+        url=post.url,
+        title=post.title,
+        content=post.content,
+        author=post.author,
+        likes=post.likes,
+        comments=post.comments,
+        collects=post.collects,
+        engagement_rate=post.engagement_rate,
+        images=post.images,
+        tags=post.tags
+    )
+
+
+async def run_guide_collection_task(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    收集任务处理函数（由任务队列 worker 执行）
+
+    Args:
+        parameters: 任务参数（destination, max_posts）
+
+    Returns:
+        任务结果（帖子列表）
+    """
+    service = GuideCollectorService(
+        use_vision=False,
+        concurrent=True
+    )
+    posts = await service.collect_guides(
+        destination=parameters["destination"],
+        max_posts=parameters.get("max_posts", 10)
+    )
+    return {
+        "count": len(posts),
+        "posts": [to_post_response(post).model_dump() for post in posts]
+    }
+
+
+task_queue.register("guide", run_guide_collection_task)
+
+
 @router.post("/collect", response_model=List[PostResponse])
 async def collect_guides(request: CollectGuidesRequest):
     """
-    收集旅游攻略
+    收集旅游攻略（同步，请求在采集完成后返回）
+
+    长时间采集建议使用 POST /tasks 异步提交。
 
     Args:
         request: 收集请求
@@ -52,8 +120,7 @@ async def collect_guides(request: CollectGuidesRequest):
         # 创建服务实例
         service = GuideCollectorService(
             use_vision=False,
-            concurrent=True,
-            max_concurrent=2
+            concurrent=True
         )
 
         # 执行收集
@@ -63,22 +130,7 @@ async def collect_guides(request: CollectGuidesRequest):
         )
 
         # 转换为响应格式
-        return [
-            PostResponse(
-                post_id=post.post_id,
-                url=post.url,
-                title=post.title,
-                content=post.content,
-                author=post.author,
-                likes=post.likes,
-                comments=post.comments,
-                collects=post.collects,
-                engagement_rate=post.engagement_rate,
-                images=post.images,
-                tags=post.tags
-            )
-            for post in posts
-        ]
+        return [to_post_response(post) for post in posts]
 
     except Exception as e:
         logger.error(f"收集攻略失败: {e}")
@@ -111,23 +163,74 @@ async def get_high_quality_guides(
             min_engagement_rate=min_engagement_rate
         )
 
-        return [
-            PostResponse(
-                post_id=post.post_id,
-                url=post.url,
-                title=post.title,
-                content=post.content,
-                author=post.author,
-                likes=post.likes,
-                comments=post.comments,
-                collects=post.collects,
-                engagement_rate=post.engagement_rate,
-                images=post.images,
-                tags=post.tags
-            )
-            for post in high_quality
-        ]
+        return [to_post_response(post) for post in high_quality]
 
     except Exception as e:
         logger.error(f"获取高质量攻略失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/tasks", response_model=TaskSubmitResponse, status_code=202)
+async def submit_collect_task(request: CollectGuidesRequest):
+    """
+    提交异步收集任务
+
+    立即返回 task_id，采集由后台 worker 池执行。
+
+    Args:
+        request: 收集请求
+
+    Returns:
+        任务 ID 和初始状态
+    """
+    try:
+        task_id = await task_queue.submit(
+            "guide",
+            {"destination": request.destination, "max_posts": request.max_posts}
+        )
+        return TaskSubmitResponse(task_id=task_id, status="pending")
+
+    except Exception as e:
+        logger.error(f"提交收集任务失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
+async def get_collect_task(task_id: str):
+    """
+    查询收集任务状态（轮询）
+
+    Args:
+        task_id: 任务 ID
+
+    Returns:
+        任务状态，完成后包含收集结果
+    """
+    task = await task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
+    return TaskStatusResponse(**task)
+
+
+@router.get("/tasks/{task_id}/events")
+async def stream_collect_task(task_id: str):
+    """
+    订阅收集任务状态（Server-Sent Events）
+
+    每次状态变化推送一条事件，任务结束后关闭连接。
+
+    Args:
+        task_id: 任务 ID
+
+    Returns:
+        text/event-stream 响应
+    """
+    if await task_queue.get(task_id) is None:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
+
+    async def event_stream():
+        async for snapshot in task_queue.subscribe(task_id):
+            data = json.dumps(snapshot, ensure_ascii=False)
+            yield f"event: {snapshot['status']}\ndata: {data}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
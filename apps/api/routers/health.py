@@ -6,6 +6,9 @@ from fastapi import APIRouter
 from datetime import datetime
 
 from src.infrastructure.utils.config import settings
+from src.infrastructure.browser.pool import browser_pool
+from src.infrastructure.external.xiaohongshu.concurrency import detail_concurrency
+from src.infrastructure.external.xiaohongshu.retry_policy import retry_policy
 
 
 router = APIRouter()
@@ -36,3 +39,39 @@ async def ping():
         Pong 响应
     """
     return {"message": "pong"}
+
+
+@router.get("/health/browser-pool")
+async def browser_pool_status():
+    """
+    浏览器池状态
+
+    Returns:
+        池容量、空闲/借出数量及启动/复用/回收统计
+    """
+    return browser_pool.stats()
+
+
+@router.get("/health/detail-concurrency")
+async def detail_concurrency_status():
+    """
+    详情收集自适应并发状态
+
+    Returns:
+        当前并发上限、进行中数量、近期成功率及过载/调整统计
+    """
+    return detail_concurrency.stats()
+
+
+@router.get("/health/retry-policy")
+async def retry_policy_status():
+    """
+    详情收集重试策略状态
+
+    Returns:
+        各类失败次数、重试次数、熔断器状态及死信列表
+    """
+    return {
+        **retry_policy.stats(),
+        "dead_letters": retry_policy.dead_letters.entries(),
+    }
@@ -3,7 +3,11 @@
 """
 
 from typing import List, Optional, Dict, Any
+import asyncio
+import json
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.core.services.guide_collector import GuideCollectorService
@@ -154,3 +158,71 @@ async def get_destination_summary(destination: str):
     except Exception as e:
         logger.error(f"获取目的地摘要失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """格式化一条 Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/destinations/{destination}/summary/stream")
+async def stream_destination_summary(destination: str, max_posts: int = 5):
+    """
+    流式获取目的地攻略摘要（Server-Sent Events）
+
+    事件顺序：
+    - progress: 收集进度（列表完成、每个帖子完成、收集完成）
+    - guides: 收集到的攻略数量
+    - token: Gemini 生成的摘要片段
+    - done: 摘要生成完毕
+    - error: 出错（之后关闭连接）
+
+    Args:
+        destination: 目的地名称
+        max_posts: 收集数量
+
+    Returns:
+        text/event-stream 响应
+    """
+    async def event_stream():
+        progress: asyncio.Queue = asyncio.Queue()
+        guide_service = GuideCollectorService()
+        collect_task = asyncio.create_task(guide_service.collect_guides(
+            destination=destination,
+            max_posts=max_posts,
+            on_progress=progress.put_nowait
+        ))
+
+        try:
+            # 收集阶段：转发进度事件，直到收集结束
+            while not collect_task.done() or not progress.empty():
+                getter = asyncio.ensure_future(progress.get())
+                await asyncio.wait({getter, collect_task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield sse_event("progress", getter.result())
+                else:
+                    getter.cancel()
+
+            guides = collect_task.result()
+            yield sse_event("guides", {"destination": destination, "guide_count": len(guides)})
+
+            # 摘要阶段：逐段转发 Gemini 输出
+            ai_client = GeminiClient()
+            async for chunk in ai_client.stream_summary(
+                guides=[g.content for g in guides],
+                destination=destination
+            ):
+                yield sse_event("token", {"text": chunk})
+
+            yield sse_event("done", {"destination": destination})
+
+        except Exception as e:
+            logger.error(f"流式获取目的地摘要失败: {e}")
+            yield sse_event("error", {"detail": str(e)})
+
+        finally:
+            # 客户端断开时不再等待收集结果
+            if not collect_task.done():
+                collect_task.cancel()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
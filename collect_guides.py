@@ -14,24 +14,34 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.services.guide_collector import GuideCollectorService
 from src.storage.local_storage import LocalStorage
+from src.infrastructure.browser.pool import browser_pool
 
 
 async def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="收集旅游攻略")
-    parser.add_argument("destination", help="目的地名称，如：成都、北京")
+    parser.add_argument("destination", nargs="?", help="目的地名称，如：成都、北京")
     parser.add_argument("--max-posts", type=int, default=5, help="最大收集数量（默认 5）")
     parser.add_argument("--use-vision", action="store_true", help="启用视觉模式（显示元素标识）")
     parser.add_argument("--concurrent", action="store_true", help="启用并发收集")
     parser.add_argument("--max-concurrent", type=int, default=2, help="最大并发数（默认 2）")
+    parser.add_argument("--resume", metavar="BATCH_DIR",
+                        help="断点续跑中断的批次目录（只重新收集缺失或失败的帖子；"
+                             "旧版本批次没有清单，需要同时指定目的地）")
 
     args = parser.parse_args()
+    if not args.destination and not args.resume:
+        parser.error("需要指定目的地，或使用 --resume 续跑已有批次")
 
     print("=" * 60)
-    print(f"🔍 开始收集 {args.destination} 的旅游攻略")
+    if args.resume:
+        print(f"🔁 断点续跑批次 {args.resume}")
+    else:
+        print(f"🔍 开始收集 {args.destination} 的旅游攻略")
     print("=" * 60)
-    print(f"最大收集数量: {args.max_posts}")
+    if not args.resume:
+        print(f"最大收集数量: {args.max_posts}")
     print(f"视觉模式: {'开启' if args.use_vision else '关闭'}")
     print(f"并发收集: {'开启' if args.concurrent else '关闭'}")
     if args.concurrent:
@@ -50,10 +60,17 @@ async def main():
     try:
         # 收集攻略
         print("🌐 正在收集攻略...")
-        posts = await collector.collect_guides(
-            destination=args.destination,
-            max_posts=args.max_posts
-        )
+        if args.resume:
+            posts = await collector.resume_collection(
+                args.resume,
+                destination=args.destination,
+                max_posts=args.max_posts
+            )
+        else:
+            posts = await collector.collect_guides(
+                destination=args.destination,
+                max_posts=args.max_posts
+            )
 
         if not posts:
             print("❌ 未收集到任何攻略")
@@ -64,8 +81,8 @@ async def main():
 
         # 保存到本地存储
         print("💾 保存攻略到本地存储...")
+        storage.save_posts(posts)
         for post in posts:
-            storage.save_post(post)
             print(f"  ✓ {post.title}")
 
         print()
@@ -84,6 +101,10 @@ async def main():
         print(f"❌ 收集失败: {e}")
         raise
 
+    finally:
+        # 关闭浏览器池中的浏览器
+        await browser_pool.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+领域模型内存 / 属性访问基准
+
+对比普通 @dataclass（实例 __dict__、字符串不驻留、互动率每次计算）
+与当前 __slots__ 版本 PostDetail 的：
+- 单个对象内存占用（tracemalloc，包含作者和标签字符串）
+- 字段读取和 engagement_rate 读取耗时
+
+用法:
+    python scripts/benchmark_models.py [--count 20000]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.domain.models.post import PostDetail  # noqa: E402
+
+
+@dataclass
+class LegacyPostDetail:
+    """优化前的 PostDetail（普通 dataclass）"""
+
+    post_id: str
+    url: str
+    title: str
+    content: str
+    author: str
+    likes: int
+    comments: int
+    collects: int
+    images: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    publish_time: Optional[str] = None
+    location: Optional[str] = None
+
+    @property
+    def engagement_rate(self) -> float:
+        total_engagement = self.likes + self.comments + self.collects
+        return total_engagement / (self.likes + 1)
+
+
+def fresh(text: str) -> str:
+    """生成内容相同的新字符串对象（模拟从 JSON 反序列化）"""
+    return "".join(list(text))
+
+
+def make_posts(cls: Callable, count: int) -> list:
+    """构造模拟攻略：500 个作者、50 个热门标签"""
+    rng = random.Random(42)
+    authors = [f"旅行达人{i}" for i in range(500)]
+    tags = [f"#目的地标签{i}" for i in range(50)]
+    return [
+        cls(
+            post_id=f"{i:024x}",
+            url=f"https://www.xiaohongshu.com/explore/{i:024x}",
+            title=f"攻略标题{i}",
+            content="正文" * 50,
+            author=fresh(rng.choice(authors)),
+            likes=rng.randint(0, 10000),
+            comments=rng.randint(0, 500),
+            collects=rng.randint(0, 3000),
+            tags=[fresh(tag) for tag in rng.sample(tags, 5)],
+            location=fresh("成都"),
+        )
+        for i in range(count)
+    ]
+
+
+def measure_memory(cls: Callable, count: int) -> float:
+    """单个对象平均占用字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    posts = make_posts(cls, count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del posts
+    return (after - before) / count
+
+
+def measure_access(cls: Callable, number: int = 1_000_000, repeat: int = 5) -> tuple:
+    """字段读取 / 互动率读取耗时（纳秒/次，取多次运行的最小值）"""
+    post = make_posts(cls, 1)[0]
+
+    def best(stmt: str) -> float:
+        timings = timeit.repeat(stmt, globals={"post": post}, number=number, repeat=repeat)
+        return min(timings) / number * 1e9
+
+    return best("post.likes"), best("post.engagement_rate")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="领域模型内存 / 属性访问基准")
+    parser.add_argument("--count", type=int, default=20000, help="构造的帖子数量")
+    args = parser.parse_args()
+
+    print(f"{'='*60}")
+    print(f"PostDetail 基准（{args.count} 个对象）")
+    print(f"{'='*60}")
+    print(f"{'版本':<16}{'字节/对象':>12}{'字段读取(ns)':>16}{'互动率(ns)':>14}")
+
+    results = {}
+    for name, cls in [("dataclass", LegacyPostDetail), ("slots+intern", PostDetail)]:
+        memory = measure_memory(cls, args.count)
+        field_ns, rate_ns = measure_access(cls)
+        results[name] = memory
+        print(f"{name:<16}{memory:>12.0f}{field_ns:>16.1f}{rate_ns:>14.1f}")
+
+    ratio = results["dataclass"] / results["slots+intern"]
+    print(f"\n同样内存可容纳的帖子数: {ratio:.2f} 倍")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
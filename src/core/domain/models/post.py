@@ -9,13 +9,31 @@
 engagement_rate = (likes + comments + collects) / (likes + 1)
 
 使用 likes + 1 作为分母避免除零错误，同时使得新帖子（0赞）也有合理的初始互动率。
+PostDetail 缓存计算结果，likes / comments / collects 被修改时失效，
+排序和比较时不再重复计算。
+
+内存布局：模型使用 __slots__（没有实例 __dict__），内存中常驻数万篇帖子时
+单个对象占用显著减少；作者和标签字符串驻留（sys.intern），
+重复出现的作者名、热门标签在内存中只保存一份。
+Post 是只读的基本信息，额外声明为 frozen。
 """
 
 from dataclasses import dataclass, field
 from typing import List, Optional
+import sys
+
+
+# 参与互动率计算的字段
+_ENGAGEMENT_FIELDS = frozenset({"likes", "comments", "collects"})
+
 
+class _EngagementRateCache:
+    """互动率缓存槽（不是 dataclass 字段，不出现在 asdict / 构造参数中）"""
 
-@dataclass
+    __slots__ = ("_engagement_rate",)
+
+
+@dataclass(slots=True, frozen=True)
 class Post:
     """
     帖子基本信息
@@ -23,7 +41,7 @@ class Post:
     包含帖子的核心数据，用于列表展示和基础查询。
 
     Attributes:
-        post_id: 帖子唯一标识符
+        post_id: 帖子唯一标识符（小红书笔记 ID，见 shared.utils.parse_note_id）
         url: 帖子链接
         title: 标题
         content: 内容正文
@@ -41,8 +59,8 @@ class Post:
     collects: int
 
 
-@dataclass
-class PostDetail:
+@dataclass(slots=True)
+class PostDetail(_EngagementRateCache):
     """
     帖子详细信息
 
@@ -50,7 +68,7 @@ class PostDetail:
     主要用于详情页展示和深度分析。
 
     Attributes:
-        post_id: 帖子唯一标识符
+        post_id: 帖子唯一标识符（小红书笔记 ID，见 shared.utils.parse_note_id）
         url: 帖子链接
         title: 标题
         content: 内容正文
@@ -64,7 +82,7 @@ class PostDetail:
         location: 地理位置（可选）
 
     Properties:
-        engagement_rate: 互动率（计算属性）
+        engagement_rate: 互动率（计算属性，结果缓存）
 
     Example:
         >>> post = PostDetail(
@@ -95,6 +113,18 @@ class PostDetail:
     publish_time: Optional[str] = None
     location: Optional[str] = None
 
+    def __post_init__(self):
+        # 驻留作者和标签字符串，相同内容共享同一个对象
+        if isinstance(self.author, str):
+            self.author = sys.intern(self.author)
+        self.tags = [sys.intern(tag) if isinstance(tag, str) else tag for tag in self.tags]
+
+    def __setattr__(self, name, value):
+        # 互动计数变化时清除互动率缓存
+        if name in _ENGAGEMENT_FIELDS:
+            object.__setattr__(self, "_engagement_rate", None)
+        object.__setattr__(self, name, value)
+
     @property
     def engagement_rate(self) -> float:
         """
@@ -114,5 +144,9 @@ class PostDetail:
             >>> post = PostDetail(..., likes=100, comments=10, collects=20, ...)
             >>> post.engagement_rate  # (100+10+20)/(100+1) = 1.287...
         """
-        total_engagement = self.likes + self.comments + self.collects
-        return total_engagement / (self.likes + 1)
+        rate = self._engagement_rate
+        if rate is None:
+            total_engagement = self.likes + self.comments + self.collects
+            rate = total_engagement / (self.likes + 1)
+            object.__setattr__(self, "_engagement_rate", rate)
+        return rate
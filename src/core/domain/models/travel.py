@@ -8,6 +8,8 @@
 - Attraction/Restaurant: 景点和餐厅信息
 - Budget: 预算明细
 - TravelPlan: 完整旅行计划
+
+Activity 和 DayPlan 在每个行程中大量创建，使用 __slots__ 减少内存占用。
 """
 
 from dataclasses import dataclass, field
@@ -15,7 +17,7 @@ from datetime import datetime
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Activity:
     """
     单个活动
@@ -39,7 +41,7 @@ class Activity:
     cost: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DayPlan:
     """
     单日行程计划
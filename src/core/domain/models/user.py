@@ -6,13 +6,15 @@
 影响力评分算法：
 - 基础评分 = (粉丝数 × 0.4) + (点赞数 / 100 × 0.3) + (发帖数 × 2 × 0.3)
 - 认证加成 = 基础评分 × 1.5
+
+UserProfile 是抓取时刻的资料快照：使用 __slots__ 并声明为 frozen（只读、可哈希）。
 """
 
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserProfile:
     """
     用户资料
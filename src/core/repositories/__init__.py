@@ -2,12 +2,14 @@
 数据仓储模块
 """
 
+from .engagement_ranking import EngagementRanking
 from .post_repository import PostRepository, InMemoryPostRepository
 from .travel_repository import TravelPlanRepository, InMemoryTravelPlanRepository
 
 __all__ = [
     "PostRepository",
     "InMemoryPostRepository",
+    "EngagementRanking",
     "TravelPlanRepository",
     "InMemoryTravelPlanRepository",
 ]
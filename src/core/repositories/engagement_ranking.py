@@ -0,0 +1,97 @@
+"""
+互动率排名索引
+
+find_high_quality 原先每次调用都要筛选全部帖子再排序（O(n log n)）。
+这里维护一个按互动率降序排列的有序列表，随保存/删除增量更新：
+- 写入：二分查找定位，O(log n) 比较 + 一次列表内存移动
+- 查询前 k 条：从头顺序读取，遇到低于阈值的互动率即停止，O(k)
+
+列表元素为 (-互动率, post_id)，互动率相同时按 post_id 排序，结果稳定。
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class EngagementRanking:
+    """按互动率降序的帖子排名（非线程安全，由仓储负责并发控制）"""
+
+    def __init__(self):
+        """初始化空排名"""
+        self._keys: List[Tuple[float, str]] = []
+        self._rates: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._rates
+
+    def add(self, post_id: str, engagement_rate: float) -> None:
+        """
+        添加或更新帖子的排名
+
+        Args:
+            post_id: 帖子 ID
+            engagement_rate: 互动率
+        """
+        previous = self._rates.get(post_id)
+        if previous == engagement_rate:
+            return
+        if previous is not None:
+            self._discard(post_id, previous)
+
+        insort(self._keys, (-engagement_rate, post_id))
+        self._rates[post_id] = engagement_rate
+
+    def remove(self, post_id: str) -> bool:
+        """
+        移除帖子
+
+        Args:
+            post_id: 帖子 ID
+
+        Returns:
+            帖子存在返回 True
+        """
+        rate = self._rates.pop(post_id, None)
+        if rate is None:
+            return False
+        self._discard(post_id, rate)
+        return True
+
+    def top(
+        self,
+        min_engagement_rate: float = 0.0,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        互动率最高的帖子
+
+        Args:
+            min_engagement_rate: 最小互动率
+            limit: 最大数量（None 表示全部满足条件的帖子）
+
+        Returns:
+            帖子 ID 列表（按互动率降序）
+        """
+        results = []
+        for negative_rate, post_id in self._keys:
+            if -negative_rate < min_engagement_rate:
+                break
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(post_id)
+        return results
+
+    def clear(self) -> None:
+        """清空排名"""
+        self._keys.clear()
+        self._rates.clear()
+
+    def _discard(self, post_id: str, rate: float) -> None:
+        """从有序列表中删除一项"""
+        key = (-rate, post_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
@@ -10,10 +10,12 @@
 - Protocol-based Interface: Python 3.8+ 结构化类型
 """
 
-from typing import List, Optional, Protocol, Dict
+from typing import Iterable, List, Optional, Protocol, Dict
 from datetime import datetime
 
 from ..domain.models.post import Post, PostDetail
+from .engagement_ranking import EngagementRanking
+from ...infrastructure.search import GuideSearchIndex
 
 
 class PostRepository(Protocol):
@@ -44,6 +46,21 @@ class PostRepository(Protocol):
         """
         ...
 
+    async def save_many(self, posts: Iterable[PostDetail]) -> int:
+        """
+        批量保存帖子（一次事务 / 一次批量写入，已存在的帖子被更新）
+
+        Args:
+            posts: 帖子序列
+
+        Returns:
+            int: 保存的帖子数量
+
+        Raises:
+            DatabaseError: 数据库操作失败
+        """
+        ...
+
     async def find_by_id(self, post_id: str) -> Optional[PostDetail]:
         """
         根据 ID 查找帖子
@@ -128,6 +145,8 @@ class InMemoryPostRepository:
 
     Attributes:
         _posts: 内存中的帖子存储（字典）
+        _search: 全文检索索引（随 save/delete 增量更新）
+        _ranking: 互动率排名索引（随 save/delete 增量更新）
 
     Example:
         >>> repo = InMemoryPostRepository()
@@ -140,6 +159,8 @@ class InMemoryPostRepository:
     def __init__(self):
         """初始化内存存储"""
         self._posts: Dict[str, PostDetail] = {}
+        self._search = GuideSearchIndex()
+        self._ranking = EngagementRanking()
 
     async def save(self, post: PostDetail) -> PostDetail:
         """
@@ -152,8 +173,26 @@ class InMemoryPostRepository:
             PostDetail: 保存的帖子对象
         """
         self._posts[post.post_id] = post
+        self._search.add(post)
+        self._ranking.add(post.post_id, post.engagement_rate)
         return post
 
+    async def save_many(self, posts: Iterable[PostDetail]) -> int:
+        """
+        批量保存帖子到内存
+
+        Args:
+            posts: 帖子序列
+
+        Returns:
+            int: 保存的帖子数量
+        """
+        count = 0
+        for post in posts:
+            await self.save(post)
+            count += 1
+        return count
+
     async def find_by_id(self, post_id: str) -> Optional[PostDetail]:
         """
         根据 ID 查找帖子
@@ -176,10 +215,10 @@ class InMemoryPostRepository:
         """
         根据目的地查找帖子
 
-        实现简单的关键词匹配（不区分大小写）。
-        生产环境建议使用全文搜索引擎（如 Elasticsearch）。
+        通过全文检索索引查找（中文 bigram 倒排 + BM25），
+        支持目的地别称（如「蓉城」），结果按相关性与互动率综合排序。
 
-        时间复杂度: O(n)，n 为帖子总数
+        时间复杂度: 与命中的倒排表长度成正比，不再扫描全部帖子
 
         Args:
             destination: 目的地名称
@@ -188,11 +227,10 @@ class InMemoryPostRepository:
         Returns:
             List[PostDetail]: 匹配的帖子列表
         """
-        results = [
-            post for post in self._posts.values()
-            if destination in post.title or destination in post.content
+        return [
+            self._posts[post_id]
+            for post_id, _ in self._search.search(destination, limit=limit)
         ]
-        return results[:limit]
 
     async def find_high_quality(
         self,
@@ -202,9 +240,10 @@ class InMemoryPostRepository:
         """
         查找高质量帖子
 
-        筛选互动率高于阈值的帖子，并按互动率降序排序。
+        从互动率排名索引头部读取，遇到低于阈值的帖子即停止。
+        排名在 save 时记录，保存后原地修改的帖子需要重新 save。
 
-        时间复杂度: O(n log n)，n 为帖子总数（排序开销）
+        时间复杂度: O(k)，k 为返回数量，不再筛选和排序全部帖子
 
         Args:
             min_engagement_rate: 最小互动率
@@ -213,17 +252,11 @@ class InMemoryPostRepository:
         Returns:
             List[PostDetail]: 高质量帖子列表（按互动率降序）
         """
-        # 筛选符合条件的帖子
-        results = [
-            post for post in self._posts.values()
-            if post.engagement_rate >= min_engagement_rate
+        return [
+            self._posts[post_id]
+            for post_id in self._ranking.top(min_engagement_rate, limit)
         ]
 
-        # 按互动率降序排序
-        results.sort(key=lambda p: p.engagement_rate, reverse=True)
-
-        return results[:limit]
-
     async def delete(self, post_id: str) -> bool:
         """
         删除帖子
@@ -238,5 +271,7 @@ class InMemoryPostRepository:
         """
         if post_id in self._posts:
             del self._posts[post_id]
+            self._search.remove(post_id)
+            self._ranking.remove(post_id)
             return True
         return False
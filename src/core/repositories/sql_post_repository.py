@@ -0,0 +1,239 @@
+"""
+SQLAlchemy 版帖子仓储实现
+
+基于 PostModel 和 database/connection.py 中的异步引擎，实现 PostRepository 协议：
+- save / save_many 使用 INSERT ... ON CONFLICT DO UPDATE 批量 upsert（PostgreSQL / SQLite）
+- engagement_rate 是数据库生成列并建有索引，find_high_quality 在数据库中
+  通过 WHERE + ORDER BY + LIMIT 完成，不再把所有帖子读到 Python 中排序
+- location 建有索引，目的地查询优先命中地点
+
+注意：本模块导入时会创建数据库引擎（需要安装对应驱动），
+因此没有在 repositories 包中默认导出，使用时直接从本模块导入。
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..domain.models.post import PostDetail
+from ...infrastructure.database.connection import async_session_maker
+from ...infrastructure.database.models import PostModel
+from ...infrastructure.search import expand_synonyms
+
+
+# upsert 时更新的字段（engagement_rate 为生成列，由数据库重新计算）
+UPSERT_COLUMNS = (
+    "url", "title", "content", "author", "likes", "comments", "collects",
+    "images", "tags", "publish_time", "location",
+)
+
+# 单条 INSERT 语句包含的最大行数（避免超出数据库的参数个数上限）
+UPSERT_CHUNK_SIZE = 500
+
+
+class SqlPostRepository:
+    """
+    数据库版帖子仓储实现
+
+    Example:
+        >>> repo = SqlPostRepository()
+        >>> await repo.save_many(posts)
+        >>> top = await repo.find_high_quality(min_engagement_rate=0.08, limit=10)
+    """
+
+    def __init__(self, session_maker=async_session_maker):
+        """
+        初始化仓储
+
+        Args:
+            session_maker: 数据库会话工厂
+        """
+        self.session_maker = session_maker
+
+    async def save(self, post: PostDetail) -> PostDetail:
+        """
+        保存帖子（已存在则更新）
+
+        Args:
+            post: 帖子详情对象
+
+        Returns:
+            PostDetail: 保存的帖子对象
+        """
+        await self.save_many([post])
+        return post
+
+    async def save_many(self, posts: Iterable[PostDetail]) -> int:
+        """
+        批量保存帖子（一个事务内分块执行 INSERT ... ON CONFLICT DO UPDATE）
+
+        Args:
+            posts: 帖子序列
+
+        Returns:
+            int: 保存的帖子数量
+        """
+        # 同一批次中重复的 post_id 会导致 ON CONFLICT 报错，以最后一次为准
+        rows = list({post.post_id: self._to_row(post) for post in posts}.values())
+        if not rows:
+            return 0
+
+        async with self.session_maker() as session:
+            insert = self._insert_for(session.bind.dialect.name)
+            for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = insert(PostModel).values(rows[start:start + UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[PostModel.post_id],
+                    set_={
+                        **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                        "updated_at": stmt.excluded.updated_at,
+                    }
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+        return len(rows)
+
+    async def find_by_id(self, post_id: str) -> Optional[PostDetail]:
+        """
+        根据 ID 查找帖子
+
+        Args:
+            post_id: 帖子 ID（小红书笔记 ID）
+
+        Returns:
+            Optional[PostDetail]: 帖子对象或 None
+        """
+        async with self.session_maker() as session:
+            model = await session.get(PostModel, post_id)
+            return self._to_post(model) if model else None
+
+    async def find_by_destination(
+        self,
+        destination: str,
+        limit: int = 10
+    ) -> List[PostDetail]:
+        """
+        根据目的地查找帖子
+
+        地点等于目的地（或其别称）的帖子走 location 索引，
+        同时匹配标题/正文包含目的地的帖子，结果按互动率降序。
+
+        Args:
+            destination: 目的地名称
+            limit: 最大返回数量
+
+        Returns:
+            List[PostDetail]: 匹配的帖子列表
+        """
+        conditions = []
+        for name in expand_synonyms(destination):
+            conditions.extend([
+                PostModel.location == name,
+                PostModel.title.contains(name),
+                PostModel.content.contains(name),
+            ])
+
+        stmt = (
+            select(PostModel)
+            .where(or_(*conditions))
+            .order_by(PostModel.engagement_rate.desc())
+            .limit(limit)
+        )
+        async with self.session_maker() as session:
+            result = await session.execute(stmt)
+            return [self._to_post(model) for model in result.scalars()]
+
+    async def find_high_quality(
+        self,
+        min_engagement_rate: float = 0.05,
+        limit: int = 10
+    ) -> List[PostDetail]:
+        """
+        查找高质量帖子
+
+        在数据库中按 engagement_rate 索引过滤和排序，只返回前 limit 条。
+
+        Args:
+            min_engagement_rate: 最小互动率
+            limit: 最大返回数量
+
+        Returns:
+            List[PostDetail]: 高质量帖子列表（按互动率降序）
+        """
+        stmt = (
+            select(PostModel)
+            .where(PostModel.engagement_rate >= min_engagement_rate)
+            .order_by(PostModel.engagement_rate.desc())
+            .limit(limit)
+        )
+        async with self.session_maker() as session:
+            result = await session.execute(stmt)
+            return [self._to_post(model) for model in result.scalars()]
+
+    async def delete(self, post_id: str) -> bool:
+        """
+        删除帖子
+
+        Args:
+            post_id: 帖子 ID
+
+        Returns:
+            bool: 删除成功返回 True，不存在返回 False
+        """
+        async with self.session_maker() as session:
+            result = await session.execute(
+                delete(PostModel).where(PostModel.post_id == post_id)
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    @staticmethod
+    def _insert_for(dialect_name: str):
+        """选择支持 ON CONFLICT 的 INSERT 构造器"""
+        if dialect_name == "postgresql":
+            return postgresql.insert
+        if dialect_name == "sqlite":
+            return sqlite.insert
+        raise NotImplementedError(f"不支持的数据库: {dialect_name}")
+
+    @staticmethod
+    def _to_row(post: PostDetail) -> dict:
+        """PostDetail 转换为插入行"""
+        now = datetime.utcnow()
+        return {
+            "post_id": post.post_id,
+            "url": post.url,
+            "title": post.title,
+            "content": post.content,
+            "author": post.author,
+            "likes": post.likes,
+            "comments": post.comments,
+            "collects": post.collects,
+            "images": post.images,
+            "tags": post.tags,
+            "publish_time": post.publish_time,
+            "location": post.location,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    @staticmethod
+    def _to_post(model: PostModel) -> PostDetail:
+        """数据库模型转换为 PostDetail"""
+        return PostDetail(
+            post_id=model.post_id,
+            url=model.url,
+            title=model.title,
+            content=model.content,
+            author=model.author or "",
+            likes=model.likes or 0,
+            comments=model.comments or 0,
+            collects=model.collects or 0,
+            images=model.images or [],
+            tags=model.tags or [],
+            publish_time=model.publish_time,
+            location=model.location
+        )
@@ -2,19 +2,33 @@
 旅游攻略收集服务
 """
 
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-import json
 import asyncio
 
 from ...core.domain.models.post import Post, PostDetail
 from ...infrastructure.external.xiaohongshu.collector import XiaohongshuCollector
+from ...infrastructure.browser.pool import BrowserPool, browser_pool as default_browser_pool
+from ...infrastructure.browser.profile import ProductionBrowserProfile, browser_profile as default_browser_profile
+from ...infrastructure.external.xiaohongshu.scout_cache import ScoutCache, scout_cache as default_scout_cache
+from ...infrastructure.external.xiaohongshu.dom_extractor import DomExtractor
+from ...infrastructure.external.xiaohongshu.seen_posts import SeenPostsStore, seen_posts as default_seen_posts
+from ...infrastructure.external.xiaohongshu.concurrency import AdaptiveConcurrency, detail_concurrency as default_detail_concurrency
+from ...infrastructure.external.xiaohongshu.retry_policy import RetryPolicy, retry_policy as default_retry_policy
+from ...infrastructure.cache.redis_client import RedisClient, redis_client
 from ...infrastructure.utils.logger import setup_logger
+from ...infrastructure.utils.singleflight import SingleFlight
+from ...shared.constants import GUIDE_CACHE_TTL
+from ...storage.batch_reader import load_batch
 
 
 logger = setup_logger(__name__)
 
+# 进程级请求合并：相同 (目的地, 数量, 模式) 的并发收集只执行一次
+_collect_flight = SingleFlight()
+
 
 class GuideCollectorService:
     """旅游攻略收集服务"""
@@ -24,7 +38,17 @@ class GuideCollectorService:
         output_dir: str = "./collected_posts",
         use_vision: bool = False,
         concurrent: bool = False,
-        max_concurrent: int = 2
+        max_concurrent: int = 2,
+        browser_pool: Optional[BrowserPool] = None,
+        scout_cache: Optional[ScoutCache] = None,
+        use_dom_extraction: bool = True,
+        cache: Optional[RedisClient] = None,
+        seen_posts: Optional[SeenPostsStore] = None,
+        incremental: bool = True,
+        browser_profile: Optional[ProductionBrowserProfile] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        adaptive_concurrency: bool = True,
+        retry_policy: Optional[RetryPolicy] = None
     ):
         """
         初始化服务
@@ -33,40 +57,108 @@ class GuideCollectorService:
             output_dir: 输出目录
             use_vision: 是否启用视觉模式
             concurrent: 是否并发收集
-            max_concurrent: 最大并发数
+            max_concurrent: 最大并发数（关闭自适应并发时使用）
+            browser_pool: 浏览器池（默认使用进程级全局浏览器池）
+            scout_cache: Scout 报告缓存（默认使用全局缓存）
+            use_dom_extraction: 是否优先使用 DOM 直接提取（失败时回退到 AI）
+            cache: 收集结果缓存（默认使用全局 Redis 客户端）
+            seen_posts: 已收集帖子记录（默认使用全局记录）
+            incremental: 是否增量收集（跳过已收集且无明显变化的帖子详情）
+            browser_profile: 浏览器配置（默认使用全局生产配置：无头 + 资源拦截）
+            concurrency: 详情并发控制器（默认使用全局 AIMD 控制器，上限在多次收集间保留）
+            adaptive_concurrency: 是否自适应调整并发数（关闭时固定使用 max_concurrent）
+            retry_policy: 详情重试策略（默认使用全局策略：分类退避 + 共享熔断器 + 死信列表）
         """
         self.output_dir = Path(output_dir)
         self.use_vision = use_vision
         self.concurrent = concurrent
         self.max_concurrent = max_concurrent
+        self.browser_pool = browser_pool or default_browser_pool
+        self.scout_cache = scout_cache or default_scout_cache
+        self.dom_extractor = DomExtractor() if use_dom_extraction else None
+        self.cache = cache or redis_client
+        self.seen_posts = (seen_posts or default_seen_posts) if incremental else None
+        self.browser_profile = browser_profile or default_browser_profile
+        self.concurrency = (concurrency or default_detail_concurrency) if adaptive_concurrency else None
+        self.retry_policy = retry_policy or default_retry_policy
 
     async def collect_guides(
         self,
         destination: str,
-        max_posts: int = 10
+        max_posts: int = 10,
+        force_refresh: bool = False,
+        on_progress: Optional[Callable[[Dict], Any]] = None
     ) -> List[PostDetail]:
         """
         收集指定目的地的旅游攻略
 
+        近期结果直接从 Redis 返回；相同参数的并发调用合并为一次收集。
+
         Args:
             destination: 目的地名称
             max_posts: 收集数量
+            force_refresh: 跳过缓存，重新收集
+            on_progress: 收集进度回调（命中缓存或合并到他人的收集时不会触发）
 
         Returns:
             帖子详情列表
         """
-        logger.info(f"开始收集 {destination} 的旅游攻略，目标数量: {max_posts}")
+        mode = "concurrent" if self.concurrent else "sequential"
+        cache_key = f"guides:{destination}:{max_posts}:{mode}"
 
-        # 构建搜索 URL
-        search_url = f"https://www.xiaohongshu.com/search_result?keyword={destination}+旅游攻略"
+        if not force_refresh:
+            cached = await self.cache.get_json(cache_key)
+            if cached:
+                logger.info(f"命中攻略缓存: {cache_key}（{len(cached)} 篇）")
+                return [PostDetail(**item) for item in cached]
+
+        flight_key = (destination, max_posts, mode)
+        if _collect_flight.in_flight(flight_key):
+            logger.info(f"{destination} 的收集正在进行，等待同一结果")
+
+        posts = await _collect_flight.do(
+            flight_key,
+            lambda: self._collect_and_cache(
+                destination, max_posts, cache_key, on_progress, force_refresh
+            )
+        )
+        return list(posts)
+
+    async def _collect_and_cache(
+        self,
+        destination: str,
+        max_posts: int,
+        cache_key: str,
+        on_progress: Optional[Callable[[Dict], Any]] = None,
+        force_refresh: bool = False
+    ) -> List[PostDetail]:
+        """执行收集并写入缓存"""
+        posts = await self._collect(destination, max_posts, on_progress, force_refresh)
+
+        if posts:
+            await self.cache.set_json(
+                cache_key,
+                [asdict(post) for post in posts],
+                expire=GUIDE_CACHE_TTL
+            )
+        return posts
+
+    async def _collect(
+        self,
+        destination: str,
+        max_posts: int,
+        on_progress: Optional[Callable[[Dict], Any]] = None,
+        force_refresh: bool = False
+    ) -> List[PostDetail]:
+        """启动浏览器收集（不经过缓存；force_refresh 时不做增量跳过）"""
+        logger.info(f"开始收集 {destination} 的旅游攻略，目标数量: {max_posts}")
 
         # 创建收集器实例
-        collector = XiaohongshuCollector(
-            xiaohongshu_url=search_url,
-            max_posts=max_posts,
-            use_vision=self.use_vision,
-            concurrent=self.concurrent,
-            max_concurrent=self.max_concurrent
+        collector = self._create_collector(
+            self._search_url(destination),
+            max_posts,
+            on_progress=on_progress,
+            seen_posts=None if force_refresh else self.seen_posts
         )
 
         # 执行收集
@@ -83,44 +175,87 @@ class GuideCollectorService:
             logger.error(f"收集攻略失败: {e}")
             raise
 
-    async def _load_collected_posts(self, batch_dir: Path) -> List[PostDetail]:
-        """从收集目录加载帖子数据"""
-        posts = []
+    async def resume_collection(
+        self,
+        batch_dir: str,
+        destination: Optional[str] = None,
+        max_posts: int = 10,
+        on_progress: Optional[Callable[[Dict], Any]] = None
+    ) -> List[PostDetail]:
+        """
+        断点续跑中断的收集批次
+
+        按批次清单（manifest.json）沿用已完成的 Scout / 列表阶段，
+        只重新收集缺失或失败的帖子详情。结果不写入攻略缓存。
+        旧版本生成的批次没有清单，需要通过 destination 指定目标页面。
 
-        # 读取 posts_list.json
-        posts_list_file = batch_dir / "posts_list.json"
-        if not posts_list_file.exists():
-            return posts
+        Args:
+            batch_dir: 批次目录
+            destination: 目的地名称（清单中没有目标页面时使用）
+            max_posts: 最大收集数量（清单中没有记录时使用）
+            on_progress: 收集进度回调
 
-        with open(posts_list_file, 'r', encoding='utf-8') as f:
-            posts_data = json.load(f)
-
-        # 读取每个帖子的详细信息
-        for i, post_data in enumerate(posts_data, 1):
-            post_file = batch_dir / f"post_{i}.json"
-            if post_file.exists():
-                with open(post_file, 'r', encoding='utf-8') as f:
-                    detail_data = json.load(f)
-
-                # 转换为 PostDetail 对象
-                post_detail = PostDetail(
-                    post_id=str(i),  # 使用序号作为 ID
-                    url=post_data.get('url', ''),
-                    title=post_data.get('title', ''),
-                    content=detail_data.get('content', ''),
-                    author=detail_data.get('author', ''),
-                    likes=detail_data.get('likes', 0),
-                    comments=detail_data.get('comments', 0),
-                    collects=detail_data.get('collects', 0),
-                    images=detail_data.get('images', []),
-                    tags=detail_data.get('tags', []),
-                    publish_time=detail_data.get('publish_time'),
-                    location=detail_data.get('location')
-                )
-                posts.append(post_detail)
+        Returns:
+            批次中全部收集成功的帖子详情
+        """
+        if not Path(batch_dir).is_dir():
+            raise FileNotFoundError(f"批次目录不存在: {batch_dir}")
+
+        manifest = XiaohongshuCollector.read_manifest(batch_dir)
+        url = manifest.get("url") or (self._search_url(destination) if destination else None)
+        if not url:
+            raise ValueError(f"批次清单中没有目标页面（旧版本批次），请指定目的地后续跑: {batch_dir}")
+
+        logger.info(
+            f"断点续跑 {batch_dir}: 已完成阶段 {sorted(manifest['phases'])}，"
+            f"已成功 {sum(1 for s in manifest['posts'].values() if s == 'ok')} 个帖子"
+        )
 
+        collector = self._create_collector(
+            url,
+            manifest.get("max_posts") or max_posts,
+            on_progress=on_progress,
+            seen_posts=self.seen_posts
+        )
+        await collector.collect_posts(resume_dir=batch_dir)
+
+        posts = await self._load_collected_posts(collector.batch_dir)
+        logger.info(f"续跑完成，批次共 {len(posts)} 篇攻略")
         return posts
 
+    @staticmethod
+    def _search_url(destination: str) -> str:
+        """构建目的地的搜索 URL"""
+        return f"https://www.xiaohongshu.com/search_result?keyword={destination}+旅游攻略"
+
+    def _create_collector(
+        self,
+        url: str,
+        max_posts: int,
+        on_progress: Optional[Callable[[Dict], Any]] = None,
+        seen_posts: Optional[SeenPostsStore] = None
+    ) -> XiaohongshuCollector:
+        """按服务配置创建收集器"""
+        return XiaohongshuCollector(
+            xiaohongshu_url=url,
+            max_posts=max_posts,
+            use_vision=self.use_vision,
+            concurrent=self.concurrent,
+            max_concurrent=self.max_concurrent,
+            browser_pool=self.browser_pool,
+            scout_cache=self.scout_cache,
+            dom_extractor=self.dom_extractor,
+            on_progress=on_progress,
+            seen_posts=seen_posts,
+            browser_profile=self.browser_profile,
+            concurrency=self.concurrency,
+            retry_policy=self.retry_policy
+        )
+
+    async def _load_collected_posts(self, batch_dir: str) -> List[PostDetail]:
+        """从收集目录加载帖子数据（以笔记 ID 为 post_id，见 storage.batch_reader）"""
+        return await asyncio.to_thread(load_batch, batch_dir)
+
     async def filter_high_quality_guides(
         self,
         posts: List[PostDetail],
@@ -2,7 +2,7 @@
 行程生成服务
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import json
 
@@ -49,9 +49,8 @@ class ItineraryGeneratorService:
         """
         logger.info(f"开始生成 {destination} {days} 天行程")
 
-        # 提取景点和餐厅信息
-        attractions = await self._extract_attractions(guides)
-        restaurants = await self._extract_restaurants(guides)
+        # 提取景点、餐厅和价格信息
+        attractions, restaurants, prices = await self._extract_entities(guides)
 
         # 生成每日计划
         day_plans = []
@@ -65,6 +64,7 @@ class ItineraryGeneratorService:
                 day_num=day_num,
                 attractions=attractions,
                 restaurants=restaurants,
+                prices=prices,
                 preferences=preferences
             )
 
@@ -85,54 +85,59 @@ class ItineraryGeneratorService:
         logger.info(f"行程生成完成，共 {len(day_plans)} 天")
         return itinerary
 
-    async def _extract_attractions(
+    async def _extract_entities(
         self,
         guides: List[PostDetail]
-    ) -> List[str]:
-        """从攻略中提取景点信息"""
-        attractions = set()
-
-        for guide in guides:
-            # 使用 AI 提取景点
-            if self.ai_client:
-                extracted = await self._ai_extract_attractions(guide.content)
-                attractions.update(extracted)
-            else:
-                # 简单的关键词提取
-                if '景点' in guide.content or '必去' in guide.content:
-                    attractions.add(guide.title)
+    ) -> Tuple[List[str], List[str], Dict[str, float]]:
+        """
+        从攻略中提取景点、餐厅和价格
 
-        logger.info(f"提取到 {len(attractions)} 个景点")
-        return list(attractions)
+        使用 AI 时所有攻略通过一次批量提取完成（按字数分批、并发请求），
+        不再对每篇攻略、每类信息分别调用一次 AI。
 
-    async def _extract_restaurants(
-        self,
-        guides: List[PostDetail]
-    ) -> List[str]:
-        """从攻略中提取餐厅信息"""
-        restaurants = set()
-
-        for guide in guides:
-            # 使用 AI 提取餐厅
-            if self.ai_client:
-                extracted = await self._ai_extract_restaurants(guide.content)
-                restaurants.update(extracted)
-            else:
-                # 简单的关键词提取
+        Returns:
+            (景点列表, 餐厅列表, 名称 → 价格)
+        """
+        attractions: Dict[str, None] = {}
+        restaurants: Dict[str, None] = {}
+        prices: Dict[str, float] = {}
+
+        if self.ai_client:
+            results = await self.ai_client.extract_guide_entities(
+                [guide.content for guide in guides]
+            )
+            for result in results:
+                attractions.update(dict.fromkeys(result["attractions"]))
+                restaurants.update(dict.fromkeys(result["restaurants"]))
+                for entry in result["prices"]:
+                    try:
+                        prices.setdefault(entry["item"], float(entry["price"]))
+                    except (KeyError, TypeError, ValueError):
+                        continue
+        else:
+            # 简单的关键词提取
+            for guide in guides:
+                if '景点' in guide.content or '必去' in guide.content:
+                    attractions[guide.title] = None
                 if '美食' in guide.content or '餐厅' in guide.content:
-                    restaurants.add(guide.title)
+                    restaurants[guide.title] = None
 
-        logger.info(f"提取到 {len(restaurants)} 个餐厅")
-        return list(restaurants)
+        logger.info(
+            f"提取到 {len(attractions)} 个景点、{len(restaurants)} 个餐厅、"
+            f"{len(prices)} 条价格"
+        )
+        return list(attractions), list(restaurants), prices
 
     async def _plan_daily_activities(
         self,
         day_num: int,
         attractions: List[str],
         restaurants: List[str],
+        prices: Optional[Dict[str, float]] = None,
         preferences: Optional[Dict[str, Any]] = None
     ) -> List[Activity]:
-        """规划每日活动"""
+        """规划每日活动（攻略中提到价格的活动填入 cost）"""
+        prices = prices or {}
         activities = []
 
         # 简单的规划逻辑：上午景点 + 午餐 + 下午景点 + 晚餐
@@ -144,7 +149,8 @@ class ItineraryGeneratorService:
                 type="景点",
                 name=morning_attraction,
                 duration=120,  # 2小时
-                description=f"游览{morning_attraction}"
+                description=f"游览{morning_attraction}",
+                cost=prices.get(morning_attraction)
             ))
 
         # 午餐
@@ -155,7 +161,8 @@ class ItineraryGeneratorService:
                 type="餐饮",
                 name=lunch_restaurant,
                 duration=60,
-                description="午餐"
+                description="午餐",
+                cost=prices.get(lunch_restaurant)
             ))
 
         # 下午景点
@@ -166,7 +173,8 @@ class ItineraryGeneratorService:
                 type="景点",
                 name=afternoon_attraction,
                 duration=180,  # 3小时
-                description=f"游览{afternoon_attraction}"
+                description=f"游览{afternoon_attraction}",
+                cost=prices.get(afternoon_attraction)
             ))
 
         # 晚餐
@@ -177,21 +185,12 @@ class ItineraryGeneratorService:
                 type="餐饮",
                 name=dinner_restaurant,
                 duration=90,
-                description="晚餐"
+                description="晚餐",
+                cost=prices.get(dinner_restaurant)
             ))
 
         return activities
 
-    async def _ai_extract_attractions(self, content: str) -> List[str]:
-        """使用 AI 提取景点（占位实现）"""
-        # TODO: 实现 AI 提取逻辑
-        return []
-
-    async def _ai_extract_restaurants(self, content: str) -> List[str]:
-        """使用 AI 提取餐厅（占位实现）"""
-        # TODO: 实现 AI 提取逻辑
-        return []
-
     def calculate_total_cost(self, itinerary: Itinerary) -> float:
         """计算行程总成本"""
         # 简单的成本估算
@@ -0,0 +1,7 @@
+"""
+数据分析模块
+"""
+
+from .post_metrics import PostMetrics, engagement_rates, influence_scores
+
+__all__ = ["PostMetrics", "engagement_rates", "influence_scores"]
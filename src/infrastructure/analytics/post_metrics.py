@@ -0,0 +1,330 @@
+"""
+攻略指标列式快照 - 基于 NumPy / pandas 的向量化分析
+
+PostDetail.engagement_rate、UserProfile.influence_score 都是逐个对象计算的，
+看板统计和质量筛选需要遍历全部帖子。这里把语料的数值和分组字段
+（点赞、评论、收藏、发布时间、目的地、作者）保存为列式 DataFrame：
+- 互动率、影响力评分：整列向量化计算，公式与领域模型一致
+- 百分位排名：全局或按目的地分组
+- 按目的地聚合：帖子数、点赞总数、互动率均值 / 中位数 / P90、高质量占比
+- 持久化：.parquet（需要安装 pyarrow）或 .npz（只依赖 NumPy）
+
+目的地、作者使用 category 类型，计数使用 int32，百万行的快照只占几十 MB。
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ...core.domain.models.post import PostDetail
+from ...core.domain.models.user import UserProfile
+
+
+# 列式快照中的列
+METRIC_COLUMNS = (
+    "post_id", "author", "destination", "likes", "comments", "collects", "publish_time",
+)
+
+# 未知目的地的分组名
+UNKNOWN_DESTINATION = "未知"
+
+
+def engagement_rates(likes, comments, collects) -> np.ndarray:
+    """
+    向量化互动率（与 PostDetail.engagement_rate 公式一致）
+
+    Args:
+        likes: 点赞数数组
+        comments: 评论数数组
+        collects: 收藏数数组
+
+    Returns:
+        互动率数组
+    """
+    likes = np.asarray(likes, dtype=np.float64)
+    total = likes + np.asarray(comments, dtype=np.float64) + np.asarray(collects, dtype=np.float64)
+    return total / (likes + 1)
+
+
+def influence_scores(followers, likes_count, posts_count, verified) -> np.ndarray:
+    """
+    向量化影响力评分（与 UserProfile.influence_score 公式一致）
+
+    Args:
+        followers: 粉丝数数组
+        likes_count: 获赞总数数组
+        posts_count: 发帖数数组
+        verified: 是否认证数组
+
+    Returns:
+        影响力评分数组
+    """
+    base_score = (
+        np.asarray(followers, dtype=np.float64) * 0.4 +
+        (np.asarray(likes_count, dtype=np.float64) / 100) * 0.3 +
+        (np.asarray(posts_count, dtype=np.float64) * 2) * 0.3
+    )
+    return np.where(np.asarray(verified, dtype=bool), base_score * 1.5, base_score)
+
+
+class PostMetrics:
+    """攻略指标列式快照（只读，数据变化后重新生成）"""
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        初始化快照
+
+        Args:
+            frame: 包含 METRIC_COLUMNS 的 DataFrame（通常通过 from_posts / from_columns 构造）
+        """
+        frame = frame.reset_index(drop=True)
+        frame["engagement_rate"] = engagement_rates(
+            frame["likes"], frame["comments"], frame["collects"]
+        )
+        self.frame = frame
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # ==================== 构造 ====================
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> "PostMetrics":
+        """
+        从列数据构造快照
+
+        Args:
+            columns: 列名 → 值序列（至少包含 METRIC_COLUMNS）
+
+        Returns:
+            PostMetrics
+        """
+        destination = pd.Series(columns["destination"], dtype="object")
+        frame = pd.DataFrame({
+            "post_id": pd.Series(columns["post_id"], dtype="object"),
+            "author": pd.Series(columns["author"], dtype="object").fillna("").astype("category"),
+            "destination": destination.where(
+                destination.notna() & (destination != ""), UNKNOWN_DESTINATION
+            ).astype("category"),
+            "likes": cls._counts(columns["likes"]),
+            "comments": cls._counts(columns["comments"]),
+            "collects": cls._counts(columns["collects"]),
+            "publish_time": pd.to_datetime(
+                pd.Series(columns["publish_time"], dtype="object"), errors="coerce"
+            ).astype("datetime64[ns]"),
+        })
+        return cls(frame)
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[PostDetail]) -> "PostMetrics":
+        """
+        从帖子对象构造快照
+
+        Args:
+            posts: 帖子序列
+
+        Returns:
+            PostMetrics
+        """
+        columns: Dict[str, List] = {name: [] for name in METRIC_COLUMNS}
+        for post in posts:
+            columns["post_id"].append(post.post_id)
+            columns["author"].append(post.author)
+            columns["destination"].append(post.location)
+            columns["likes"].append(post.likes)
+            columns["comments"].append(post.comments)
+            columns["collects"].append(post.collects)
+            columns["publish_time"].append(post.publish_time)
+        return cls.from_columns(columns)
+
+    @staticmethod
+    def _counts(values: Sequence) -> np.ndarray:
+        """计数列（缺失按 0 处理，int32 存储）"""
+        return pd.to_numeric(pd.Series(values), errors="coerce").fillna(0).to_numpy(np.int32)
+
+    # ==================== 持久化 ====================
+
+    def save(self, path) -> Path:
+        """
+        保存快照
+
+        Args:
+            path: 文件路径，.parquet 使用 Parquet（需要 pyarrow），其他后缀保存为 .npz 数组
+
+        Returns:
+            实际写入的文件路径
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame = self.frame[list(METRIC_COLUMNS)]
+
+        if path.suffix == ".parquet":
+            frame.to_parquet(path, index=False)
+            return path
+
+        path = path.with_suffix(".npz")
+        np.savez_compressed(
+            path,
+            post_id=frame["post_id"].to_numpy(dtype=str),
+            author=frame["author"].astype(str).to_numpy(dtype=str),
+            destination=frame["destination"].astype(str).to_numpy(dtype=str),
+            likes=frame["likes"].to_numpy(),
+            comments=frame["comments"].to_numpy(),
+            collects=frame["collects"].to_numpy(),
+            publish_time=frame["publish_time"].to_numpy(dtype="datetime64[ns]"),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path) -> "PostMetrics":
+        """
+        读取快照
+
+        Args:
+            path: save() 写入的 .parquet 或 .npz 文件
+
+        Returns:
+            PostMetrics
+        """
+        path = Path(path)
+        if path.suffix == ".parquet":
+            return cls.from_columns(pd.read_parquet(path).to_dict("series"))
+
+        with np.load(path) as data:
+            return cls.from_columns({name: data[name] for name in METRIC_COLUMNS})
+
+    # ==================== 分析 ====================
+
+    def high_quality(
+        self,
+        min_engagement_rate: float = 0.05,
+        limit: Optional[int] = 10,
+        destination: Optional[str] = None
+    ) -> List[str]:
+        """
+        高质量帖子
+
+        Args:
+            min_engagement_rate: 最小互动率
+            limit: 最大数量（None 表示全部）
+            destination: 只看该目的地（可选）
+
+        Returns:
+            帖子 ID 列表（按互动率降序）
+        """
+        frame = self.frame
+        mask = frame["engagement_rate"].to_numpy() >= min_engagement_rate
+        if destination is not None:
+            mask &= (frame["destination"] == destination).to_numpy()
+
+        selected = frame.loc[mask, ["post_id", "engagement_rate"]]
+        if limit is None:
+            selected = selected.sort_values("engagement_rate", ascending=False, kind="stable")
+        else:
+            selected = selected.nlargest(limit, "engagement_rate")
+        return selected["post_id"].tolist()
+
+    def percentile_rank(
+        self,
+        column: str = "engagement_rate",
+        by_destination: bool = False
+    ) -> pd.Series:
+        """
+        百分位排名
+
+        Args:
+            column: 排名依据的列（engagement_rate / likes / comments / collects）
+            by_destination: 是否在同一目的地内排名
+
+        Returns:
+            以 post_id 为索引的百分位（0-1，越大越靠前）
+        """
+        values = self.frame[column]
+        if by_destination:
+            ranks = values.groupby(self.frame["destination"], observed=True).rank(pct=True)
+        else:
+            ranks = values.rank(pct=True)
+        return pd.Series(ranks.to_numpy(), index=self.frame["post_id"], name=f"{column}_pct")
+
+    def destination_summary(self, min_engagement_rate: float = 0.05) -> pd.DataFrame:
+        """
+        按目的地聚合
+
+        计数和均值使用 np.bincount，中位数 / P90 先按目的地编码稳定排序，
+        再对每组切片做 np.quantile（基于 partition），整体 O(n)。
+
+        Args:
+            min_engagement_rate: 计算高质量占比使用的互动率阈值
+
+        Returns:
+            以目的地为索引的 DataFrame：posts / likes / mean_engagement /
+            median_engagement / p90_engagement / high_quality_ratio，按帖子数降序
+        """
+        destinations = self.frame["destination"].cat
+        codes = destinations.codes.to_numpy()
+        rates = self.frame["engagement_rate"].to_numpy()
+        size = len(destinations.categories)
+
+        counts = np.bincount(codes, minlength=size)
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        sorted_rates = rates[np.argsort(codes, kind="stable")]
+        quantiles = np.full((size, 2), np.nan)
+        for code in np.flatnonzero(counts):
+            quantiles[code] = np.quantile(sorted_rates[bounds[code]:bounds[code + 1]], [0.5, 0.9])
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary = pd.DataFrame({
+                "posts": counts,
+                "likes": np.bincount(codes, weights=self.frame["likes"].to_numpy(), minlength=size).astype(np.int64),
+                "mean_engagement": np.bincount(codes, weights=rates, minlength=size) / counts,
+                "median_engagement": quantiles[:, 0],
+                "p90_engagement": quantiles[:, 1],
+                "high_quality_ratio": np.bincount(
+                    codes, weights=rates >= min_engagement_rate, minlength=size
+                ) / counts,
+            }, index=pd.Index(destinations.categories, name="destination"))
+
+        summary = summary[summary["posts"] > 0]
+        return summary.sort_values("posts", ascending=False, kind="stable")
+
+    def author_influence(
+        self,
+        profiles: Optional[Iterable[UserProfile]] = None
+    ) -> pd.DataFrame:
+        """
+        作者影响力
+
+        发帖数和获赞数从语料中聚合；粉丝数和认证状态来自 profiles
+        （用户名匹配作者），没有资料的作者按 0 粉丝、未认证计算。
+
+        Args:
+            profiles: 用户资料（可选）
+
+        Returns:
+            以作者为索引的 DataFrame：posts_count / likes_count / followers /
+            verified / influence_score，按影响力降序
+        """
+        authors = self.frame.groupby("author", observed=True).agg(
+            posts_count=("post_id", "size"),
+            likes_count=("likes", "sum"),
+        )
+
+        followers = pd.Series(0, index=authors.index, dtype=np.int64)
+        verified = pd.Series(False, index=authors.index)
+        if profiles is not None:
+            profile_frame = pd.DataFrame(
+                [(p.username, p.followers, p.verified) for p in profiles],
+                columns=["author", "followers", "verified"]
+            ).drop_duplicates("author").set_index("author")
+            followers = profile_frame["followers"].reindex(authors.index, fill_value=0)
+            verified = profile_frame["verified"].reindex(authors.index, fill_value=False)
+
+        authors["followers"] = followers.to_numpy()
+        authors["verified"] = verified.to_numpy(dtype=bool)
+        authors["influence_score"] = influence_scores(
+            authors["followers"], authors["likes_count"],
+            authors["posts_count"], authors["verified"]
+        )
+        return authors.sort_values("influence_score", ascending=False)
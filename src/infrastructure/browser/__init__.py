@@ -0,0 +1,11 @@
+"""
+浏览器管理模块
+"""
+
+from .pool import BrowserPool, PooledBrowser, browser_pool
+from .profile import ProductionBrowserProfile, ResourceBlocker, browser_profile
+
+__all__ = [
+    "BrowserPool", "PooledBrowser", "browser_pool",
+    "ProductionBrowserProfile", "ResourceBlocker", "browser_profile",
+]
@@ -0,0 +1,284 @@
+"""
+浏览器池
+
+进程级共享的 browser-use 浏览器池。浏览器启动（Chromium 冷启动）通常占据
+小批量采集的大部分耗时，因此这里预先启动并预热若干浏览器，按次借出、用完归还，
+同时保留 Cookie 等会话状态。
+
+策略：
+- 健康检查：借出前确认浏览器仍可响应，失效的直接丢弃重建
+- 使用次数回收：单个浏览器借出达到 max_uses 次后关闭重建，避免内存膨胀
+- 空闲回收：空闲超过 idle_timeout 秒的浏览器由后台任务关闭
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, Optional
+import asyncio
+import time
+
+from browser_use import Browser
+
+from .profile import browser_profile
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+from ...shared.constants import XHS_BASE_URL
+
+
+logger = setup_logger(__name__)
+
+
+def default_browser_factory() -> Browser:
+    """创建池化浏览器（生产配置：按 BROWSER_HEADLESS 无头启动，keep_alive 保证 Agent 结束后不关闭）"""
+    return browser_profile.create_browser()
+
+
+@dataclass
+class PooledBrowser:
+    """池中的单个浏览器及其使用统计"""
+
+    browser: Browser
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """浏览器池"""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        warm_size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        warmup_url: Optional[str] = XHS_BASE_URL,
+        browser_factory: Callable[[], Browser] = default_browser_factory,
+        health_check_timeout: float = 5.0
+    ):
+        """
+        初始化浏览器池
+
+        Args:
+            size: 最多同时存在的浏览器数量（默认使用配置文件）
+            warm_size: start() 时预先启动的浏览器数量
+            max_uses: 单个浏览器最大借出次数，达到后回收
+            idle_timeout: 空闲超时（秒），超时后关闭
+            warmup_url: 预热时打开的页面（建立 Cookie），None 表示不预热
+            browser_factory: 浏览器构造函数
+            health_check_timeout: 健康检查超时（秒）
+        """
+        self.size = size or settings.BROWSER_POOL_SIZE
+        self.warm_size = min(
+            warm_size if warm_size is not None else settings.BROWSER_POOL_WARM_SIZE,
+            self.size
+        )
+        self.max_uses = max_uses or settings.BROWSER_POOL_MAX_USES
+        self.idle_timeout = idle_timeout or settings.BROWSER_POOL_IDLE_TIMEOUT
+        self.warmup_url = warmup_url
+        self.browser_factory = browser_factory
+        self.health_check_timeout = health_check_timeout
+
+        self._idle: List[PooledBrowser] = []
+        self._in_use = 0
+        self._lock = asyncio.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # 统计
+        self.launched = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """延迟创建信号量，确保绑定到运行中的事件循环"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        return self._slots
+
+    async def start(self) -> None:
+        """预热浏览器并启动空闲回收任务"""
+        self._closed = False
+        missing = self.warm_size - len(self._idle)
+        if missing > 0:
+            entries = await asyncio.gather(
+                *(self._launch() for _ in range(missing)),
+                return_exceptions=True
+            )
+            async with self._lock:
+                for entry in entries:
+                    if isinstance(entry, PooledBrowser):
+                        self._idle.append(entry)
+                    else:
+                        logger.error(f"浏览器预热失败: {entry}")
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+        logger.info(f"浏览器池已启动: 预热 {len(self._idle)}/{self.size}")
+
+    async def close(self) -> None:
+        """关闭池中所有空闲浏览器并停止回收任务"""
+        self._closed = True
+        if self._reaper:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+        async with self._lock:
+            idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._dispose(e) for e in idle))
+        logger.info("浏览器池已关闭")
+
+    async def acquire(self) -> PooledBrowser:
+        """
+        借出一个健康的浏览器
+
+        池满时等待其他调用方归还。
+
+        Returns:
+            池化浏览器
+        """
+        if self._closed:
+            raise RuntimeError("浏览器池已关闭")
+
+        await self._get_slots().acquire()
+        try:
+            while True:
+                async with self._lock:
+                    # LIFO：优先使用最近归还的（最“热”的）浏览器
+                    entry = self._idle.pop() if self._idle else None
+
+                if entry is None:
+                    entry = await self._launch()
+                    break
+
+                if await self._is_healthy(entry):
+                    self.reused += 1
+                    break
+
+                logger.warning("浏览器健康检查失败，丢弃并重建")
+                await self._dispose(entry)
+        except BaseException:
+            self._get_slots().release()
+            raise
+
+        entry.uses += 1
+        self._in_use += 1
+        return entry
+
+    async def release(self, entry: PooledBrowser, healthy: bool = True) -> None:
+        """
+        归还浏览器
+
+        Args:
+            entry: acquire() 返回的池化浏览器
+            healthy: 调用方是否认为浏览器仍可用
+        """
+        self._in_use -= 1
+        try:
+            if self._closed or not healthy or entry.uses >= self.max_uses:
+                if entry.uses >= self.max_uses:
+                    self.recycled += 1
+                    logger.info(f"浏览器已使用 {entry.uses} 次，回收重建")
+                await self._dispose(entry)
+            else:
+                entry.last_used_at = time.monotonic()
+                async with self._lock:
+                    self._idle.append(entry)
+        finally:
+            self._get_slots().release()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Browser]:
+        """
+        借出浏览器的上下文管理器
+
+        Example:
+            >>> async with browser_pool.session() as browser:
+            ...     agent = Agent(task=..., llm=llm, browser_context=browser)
+        """
+        entry = await self.acquire()
+        try:
+            yield entry.browser
+        finally:
+            await self.release(entry)
+
+    def stats(self) -> dict:
+        """返回池状态（用于监控）"""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "launched": self.launched,
+            "reused": self.reused,
+            "recycled": self.recycled,
+        }
+
+    async def evict_idle(self) -> int:
+        """
+        关闭空闲超时的浏览器
+
+        Returns:
+            关闭的浏览器数量
+        """
+        now = time.monotonic()
+        async with self._lock:
+            expired = [
+                e for e in self._idle
+                if now - e.last_used_at >= self.idle_timeout
+            ]
+            self._idle = [e for e in self._idle if e not in expired]
+
+        await asyncio.gather(*(self._dispose(e) for e in expired))
+        if expired:
+            logger.info(f"回收 {len(expired)} 个空闲浏览器")
+        return len(expired)
+
+    async def _reap_loop(self) -> None:
+        """后台空闲回收循环"""
+        interval = max(1, min(60, self.idle_timeout // 2))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"空闲浏览器回收失败: {e}")
+
+    async def _launch(self) -> PooledBrowser:
+        """启动并预热一个新浏览器"""
+        browser = self.browser_factory()
+        await browser.start()
+        if self.warmup_url:
+            try:
+                await browser.new_page(self.warmup_url)
+            except Exception as e:
+                logger.warning(f"浏览器预热页面加载失败: {e}")
+        self.launched += 1
+        return PooledBrowser(browser=browser)
+
+    async def _is_healthy(self, entry: PooledBrowser) -> bool:
+        """检查浏览器是否仍可响应"""
+        try:
+            await asyncio.wait_for(
+                entry.browser.get_pages(),
+                timeout=self.health_check_timeout
+            )
+            return True
+        except Exception:
+            return False
+
+    async def _dispose(self, entry: PooledBrowser) -> None:
+        """彻底关闭浏览器进程"""
+        try:
+            await entry.browser.kill()
+        except Exception as e:
+            logger.warning(f"关闭浏览器失败: {e}")
+
+
+# 全局浏览器池实例
+browser_pool = BrowserPool()
@@ -0,0 +1,268 @@
+"""
+生产环境浏览器配置
+
+采集机器没有显示器，而图片、视频、字体的下载占据了页面加载的大部分时间和带宽，
+文字提取（非视觉模式）并不需要它们。这里提供：
+- 启动配置：按 BROWSER_HEADLESS 决定是否无头（没有显示器时总是无头），
+  附加静音、禁止自动播放、禁用 GPU 等启动参数
+- 资源拦截（ResourceBlocker）：通过 CDP Fetch 域在浏览器级别拦截请求，
+  图片 / 视频音频 / 字体在响应头阶段中止（记录 Content-Length 作为节省的字节数，
+  响应体不再下载），统计与埋点请求在发出前直接拒绝
+
+拦截在整个浏览器（所有标签页）生效；统计按浏览器累计，
+调用方用 snapshot() 前后两次的差值得到单个页面节省的流量。
+"""
+
+from typing import Callable, Dict, Iterable, Optional
+import asyncio
+import fnmatch
+import os
+import sys
+
+from browser_use import Browser
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+# 无头生产环境的附加启动参数
+PRODUCTION_LAUNCH_ARGS = [
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+    "--disable-notifications",
+    "--disable-gpu",
+    "--disable-renderer-backgrounding",
+]
+
+# 非视觉提取时拦截的资源类型（CDP Network.ResourceType）
+MEDIA_RESOURCE_TYPES = ("Image", "Media", "Font")
+
+# 统计 / 埋点请求（在请求阶段直接拒绝）
+ANALYTICS_URL_PATTERNS = (
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*hm.baidu.com/*",
+    "*cnzz.com/*",
+    "*umeng.com/*",
+    "*sentry.io/*",
+    "*/api/sec/*/report*",
+    "*apm-fe.xiaohongshu.com/*",
+    "*t2.xiaohongshu.com/*",
+)
+
+
+def has_display() -> bool:
+    """当前环境是否有可用的显示器（Linux 下检查 DISPLAY / WAYLAND_DISPLAY）"""
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+# 拦截器注册的 CDP 事件
+REQUEST_PAUSED = "Fetch.requestPaused"
+
+
+class ResourceBlocker:
+    """浏览器级请求拦截器（一个浏览器同一时间只安装一个）"""
+
+    def __init__(
+        self,
+        block_types: Iterable[str] = MEDIA_RESOURCE_TYPES,
+        block_patterns: Iterable[str] = ANALYTICS_URL_PATTERNS
+    ):
+        """
+        初始化拦截器
+
+        Args:
+            block_types: 在响应头阶段中止的资源类型
+            block_patterns: 在请求阶段拒绝的 URL 通配符
+        """
+        self.block_types = tuple(block_types)
+        self.block_patterns = tuple(block_patterns)
+        self._browser: Optional[Browser] = None
+        self._handler: Optional[Callable] = None
+
+        # 统计
+        self.blocked: Dict[str, int] = {}
+        self.bytes_saved = 0
+
+    @property
+    def patterns(self) -> list:
+        """Fetch.enable 的拦截规则"""
+        patterns = [
+            {"urlPattern": "*", "resourceType": resource_type, "requestStage": "Response"}
+            for resource_type in self.block_types
+        ]
+        patterns.extend(
+            {"urlPattern": pattern, "requestStage": "Request"}
+            for pattern in self.block_patterns
+        )
+        return patterns
+
+    async def install(self, browser: Browser) -> None:
+        """
+        在浏览器上启用拦截（浏览器未启动时先启动）
+
+        Args:
+            browser: browser-use 浏览器会话
+        """
+        await browser.start()
+        client = browser.cdp_client
+        self._handler = self._on_request_paused
+        client.register.Fetch.requestPaused(self._handler)
+        await client.send.Fetch.enable(params={"patterns": self.patterns})
+        self._browser = browser
+
+    async def uninstall(self) -> None:
+        """停止拦截（浏览器归还到池中前调用）"""
+        browser, self._browser = self._browser, None
+        handler, self._handler = self._handler, None
+        if browser is None:
+            return
+        client = browser.cdp_client
+        try:
+            await client.send.Fetch.disable()
+        except Exception as e:
+            logger.debug(f"关闭请求拦截失败: {e}")
+
+        # 注销事件回调，避免池中复用的浏览器仍指向已卸载的拦截器
+        # （cdp_use 的注册表没有公开的查询接口，只在回调仍是本实例时注销）
+        registry = getattr(client, "_event_registry", None)
+        if registry is not None and registry._handlers.get(REQUEST_PAUSED) == handler:
+            registry.unregister(REQUEST_PAUSED)
+
+    def snapshot(self) -> Dict:
+        """当前累计统计"""
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "bytes_saved": self.bytes_saved,
+            "blocked": dict(self.blocked),
+        }
+
+    @staticmethod
+    def diff(before: Dict, after: Dict) -> Dict:
+        """两次 snapshot 之间的统计（单个页面节省的流量）"""
+        return {
+            "blocked_requests": after["blocked_requests"] - before["blocked_requests"],
+            "bytes_saved": after["bytes_saved"] - before["bytes_saved"],
+            "blocked": {
+                key: count - before["blocked"].get(key, 0)
+                for key, count in after["blocked"].items()
+                if count - before["blocked"].get(key, 0) > 0
+            },
+        }
+
+    def _on_request_paused(self, event: Dict, session_id: Optional[str] = None) -> None:
+        """Fetch.requestPaused：媒体资源在响应阶段中止，统计请求直接拒绝，其余放行"""
+        browser = self._browser
+        request_id = event.get("requestId")
+        if browser is None or not request_id:
+            return
+
+        resource_type = event.get("resourceType", "Other")
+        at_response = "responseStatusCode" in event or "responseErrorReason" in event
+        url = event.get("request", {}).get("url", "")
+
+        if at_response and resource_type in self.block_types:
+            self._record(resource_type, self._content_length(event.get("responseHeaders", [])))
+            command = browser.cdp_client.send.Fetch.failRequest(
+                params={"requestId": request_id, "errorReason": "BlockedByClient"},
+                session_id=session_id
+            )
+        elif not at_response and self._is_analytics(url):
+            self._record("Analytics", 0)
+            command = browser.cdp_client.send.Fetch.failRequest(
+                params={"requestId": request_id, "errorReason": "BlockedByClient"},
+                session_id=session_id
+            )
+        else:
+            command = browser.cdp_client.send.Fetch.continueRequest(
+                params={"requestId": request_id},
+                session_id=session_id
+            )
+
+        # 事件回调是同步的，命令在后台发送
+        task = asyncio.ensure_future(command)
+        task.add_done_callback(_ignore_result)
+
+    def _record(self, resource_type: str, size: int) -> None:
+        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+        self.bytes_saved += size
+
+    def _is_analytics(self, url: str) -> bool:
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block_patterns)
+
+    @staticmethod
+    def _content_length(headers) -> int:
+        """响应头中的 Content-Length（缺失或无法解析时为 0）"""
+        for header in headers or []:
+            if header.get("name", "").lower() == "content-length":
+                try:
+                    return int(header.get("value", 0))
+                except ValueError:
+                    return 0
+        return 0
+
+
+def _ignore_result(task) -> None:
+    """取出后台命令的异常（请求可能已随页面关闭而失效）"""
+    if not task.cancelled():
+        task.exception()
+
+
+class ProductionBrowserProfile:
+    """生产环境浏览器配置（启动参数 + 资源拦截策略）"""
+
+    def __init__(
+        self,
+        headless: Optional[bool] = None,
+        block_resources: Optional[bool] = None,
+        launch_args: Iterable[str] = PRODUCTION_LAUNCH_ARGS
+    ):
+        """
+        初始化配置
+
+        Args:
+            headless: 是否无头（默认使用 BROWSER_HEADLESS；没有显示器时总是无头）
+            block_resources: 是否拦截媒体和统计请求（默认使用配置文件）
+            launch_args: 无头模式下附加的 Chromium 启动参数
+        """
+        if headless is None:
+            headless = settings.BROWSER_HEADLESS or not has_display()
+        self.headless = headless
+        self.block_resources = (
+            block_resources if block_resources is not None
+            else settings.BROWSER_BLOCK_RESOURCES
+        )
+        self.launch_args = list(launch_args)
+
+    def create_browser(self) -> Browser:
+        """创建浏览器会话（keep_alive 保证 Agent 结束后不关闭浏览器）"""
+        return Browser(
+            headless=self.headless,
+            disable_security=True,
+            keep_alive=True,
+            args=self.launch_args if self.headless else [],
+        )
+
+    def resource_blocker(self, use_vision: bool = False) -> Optional[ResourceBlocker]:
+        """
+        为一次采集创建拦截器
+
+        Args:
+            use_vision: 是否使用视觉模式（需要截图时保留图片）
+
+        Returns:
+            ResourceBlocker，未启用拦截时返回 None
+        """
+        if not self.block_resources:
+            return None
+        block_types = [t for t in MEDIA_RESOURCE_TYPES if not (use_vision and t == "Image")]
+        return ResourceBlocker(block_types=block_types)
+
+
+# 全局生产环境浏览器配置
+browser_profile = ProductionBrowserProfile()
@@ -6,8 +6,8 @@ from typing import Optional, Any
 import json
 import redis.asyncio as aioredis
 
-from ...utils.config import settings
-from ...utils.logger import setup_logger
+from ..utils.config import settings
+from ..utils.logger import setup_logger
 
 
 logger = setup_logger(__name__)
@@ -10,8 +10,8 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base
 
-from ...utils.config import settings
-from ...utils.logger import setup_logger
+from ..utils.config import settings
+from ..utils.logger import setup_logger
 
 
 logger = setup_logger(__name__)
@@ -58,9 +58,13 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db():
-    """初始化数据库（创建所有表）"""
+    """初始化数据库（创建所有表，并为已有的表补齐新增的列和索引）"""
+    # 延迟导入：migrations 依赖 models，models 依赖本模块的 Base
+    from .migrations import run_migrations
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
     logger.info("数据库初始化完成")
 
 
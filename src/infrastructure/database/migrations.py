@@ -0,0 +1,73 @@
+"""
+数据库结构迁移
+
+init_db 使用 create_all 建表，只会创建不存在的表，不会修改已有的表。
+模型新增的列和索引在这里以幂等 DDL 补齐，每次启动执行一次，新库上全部为空操作。
+
+DDL 按数据库方言区分：
+- PostgreSQL（12+）：ADD COLUMN IF NOT EXISTS 添加 STORED 生成列
+- SQLite（3.31+）：不支持 ADD COLUMN IF NOT EXISTS，也不能通过 ALTER 添加 STORED 生成列，
+  先检查列是否存在，再添加 VIRTUAL 生成列（同样可以建索引）
+- 其他方言：跳过
+"""
+
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .models import ENGAGEMENT_RATE_SQL
+from ..utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+# 两种方言共用的索引 DDL
+_POSTS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_posts_engagement_rate ON posts (engagement_rate)",
+    "CREATE INDEX IF NOT EXISTS ix_posts_location ON posts (location)",
+]
+
+# 按方言、按顺序执行的迁移 DDL（posts.engagement_rate 生成列及排序/过滤索引）
+MIGRATIONS: Dict[str, List[str]] = {
+    "postgresql": [
+        # 添加 STORED 生成列会重写整张 posts 表，数据量大时请在低峰期启动
+        f"ALTER TABLE posts ADD COLUMN IF NOT EXISTS engagement_rate DOUBLE PRECISION "
+        f"GENERATED ALWAYS AS ({ENGAGEMENT_RATE_SQL}) STORED",
+        *_POSTS_INDEXES,
+    ],
+    "sqlite": [
+        # 只在列不存在时执行（见 _sqlite_has_column）
+        f"ALTER TABLE posts ADD COLUMN engagement_rate REAL "
+        f"GENERATED ALWAYS AS ({ENGAGEMENT_RATE_SQL}) VIRTUAL",
+        *_POSTS_INDEXES,
+    ],
+}
+
+
+async def run_migrations(conn: AsyncConnection) -> None:
+    """
+    执行当前数据库方言的迁移 DDL
+
+    Args:
+        conn: 处于事务中的数据库连接（见 init_db）
+    """
+    dialect = conn.dialect.name
+    statements = MIGRATIONS.get(dialect)
+    if statements is None:
+        logger.info(f"数据库方言 {dialect} 没有迁移 DDL，跳过")
+        return
+
+    if dialect == "sqlite" and await _sqlite_has_column(conn, "posts", "engagement_rate"):
+        statements = statements[1:]
+
+    for statement in statements:
+        await conn.execute(text(statement))
+    logger.info(f"数据库迁移完成（{dialect}）: {len(statements)} 条 DDL")
+
+
+async def _sqlite_has_column(conn: AsyncConnection, table: str, column: str) -> bool:
+    """SQLite 表中是否已有该列（table_xinfo 包含生成列）"""
+    result = await conn.execute(text(f"PRAGMA table_xinfo({table})"))
+    return any(row[1] == column for row in result)
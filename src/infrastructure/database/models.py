@@ -4,19 +4,30 @@
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Integer, Float, DateTime, JSON, Text, Boolean
+    Column, String, Integer, Float, DateTime, JSON, Text, Boolean, Computed, Index
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 
 from .connection import Base
 
 
+# 互动率 = (点赞 + 评论 + 收藏) / (点赞 + 1)（生成列表达式，迁移 DDL 共用）
+ENGAGEMENT_RATE_SQL = (
+    "(COALESCE(likes, 0) + COALESCE(comments, 0) + COALESCE(collects, 0)) * 1.0"
+    " / (COALESCE(likes, 0) + 1)"
+)
+
+
 class PostModel(Base):
     """帖子数据库模型"""
 
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_engagement_rate", "engagement_rate"),
+        Index("ix_posts_location", "location"),
+    )
 
-    post_id = Column(String(100), primary_key=True)
+    post_id = Column(String(100), primary_key=True)  # 小红书笔记 ID（24 位十六进制）
     url = Column(String(500), nullable=False)
     title = Column(String(500), nullable=False)
     content = Column(Text, nullable=False)
@@ -28,6 +39,8 @@ class PostModel(Base):
     tags = Column(JSON)  # List[str]
     publish_time = Column(String(100))
     location = Column(String(200))
+    # 互动率由数据库计算并存储，可建索引排序（已有的 posts 表由 migrations.py 补齐）
+    engagement_rate = Column(Float, Computed(ENGAGEMENT_RATE_SQL, persisted=True))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
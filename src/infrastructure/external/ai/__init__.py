@@ -3,5 +3,6 @@ AI 服务集成
 """
 
 from .gemini_client import GeminiClient
+from .response_cache import LLMResponseCache, llm_cache
 
-__all__ = ["GeminiClient"]
+__all__ = ["GeminiClient", "LLMResponseCache", "llm_cache"]
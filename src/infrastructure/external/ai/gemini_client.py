@@ -2,9 +2,12 @@
 Google Gemini AI 客户端
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+import asyncio
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from .response_cache import LLMResponseCache, llm_cache
 from ...utils.config import settings
 from ...utils.logger import setup_logger
 
@@ -19,62 +22,156 @@ class GeminiClient:
         self,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None
     ):
         """
         初始化客户端
 
         Args:
             model: 模型名称（默认使用配置文件）
-            temperature: 温度参数（默认使用配置文件）
+            temperature: 温度参数（默认使用配置文件；结构化提取和要点提炼固定使用
+                GEMINI_EXTRACTION_TEMPERATURE，以便命中响应缓存）
             api_key: API 密钥（默认使用配置文件）
+            cache: 响应缓存（默认使用全局缓存，LLM_CACHE_ENABLED 关闭时不缓存）
         """
         self.model = model or settings.GEMINI_MODEL
-        self.temperature = temperature or settings.GEMINI_TEMPERATURE
+        self.temperature = temperature if temperature is not None else settings.GEMINI_TEMPERATURE
         self.api_key = api_key or settings.GEMINI_API_KEY
+        self.cache = cache or (llm_cache if settings.LLM_CACHE_ENABLED else None)
+
+        # 按温度复用的 LangChain 客户端（默认温度之外按需创建）
+        self._llms: Dict[float, ChatGoogleGenerativeAI] = {}
 
         # 创建 LangChain 客户端
         if self.api_key:
-            self.llm = ChatGoogleGenerativeAI(
-                model=self.model,
-                temperature=self.temperature,
-                google_api_key=self.api_key
-            )
+            self.llm = self._get_llm(self.temperature)
             logger.info(f"Gemini 客户端初始化完成: {self.model}")
         else:
             self.llm = None
             logger.warning("未提供 GEMINI_API_KEY，客户端将无法工作")
 
+    def _get_llm(self, temperature: float) -> Optional[ChatGoogleGenerativeAI]:
+        """
+        获取指定温度的 LangChain 客户端
+
+        Args:
+            temperature: 温度参数
+
+        Returns:
+            LangChain 客户端，未提供 API 密钥时返回 None
+        """
+        if not self.api_key:
+            return None
+        llm = self._llms.get(temperature)
+        if llm is None:
+            llm = ChatGoogleGenerativeAI(
+                model=self.model,
+                temperature=temperature,
+                google_api_key=self.api_key
+            )
+            self._llms[temperature] = llm
+        return llm
+
     async def chat(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        temperature: Optional[float] = None
     ) -> str:
         """
         发送聊天请求
 
+        相同的 (模型, 温度, 系统提示词, 提示词) 命中响应缓存时不调用 API；
+        温度高于缓存阈值时总是调用 API。
+
         Args:
             prompt: 用户提示词
             system_prompt: 系统提示词
+            use_cache: 是否使用响应缓存
+            temperature: 本次请求的温度（默认使用客户端温度）
 
         Returns:
             AI 响应文本
         """
-        try:
-            # 构建消息
-            messages = []
-            if system_prompt:
-                messages.append(("system", system_prompt))
-            messages.append(("human", prompt))
+        temperature = temperature if temperature is not None else self.temperature
+        cache_key = None
+        if use_cache and self.cache and self.cache.is_cacheable(temperature):
+            cache_key = self.cache.make_key(
+                self.model, temperature, system_prompt, prompt
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
+        try:
             # 发送请求
-            response = await self.llm.ainvoke(messages)
-            return response.content
-
+            llm = self._get_llm(temperature)
+            response = await llm.ainvoke(self._build_messages(prompt, system_prompt))
         except Exception as e:
             logger.error(f"Gemini API 调用失败: {e}")
             raise
 
+        if cache_key is not None:
+            await self.cache.set(cache_key, response.content)
+        return response.content
+
+    async def chat_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        流式发送聊天请求（LangChain astream），逐段返回生成的文本
+
+        命中响应缓存时一次性返回完整文本；完整生成后写入缓存。
+
+        Args:
+            prompt: 用户提示词
+            system_prompt: 系统提示词
+            use_cache: 是否使用响应缓存
+            temperature: 本次请求的温度（默认使用客户端温度）
+
+        Yields:
+            文本片段
+        """
+        temperature = temperature if temperature is not None else self.temperature
+        cache_key = None
+        if use_cache and self.cache and self.cache.is_cacheable(temperature):
+            cache_key = self.cache.make_key(
+                self.model, temperature, system_prompt, prompt
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks: List[str] = []
+        try:
+            llm = self._get_llm(temperature)
+            async for chunk in llm.astream(self._build_messages(prompt, system_prompt)):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Gemini 流式调用失败: {e}")
+            raise
+
+        if cache_key is not None:
+            await self.cache.set(cache_key, "".join(chunks))
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[tuple]:
+        """构建 LangChain 消息列表"""
+        messages = []
+        if system_prompt:
+            messages.append(("system", system_prompt))
+        messages.append(("human", prompt))
+        return messages
+
     async def extract_structured_data(
         self,
         text: str,
@@ -82,7 +179,7 @@ class GeminiClient:
         instruction: str = "请从以下文本中提取结构化数据"
     ) -> Dict[str, Any]:
         """
-        提取结构化数据
+        提取结构化数据（使用 GEMINI_EXTRACTION_TEMPERATURE，相同输入命中响应缓存）
 
         Args:
             text: 原始文本
@@ -107,7 +204,9 @@ class GeminiClient:
 """
 
         try:
-            response = await self.chat(prompt)
+            response = await self.chat(
+                prompt, temperature=settings.GEMINI_EXTRACTION_TEMPERATURE
+            )
 
             # 解析 JSON 响应
             import json
@@ -134,17 +233,8 @@ class GeminiClient:
         Returns:
             景点列表
         """
-        schema = {
-            "attractions": ["string"]
-        }
-
-        result = await self.extract_structured_data(
-            text=text,
-            schema=schema,
-            instruction="请从这篇旅游攻略中提取所有提到的景点名称"
-        )
-
-        return result.get("attractions", [])
+        results = await self.extract_guide_entities([text])
+        return results[0]["attractions"]
 
     async def extract_restaurants(self, text: str) -> List[str]:
         """
@@ -156,17 +246,164 @@ class GeminiClient:
         Returns:
             餐厅列表
         """
+        results = await self.extract_guide_entities([text])
+        return results[0]["restaurants"]
+
+    async def extract_guide_entities(
+        self,
+        texts: List[str],
+        max_chars: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        批量提取多篇攻略中的景点、餐厅和价格
+
+        多篇攻略按字数上限打包进同一个结构化提示词，一次请求同时返回三类信息；
+        各批次并发执行（受并发上限约束）。单个批次失败只影响该批次的攻略，
+        对应结果为空。
+
+        Args:
+            texts: 攻略文本列表
+            max_chars: 单次请求的攻略总字数上限（默认使用配置文件）
+            max_concurrency: 最大并发请求数（默认使用配置文件）
+
+        Returns:
+            与 texts 一一对应的提取结果：
+            {"attractions": [...], "restaurants": [...], "prices": [{"item", "price"}]}
+        """
+        max_chars = max_chars or settings.GEMINI_BATCH_MAX_CHARS
+        semaphore = asyncio.Semaphore(max_concurrency or settings.GEMINI_MAX_CONCURRENCY)
+        batches = self._chunk_texts(texts, max_chars)
+
+        results: List[Dict[str, Any]] = [
+            {"attractions": [], "restaurants": [], "prices": []}
+            for _ in texts
+        ]
+
+        async def run_batch(indices: List[int]) -> None:
+            async with semaphore:
+                try:
+                    entries = await self._extract_batch(
+                        [texts[i][:max_chars] for i in indices]
+                    )
+                    if not isinstance(entries, list):
+                        raise ValueError(f"guides 不是列表: {type(entries).__name__}")
+
+                    parsed: Dict[int, Dict[str, Any]] = {}
+                    for entry in entries:
+                        if not isinstance(entry, dict):
+                            continue
+                        position = entry.get("index")
+                        if not isinstance(position, int) or not 1 <= position <= len(indices):
+                            continue
+                        parsed[indices[position - 1]] = {
+                            "attractions": self._as_names(entry.get("attractions")),
+                            "restaurants": self._as_names(entry.get("restaurants")),
+                            "prices": self._as_prices(entry.get("prices")),
+                        }
+                except Exception as e:
+                    logger.warning(f"批量提取失败（{len(indices)} 篇攻略）: {e}")
+                    return
+
+            for i, result in parsed.items():
+                results[i] = result
+
+        await asyncio.gather(*(run_batch(indices) for indices in batches))
+
+        logger.info(f"批量提取完成: {len(texts)} 篇攻略，{len(batches)} 次请求")
+        return results
+
+    async def _extract_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """单次请求提取一批攻略（攻略按 1 开始编号）"""
         schema = {
-            "restaurants": ["string"]
+            "guides": [{
+                "index": "int（攻略编号）",
+                "attractions": ["string"],
+                "restaurants": ["string"],
+                "prices": [{"item": "string（景点/餐厅/项目名称）", "price": "number（元）"}]
+            }]
         }
+        numbered = "\n\n".join(
+            f"[攻略 {i}]\n{text}" for i, text in enumerate(texts, 1)
+        )
 
         result = await self.extract_structured_data(
-            text=text,
+            text=numbered,
             schema=schema,
-            instruction="请从这篇旅游攻略中提取所有提到的餐厅、美食店铺名称"
+            instruction=(
+                f"以下是 {len(texts)} 篇编号的旅游攻略。请逐篇提取所有提到的景点名称、"
+                "餐厅/美食店铺名称，以及提到的价格（门票、人均消费等），"
+                "每篇攻略对应 guides 中的一项，index 为攻略编号"
+            )
         )
+        return result.get("guides", [])
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]:
+        """
+        将模型返回的字段规范为列表
+
+        单个值（如字符串）包装为单元素列表，避免 list("字符串") 拆成单个字符。
+        """
+        if value is None or value == "":
+            return []
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        return [value]
+
+    @classmethod
+    def _as_names(cls, value: Any) -> List[str]:
+        """
+        将模型返回的名称字段规范为字符串列表
 
-        return result.get("restaurants", [])
+        模型有时返回对象（如 {"name": "宽窄巷子"}），取其 name；
+        其他非字符串项和空字符串丢弃，保证结果可以去重（可哈希）。
+        """
+        names: List[str] = []
+        for item in cls._as_list(value):
+            if isinstance(item, dict):
+                item = item.get("name")
+            if isinstance(item, str) and item.strip():
+                names.append(item.strip())
+        return names
+
+    @classmethod
+    def _as_prices(cls, value: Any) -> List[Dict[str, Any]]:
+        """将模型返回的价格字段规范为 {"item": 名称, "price": 价格} 列表（丢弃缺少名称的项）"""
+        return [
+            {**item, "item": item["item"].strip()}
+            for item in cls._as_list(value)
+            if isinstance(item, dict)
+            and isinstance(item.get("item"), str) and item["item"].strip()
+        ]
+
+    @staticmethod
+    def _chunk_texts(texts: List[str], max_chars: int) -> List[List[int]]:
+        """
+        按字数上限将攻略分批（超长的单篇攻略单独成批并截断）
+
+        Args:
+            texts: 攻略文本列表
+            max_chars: 每批总字数上限
+
+        Returns:
+            每批包含的攻略下标
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        size = 0
+
+        for i, text in enumerate(texts):
+            length = min(len(text), max_chars)
+            if current and size + length > max_chars:
+                batches.append(current)
+                current, size = [], 0
+            current.append(i)
+            size += length
+
+        if current:
+            batches.append(current)
+        return batches
 
     async def summarize_guides(
         self,
@@ -176,6 +413,9 @@ class GeminiClient:
         """
         总结多篇攻略
 
+        攻略总字数不超过 GEMINI_BATCH_MAX_CHARS 时一次请求完成；
+        否则先 map-reduce 压缩为要点（见 _condense_guides），再生成最终总结。
+
         Args:
             guides: 攻略文本列表
             destination: 目的地
@@ -183,8 +423,147 @@ class GeminiClient:
         Returns:
             总结文本
         """
+        condensed = await self._condense_guides(guides, destination)
+        return await self.chat(self._summary_prompt(condensed, destination))
+
+    async def stream_summary(
+        self,
+        guides: List[str],
+        destination: str
+    ) -> AsyncIterator[str]:
+        """
+        流式总结多篇攻略（map 阶段完成后，流式返回最终总结）
+
+        Args:
+            guides: 攻略文本列表
+            destination: 目的地
+
+        Yields:
+            总结文本片段
+        """
+        condensed = await self._condense_guides(guides, destination)
+        async for chunk in self.chat_stream(self._summary_prompt(condensed, destination)):
+            yield chunk
+
+    async def _condense_guides(
+        self,
+        guides: List[str],
+        destination: str,
+        max_levels: int = 4
+    ) -> List[str]:
+        """
+        将攻略压缩到单次请求的字数上限以内（map-reduce）
+
+        - map：每篇攻略（超长的按上限切段）单独提炼要点，并发执行。
+          提示词只由攻略内容和目的地决定，并以 GEMINI_EXTRACTION_TEMPERATURE 请求，
+          结果经响应缓存按内容哈希复用，新增攻略时只需提炼新增的部分
+        - reduce：要点按字数上限分组合并，逐层进行直到总字数不超过上限
+
+        Args:
+            guides: 攻略文本列表
+            destination: 目的地
+            max_levels: 最多合并层数（超过后截断，避免要点无法继续压缩时无限循环）
+
+        Returns:
+            可直接放入总结提示词的文本列表
+        """
+        max_chars = settings.GEMINI_BATCH_MAX_CHARS
+        if sum(len(guide) for guide in guides) <= max_chars:
+            return guides
+
+        semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+        # map：逐篇提炼要点
+        segments = [
+            guide[start:start + max_chars]
+            for guide in guides
+            for start in range(0, len(guide), max_chars)
+        ]
+        partials = await self._chat_bounded(
+            [self._map_prompt(segment, destination) for segment in segments],
+            semaphore
+        )
+        logger.info(f"攻略要点提炼完成: {len(segments)} 段 → {len(partials)} 份要点")
+
+        # reduce：分组合并，直到放得进一次请求
+        for _ in range(max_levels):
+            if sum(len(p) for p in partials) <= max_chars or len(partials) <= 1:
+                break
+            batches = self._chunk_texts(partials, max_chars)
+            partials = await self._chat_bounded(
+                [
+                    self._reduce_prompt([partials[i][:max_chars] for i in batch], destination)
+                    for batch in batches
+                ],
+                semaphore
+            )
+            logger.info(f"攻略要点合并: {len(batches)} 组")
+
+        # 仍然超长时按比例截断
+        total = sum(len(p) for p in partials)
+        if total > max_chars:
+            partials = [p[:max_chars * len(p) // total] for p in partials]
+        return partials
+
+    async def _chat_bounded(
+        self,
+        prompts: List[str],
+        semaphore: asyncio.Semaphore
+    ) -> List[str]:
+        """
+        受并发上限约束地执行多个请求（失败的请求跳过，全部失败时抛出）
+
+        要点提炼与合并是确定性任务，以 GEMINI_EXTRACTION_TEMPERATURE 请求，
+        相同的攻略片段命中响应缓存。
+
+        Args:
+            prompts: 提示词列表
+            semaphore: 并发信号量
+
+        Returns:
+            成功的响应文本（保持提示词顺序）
+        """
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.chat(
+                    prompt, temperature=settings.GEMINI_EXTRACTION_TEMPERATURE
+                )
+
+        results = await asyncio.gather(*(run(p) for p in prompts), return_exceptions=True)
+        responses = [r for r in results if not isinstance(r, BaseException)]
+        failed = len(results) - len(responses)
+        if failed:
+            logger.warning(f"{failed}/{len(results)} 个请求失败，已跳过")
+        if not responses and results:
+            raise next(r for r in results if isinstance(r, BaseException))
+        return responses
+
+    @staticmethod
+    def _map_prompt(guide: str, destination: str) -> str:
+        """构建单篇攻略要点提炼提示词"""
+        return f"""
+请提炼以下这篇关于 {destination} 的旅游攻略中的关键信息，用简洁的条目列出：
+景点、美食、交通、住宿、注意事项（没有提到的类别省略）。
+
+{guide}
+"""
+
+    @staticmethod
+    def _reduce_prompt(partials: List[str], destination: str) -> str:
+        """构建要点合并提示词"""
+        combined_text = "\n\n---\n\n".join(partials)
+        return f"""
+以下是多篇关于 {destination} 的旅游攻略的要点，请合并为一份要点清单，
+去除重复内容，保留具体名称、价格和建议，按景点、美食、交通、住宿、注意事项分类：
+
+{combined_text}
+"""
+
+    @staticmethod
+    def _summary_prompt(guides: List[str], destination: str) -> str:
+        """构建攻略总结提示词"""
         combined_text = "\n\n---\n\n".join(guides)
-        prompt = f"""
+        return f"""
 请总结以下关于 {destination} 的旅游攻略，提炼出关键信息：
 
 {combined_text}
@@ -197,8 +576,6 @@ class GeminiClient:
 5. 注意事项
 """
 
-        return await self.chat(prompt)
-
     def _format_schema(self, schema: Dict[str, Any]) -> str:
         """格式化数据模式为文本描述"""
         import json
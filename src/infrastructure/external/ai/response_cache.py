@@ -0,0 +1,233 @@
+"""
+LLM 响应缓存
+============
+
+相同的 (模型, 温度, 系统提示词, 提示词) 得到的响应直接复用，不再调用 API。
+缓存键是这四项的 SHA-256 摘要（内容寻址），与调用方无关：
+同一篇攻略无论是在规划、总结还是提取中被处理过，只要提示词相同都能命中。
+
+两级存储：
+- 磁盘（默认开启）：每个响应一个 JSON 文件，TTL 过期，超过条目上限时按最近访问时间淘汰
+- Redis（可选）：多进程 / 多实例共享，过期由 Redis 负责
+
+温度高于 LLM_CACHE_MAX_TEMPERATURE 的请求视为需要随机输出，不读也不写缓存。
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ...cache.redis_client import RedisClient, redis_client
+from ...utils.config import settings
+from ...utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+class LLMResponseCache:
+    """内容寻址的 LLM 响应缓存（磁盘 + 可选 Redis）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_temperature: Optional[float] = None,
+        redis: Optional[RedisClient] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录（默认使用配置文件）
+            ttl: 过期时间（秒，默认使用配置文件）
+            max_entries: 磁盘缓存最大条目数（默认使用配置文件）
+            max_temperature: 允许缓存的最高温度（默认使用配置文件）
+            redis: Redis 客户端（不传则只使用磁盘缓存）
+        """
+        self.cache_dir = Path(cache_dir or settings.LLM_CACHE_DIR)
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.max_temperature = (
+            max_temperature if max_temperature is not None
+            else settings.LLM_CACHE_MAX_TEMPERATURE
+        )
+        self.redis = redis
+
+        self._lock = threading.Lock()
+        self._entries = sum(1 for _ in self.cache_dir.glob("*/*.json"))
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str],
+        prompt: str
+    ) -> str:
+        """
+        计算缓存键
+
+        Args:
+            model: 模型名称
+            temperature: 温度
+            system_prompt: 系统提示词
+            prompt: 用户提示词
+
+        Returns:
+            SHA-256 十六进制摘要
+        """
+        payload = json.dumps(
+            [model, temperature, system_prompt or "", prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """温度是否足够低，输出可视为确定性的"""
+        return temperature <= self.max_temperature
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存（先磁盘后 Redis，Redis 命中时回填磁盘）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            响应文本，未命中返回 None
+        """
+        response = self._read_disk(key)
+        if response is None and self.redis is not None:
+            response = await self.redis.get(self._redis_key(key))
+            if response is not None:
+                self._write_disk(key, response)
+
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    async def set(self, key: str, response: str) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            response: 响应文本
+        """
+        self._write_disk(key, response)
+        if self.redis is not None:
+            await self.redis.set(self._redis_key(key), response, expire=self.ttl)
+
+    def clear(self) -> None:
+        """清空磁盘缓存"""
+        with self._lock:
+            for path in self.cache_dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+            self._entries = 0
+
+    def stats(self) -> Dict[str, float]:
+        """命中统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    # ==================== 磁盘存储 ====================
+
+    def _path(self, key: str) -> Path:
+        """缓存文件路径（按键前两位分目录，避免单目录文件过多）"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"llm:{key}"
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        """读取磁盘缓存（过期则删除）"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"LLM 缓存读取失败 [{key[:12]}]: {e}")
+            return None
+
+        if time.time() - entry["cached_at"] > self.ttl:
+            self._remove(path)
+            return None
+
+        # 更新访问时间，淘汰时按最近访问排序
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["response"]
+
+    def _write_disk(self, key: str, response: str) -> None:
+        """写入磁盘缓存，超过条目上限时淘汰"""
+        path = self._path(key)
+        existed = path.exists()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"cached_at": time.time(), "response": response}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"LLM 缓存写入失败 [{key[:12]}]: {e}")
+            return
+
+        with self._lock:
+            if not existed:
+                self._entries += 1
+            over_limit = self._entries > self.max_entries
+        if over_limit:
+            self._evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._entries -= 1
+
+    def _evict(self) -> None:
+        """淘汰最久未访问的条目，降到上限的 90%"""
+        files = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        files.sort()
+
+        target = int(self.max_entries * 0.9)
+        for _, path in files[:max(0, len(files) - target)]:
+            path.unlink(missing_ok=True)
+
+        with self._lock:
+            self._entries = min(len(files), target)
+        logger.info(f"LLM 缓存淘汰: {max(0, len(files) - target)} 条")
+
+
+# 全局 LLM 响应缓存实例
+llm_cache = LLMResponseCache(
+    redis=redis_client if settings.LLM_CACHE_USE_REDIS else None
+)
@@ -6,5 +6,12 @@
 """
 
 from .collector import XiaohongshuCollector
+from .scout_cache import ScoutCache, scout_cache
+from .dom_extractor import DomExtractor
+from .seen_posts import SeenPostsStore, seen_posts
+from .concurrency import AdaptiveConcurrency, detail_concurrency
+from .retry_policy import CircuitBreaker, DeadLetterQueue, RetryPolicy, retry_policy
 
-__all__ = ['XiaohongshuCollector']
+__all__ = ['XiaohongshuCollector', 'ScoutCache', 'scout_cache', 'DomExtractor',
+           'SeenPostsStore', 'seen_posts', 'AdaptiveConcurrency', 'detail_concurrency',
+           'CircuitBreaker', 'DeadLetterQueue', 'RetryPolicy', 'retry_policy']
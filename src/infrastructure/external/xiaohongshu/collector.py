@@ -12,11 +12,11 @@
 
 主要特性：
 1. Scout 探测机制：先用 AI 识别页面结构，再执行收集任务
-2. 性能优化：优化的 Chromium 启动参数，减少资源占用
+2. 性能优化：生产配置下无头启动（附加 Chromium 启动参数），拦截图片/视频/字体和统计请求
 3. 并发收集：支持多任务并行，大幅提升收集速度
 4. 智能重试：失败自动重试，提高成功率
 5. 严格的资源管理：避免内存泄漏和资源浪费
-6. 可视化调试：始终显示浏览器窗口，便于观察执行过程
+6. 可视化调试：有显示器且未设置 BROWSER_HEADLESS 时显示浏览器窗口，便于观察执行过程
 
 作者：Shiyuan Chen
 日期：2025-01-02
@@ -30,7 +30,8 @@ from browser_use import Agent, Browser
 # Agent: browser-use 的核心类，负责执行自动化任务
 # Browser: 浏览器实例管理器
 # 注意：browser-use 最新版本移除了 BrowserConfig 和 BrowserContextConfig
-# 配置现在通过 Browser 构造函数和 new_context() 方法的参数传递
+# 配置现在通过 Browser 构造函数的参数传递，Agent 通过 browser_session 参数共享浏览器
+# （旧的 browser_context 参数会被静默忽略，导致每个 Agent 各自启动一个浏览器）
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 # ChatGoogleGenerativeAI: LangChain 封装的 Google Gemini API
@@ -39,15 +40,69 @@ from dotenv import load_dotenv
 # load_dotenv: 从 .env 文件加载环境变量（如 API 密钥）
 
 import asyncio  # 异步编程库
+from contextlib import AsyncExitStack, asynccontextmanager  # 异步上下文管理器（worker 浏览器会话）
 import json  # JSON 数据处理
 from datetime import datetime  # 时间戳和日期处理
 import os  # 文件和目录操作
 import re  # 正则表达式（用于提取 JSON）
-from typing import List, Dict, Optional  # 类型注解
+import sys  # 平台判断（没有显示器时无头启动）
+import time  # Agent 运行计时（截止时间预算）
+from typing import Any, Callable, List, Dict, Optional, TYPE_CHECKING  # 类型注解
+
+if TYPE_CHECKING:
+    # 仅用于类型注解，保证本文件仍可作为独立脚本运行
+    from ...browser.pool import BrowserPool, PooledBrowser
+    from ...browser.profile import ProductionBrowserProfile, ResourceBlocker
+    from .scout_cache import ScoutCache
+    from .dom_extractor import DomExtractor
+    from .seen_posts import SeenPostsStore
+    from .concurrency import AdaptiveConcurrency
+    from .retry_policy import RetryPolicy
 
 # 加载环境变量（从 .env 文件读取 GEMINI_API_KEY）
 load_dotenv()
 
+# 小红书站点根地址、帖子链接和笔记 ID 的解析（实现见 src/shared）
+try:
+    from ....shared.constants import XHS_BASE_URL
+    from ....shared.utils import parse_note_id as _parse_note_id, resolve_post_url as _resolve_post_url
+except ImportError:
+    # 作为独立脚本运行（python collector.py）时没有包上下文，无法相对导入；
+    # 以下副本与 src/shared/constants.py、src/shared/utils.py 保持一致
+    XHS_BASE_URL = "https://www.xiaohongshu.com"
+    NOTE_ID_PATTERN = re.compile(r"/(?:explore|discovery/item|search_result)/([0-9a-f]{24})(?:[/?#]|$)")
+
+    def _parse_note_id(url: Optional[str]) -> Optional[str]:
+        if not url:
+            return None
+        match = NOTE_ID_PATTERN.search(str(url).strip().split("?")[0].split("#")[0] + "/")
+        return match.group(1) if match else None
+
+    def _resolve_post_url(post: Dict) -> Optional[str]:
+        for key in ("url", "url_link", "link"):
+            url = post.get(key)
+            if isinstance(url, str) and url.strip():
+                url = url.strip()
+                if url.startswith("//"):
+                    return f"https:{url}"
+                if url.startswith("/"):
+                    return f"{XHS_BASE_URL}{url}"
+                if url.startswith("http"):
+                    return url
+        return None
+
+# 批次清单（断点续跑）：记录各阶段完成时间和每个帖子的收集状态
+MANIFEST_FILE = "manifest.json"
+POST_FILE_PATTERN = re.compile(r"post_(\d+)\.json")
+
+# 各阶段 Agent 预算：最大步数、最大 token 数、截止时间（秒）
+# 超出任一预算即停止；列表和详情阶段提取到合法 JSON 后立即结束
+DEFAULT_PHASE_BUDGETS = {
+    "scout": {"max_steps": 8, "max_tokens": 60000, "deadline": 90},
+    "list": {"max_steps": 10, "max_tokens": 80000, "deadline": 120},
+    "detail": {"max_steps": 8, "max_tokens": 60000, "deadline": 90},
+}
+
 
 class XiaohongshuCollector:
     """
@@ -68,7 +123,7 @@ class XiaohongshuCollector:
 
     核心特性：
     - Scout 探测：避免盲目执行，先了解页面结构
-    - 性能调优：优化 Chromium 启动参数，减少 50% 启动时间
+    - 生产配置：无头启动并附加 Chromium 参数，拦截媒体资源和统计请求（见 browser_profile）
     - 并发收集：多任务并行，速度提升 3 倍
     - 智能重试：失败自动重试 2 次，提高鲁棒性
     - 资源清理：严格的 try-finally 确保资源释放
@@ -80,7 +135,16 @@ class XiaohongshuCollector:
         max_posts: int = 5,
         use_vision: bool = False,
         concurrent: bool = False,
-        max_concurrent: int = 3
+        max_concurrent: int = 3,
+        browser_pool: Optional["BrowserPool"] = None,
+        scout_cache: Optional["ScoutCache"] = None,
+        dom_extractor: Optional["DomExtractor"] = None,
+        on_progress: Optional[Callable[[Dict], Any]] = None,
+        seen_posts: Optional["SeenPostsStore"] = None,
+        browser_profile: Optional["ProductionBrowserProfile"] = None,
+        phase_budgets: Optional[Dict[str, Dict]] = None,
+        concurrency: Optional["AdaptiveConcurrency"] = None,
+        retry_policy: Optional["RetryPolicy"] = None
     ):
         """
         初始化收集器
@@ -111,6 +175,61 @@ class XiaohongshuCollector:
                 默认: 3
                 建议: 2-5（过高会导致浏览器卡顿）
 
+            browser_pool (Optional[BrowserPool]):
+                浏览器池（可选）
+                提供时：collect_posts 从池中借出已预热的浏览器，结束后归还
+                不提供时：自行创建浏览器，收集结束后关闭（独立脚本模式）
+
+            scout_cache (Optional[ScoutCache]):
+                Scout 报告缓存（可选）
+                提供时：同类页面在 TTL 内复用 Scout 报告，跳过 Scout 阶段
+                不提供时：每次都执行 Scout
+
+            dom_extractor (Optional[DomExtractor]):
+                DOM 直接提取器（可选）
+                提供时：列表和详情优先用 CSS 选择器直接读取（毫秒级、零 token），
+                        校验失败才回退到 AI Agent
+                不提供时：始终使用 AI Agent 提取
+
+            on_progress (Optional[Callable[[Dict], Any]]):
+                进度回调（可选，普通函数或协程函数）
+                列表收集完成、每个帖子完成、全部完成时各调用一次，
+                参数为事件字典，如 {"stage": "post", "index": 1, "total": 5, "status": "ok"}
+                用于流式接口实时推送收集进度
+
+            seen_posts (Optional[SeenPostsStore]):
+                已收集帖子记录（可选）
+                提供时：增量收集，详情阶段只处理新帖子和点赞数明显变化的帖子，
+                        其余帖子记录在 summary.json 的 skipped 中（指向上次收集的批次）
+                不提供时：每次全量收集
+
+            browser_profile (Optional[ProductionBrowserProfile]):
+                生产环境浏览器配置（可选）
+                提供时：按配置无头启动并附加启动参数；非视觉模式下拦截图片、视频、字体
+                        和统计请求，每个详情页节省的流量记录在 summary.json 的 resources 中
+                不提供时：与生产配置的默认值一致（按 BROWSER_HEADLESS，没有显示器时总是无头），
+                        不附加启动参数，不拦截请求
+
+            phase_budgets (Optional[Dict[str, Dict]]):
+                各阶段 Agent 预算（可选，按阶段覆盖 DEFAULT_PHASE_BUDGETS）
+                示例: {"detail": {"max_steps": 6, "max_tokens": 40000, "deadline": 60}}
+                每次 Agent 运行超出最大步数 / token 数 / 截止时间即停止，
+                各阶段的步数、token、耗时和停止原因记录在 summary.json 的 agent_budget 中
+
+            concurrency (Optional[AdaptiveConcurrency]):
+                自适应并发控制器（可选，仅在 concurrent=True 时有效）
+                提供时：按 AIMD 动态调整同时收集的帖子数，耗时和成功率健康时逐步提高，
+                        遇到超时、访问频繁页面或 LLM 429 时减半（过载由 retry_policy 识别）；
+                        worker 数取控制器的上界，控制器状态记录在 summary.json 的 concurrency 中
+                不提供时：固定使用 max_concurrent 个 worker
+
+            retry_policy (Optional[RetryPolicy]):
+                详情重试策略（可选）
+                提供时：按失败类别指数退避 + 抖动重试，共享熔断器在连续过载时暂停尝试，
+                        放弃的帖子记入死信列表，详情阶段结束后重新排队一次；
+                        策略状态和本批次剩余的死信记录在 summary.json 的 retry 中
+                不提供时：任何失败都间隔 2 秒重试 retry_count 次
+
         内部组件：
             - llm: Google Gemini 模型实例
             - browser: Chromium 浏览器实例
@@ -121,6 +240,31 @@ class XiaohongshuCollector:
         self.use_vision = use_vision
         self.concurrent = concurrent
         self.max_concurrent = max_concurrent
+        self.browser_pool = browser_pool
+        self._pooled: Optional["PooledBrowser"] = None
+        self.scout_cache = scout_cache
+        self.scout_report: Optional[str] = None  # 注入列表/详情提示词的页面结构参考
+        self.dom_extractor = dom_extractor
+        self.extraction_stats = {"dom": 0, "agent": 0}  # 各提取方式的成功次数
+        self.on_progress = on_progress
+        self.seen_posts = seen_posts
+        self.skipped_posts: List[Dict] = []  # 增量收集中跳过的帖子及其上次收集位置
+        self.batch_dir: Optional[str] = None  # 最近一次 collect_posts 的批次目录
+        self.browser_profile = browser_profile
+        self.headless = (
+            browser_profile.headless if browser_profile is not None
+            else self._default_headless()
+        )
+        self._blockers: Dict[int, "ResourceBlocker"] = {}  # id(浏览器) → 资源拦截器
+        self.resource_stats: List[Dict] = []  # 每个详情页拦截的请求和节省的字节数
+        self.phase_budgets = {
+            phase: {**budget, **(phase_budgets or {}).get(phase, {})}
+            for phase, budget in DEFAULT_PHASE_BUDGETS.items()
+        }
+        self.phase_stats: Dict[str, Dict] = {}  # 各阶段 Agent 运行统计
+        self.manifest: Dict = {}  # 当前批次的清单（断点续跑）
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy
 
         # ============================================================
         # 创建 AI 模型
@@ -138,21 +282,150 @@ class XiaohongshuCollector:
         # 创建浏览器配置
         # ============================================================
         # 注意：browser-use 最新版本直接通过 Browser 构造函数传递配置参数
-        # 性能提升效果：
-        # - 启动时间: 减少约 50%
-        # - 内存占用: 减少约 30%
-        # - CPU 使用: 减少约 20%
-
-        self.browser = Browser(
-            headless=False,  # 是否无头模式（False=显示浏览器窗口）
-            disable_security=True,  # 禁用安全限制（避免证书错误）
-        )
+        # 生产配置（browser_profile）：无头启动 + 静音/禁止自动播放/禁用 GPU 等参数，
+        # 媒体资源和统计请求在 collect_posts 中通过 CDP 请求拦截屏蔽
+
+        # 使用浏览器池时，浏览器在 collect_posts 中借出
+        if browser_pool is None:
+            self.browser = self._create_browser()
+        else:
+            self.browser = None
         self.context = None
 
         # 输出目录
         self.output_dir = "collected_posts"
         os.makedirs(self.output_dir, exist_ok=True)
 
+    @staticmethod
+    def _default_headless() -> bool:
+        """
+        未提供 browser_profile 时是否无头启动（与 ProductionBrowserProfile 的默认值一致）
+
+        返回：
+            bool: 配置了 BROWSER_HEADLESS 或没有显示器时为 True
+        """
+        try:
+            from ...browser.profile import ProductionBrowserProfile
+        except ImportError:
+            # 作为独立脚本运行时没有包上下文：读取环境变量，
+            # 显示器判断与 src/infrastructure/browser/profile.has_display 一致
+            if sys.platform.startswith("linux") and not (
+                os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+            ):
+                return True
+            return os.getenv("BROWSER_HEADLESS", "false").lower() in ("1", "true", "yes")
+        return ProductionBrowserProfile().headless
+
+    def _create_browser(self) -> Browser:
+        """创建一个独立的浏览器会话（未使用浏览器池时）"""
+        if self.browser_profile is not None:
+            return self.browser_profile.create_browser()
+        return Browser(
+            headless=self.headless,  # 是否无头模式（False=显示浏览器窗口）
+            disable_security=True,  # 禁用安全限制（避免证书错误）
+            keep_alive=True,  # Agent 结束后不关闭浏览器，各阶段共享同一会话
+        )
+
+    async def _install_blocker(self, browser) -> None:
+        """
+        在浏览器上启用资源拦截（提供了 browser_profile 且开启拦截时）
+
+        视觉模式需要截图，保留图片，只拦截视频、字体和统计请求。
+        """
+        if self.browser_profile is None or browser is None:
+            return
+        blocker = self.browser_profile.resource_blocker(use_vision=self.use_vision)
+        if blocker is None:
+            return
+        try:
+            await blocker.install(browser)
+            self._blockers[id(browser)] = blocker
+        except Exception as e:
+            print(f"  ⚠️  资源拦截启用失败，页面将正常加载: {str(e)}")
+
+    async def _uninstall_blocker(self, browser) -> None:
+        """停止资源拦截（浏览器归还到池中或关闭前）"""
+        blocker = self._blockers.pop(id(browser), None) if browser is not None else None
+        if blocker is not None:
+            await blocker.uninstall()
+
+    def _resource_snapshot(self, browser) -> Optional[Dict]:
+        """浏览器当前的拦截统计（未启用拦截时返回 None）"""
+        blocker = self._blockers.get(id(browser)) if browser is not None else None
+        return blocker.snapshot() if blocker is not None else None
+
+    def _record_page_resources(self, post_index: int, browser, before: Optional[Dict]) -> None:
+        """记录单个详情页拦截的请求和节省的字节数"""
+        blocker = self._blockers.get(id(browser)) if browser is not None else None
+        if blocker is None or before is None:
+            return
+
+        page = blocker.diff(before, blocker.snapshot())
+        page["post_index"] = post_index
+        self.resource_stats.append(page)
+        if page["blocked_requests"]:
+            print(f"  🚫 第 {post_index} 个帖子拦截 {page['blocked_requests']} 个请求，"
+                  f"节省 {page['bytes_saved'] / 1024:.0f} KB")
+
+    def _resource_summary(self) -> Dict:
+        """summary.json 中的资源拦截汇总"""
+        return {
+            "blocking": bool(self._blockers) or bool(self.resource_stats),
+            "blocked_requests": sum(p["blocked_requests"] for p in self.resource_stats),
+            "bytes_saved": sum(p["bytes_saved"] for p in self.resource_stats),
+            "pages": sorted(self.resource_stats, key=lambda p: p["post_index"]),
+        }
+
+    @staticmethod
+    def resolve_post_url(post: Dict) -> Optional[str]:
+        """
+        从列表数据中解析帖子详情页的绝对 URL
+
+        列表阶段由 AI 提取，字段名不固定（url / url_link / link），
+        且经常是 "/explore/<note_id>?xsec_token=..." 这样的相对路径。
+
+        参数：
+            post (Dict): posts_list.json 中的单个帖子
+
+        返回：
+            Optional[str]: 绝对 URL，没有链接时返回 None
+        """
+        return _resolve_post_url(post)
+
+    @staticmethod
+    def parse_note_id(url: Optional[str]) -> Optional[str]:
+        """
+        从帖子链接中解析小红书笔记 ID
+
+        笔记 ID 是帖子的稳定标识，跨批次不变：
+        存储、缓存、增量收集都以它作为帖子的主键，而不是批次内的序号。
+
+        参数：
+            url (Optional[str]): 帖子链接，如 "/explore/<note_id>?xsec_token=..."
+
+        返回：
+            Optional[str]: 24 位十六进制笔记 ID，无法解析时返回 None
+        """
+        return _parse_note_id(url)
+
+    def _scout_hint(self, max_chars: int = 1500) -> str:
+        """
+        生成注入提示词的 Scout 页面结构参考
+
+        参数：
+            max_chars (int): 报告最大长度（控制 token 消耗）
+
+        返回：
+            str: 提示词片段，没有 Scout 报告时返回空字符串
+        """
+        if not self.scout_report:
+            return ""
+
+        return f"""
+        **页面结构参考（Scout 报告）：**
+        {self.scout_report[:max_chars]}
+        """
+
     def extract_json_from_text(self, text: str, is_array: bool = False) -> Optional[Dict]:
         """
         从 AI 返回的文本中提取 JSON 数据
@@ -195,6 +468,182 @@ class XiaohongshuCollector:
 
         return None
 
+    def _classify_failure(
+        self,
+        history=None,
+        error: Optional[BaseException] = None,
+        timed_out: bool = False,
+        default: str = "unknown"
+    ) -> Optional[str]:
+        """
+        详情收集失败分类（由 retry_policy 分类，未提供重试策略时不分类）
+
+        参数：
+            history: Agent 运行历史（检查步骤错误、提取内容和访问过的 URL）
+            error (Optional[BaseException]): 收集时抛出的异常
+            timed_out (bool): Agent 是否超出截止时间
+            default (str): 没有明确失败信号时的类别（未提取到数据为 parse）
+
+        返回：
+            Optional[str]: 失败类别（llm_quota / rate_limit / timeout / login_wall / parse / unknown），
+                           未提供重试策略时返回 None
+        """
+        if self.retry_policy is None:
+            return None
+
+        errors, pages = [], []
+        if history is not None:
+            errors = history.errors()
+            pages = history.extracted_content() + history.urls()
+        failure = self.retry_policy.classify(error=error, errors=errors, pages=pages, timed_out=timed_out)
+        return failure or default
+
+    def _record_attempt(self, failure: Optional[str]) -> None:
+        """
+        记录一次详情尝试的结果
+
+        成功关闭熔断器；过载类失败（超时 / 访问频繁 / LLM 限流）计入熔断器，
+        并通知并发控制器降低并发。
+
+        参数：
+            failure (Optional[str]): 失败类别，成功为 None
+        """
+        if self.retry_policy is None:
+            return
+        if failure is None:
+            self.retry_policy.record_success()
+            return
+
+        self.retry_policy.record_failure(failure)
+        if self.concurrency is not None and self.retry_policy.is_overload(failure):
+            self.concurrency.record_overload(failure)
+
+    def _retry_delay(self, failure: Optional[str], attempt: int, retry_count: int) -> Optional[float]:
+        """
+        下一次重试前的等待时间
+
+        参数：
+            failure (Optional[str]): 本次失败的类别
+            attempt (int): 已完成的尝试次数（从 1 开始）
+            retry_count (int): 未提供重试策略时的最大重试次数
+
+        返回：
+            Optional[float]: 等待秒数；不再重试返回 None
+        """
+        if self.retry_policy is None:
+            return 2 if attempt <= retry_count else None
+        return self.retry_policy.next_delay(failure, attempt)
+
+    def _give_up(
+        self,
+        post_index: int,
+        batch_dir: str,
+        note_id: Optional[str],
+        post_url: Optional[str],
+        failure: Optional[str],
+        error: str,
+        attempts: int
+    ) -> Dict:
+        """
+        放弃收集一个帖子：保存错误信息，并记入死信列表（提供重试策略时）
+
+        返回：
+            Dict: 错误信息
+        """
+        detail_file = f"{batch_dir}/post_{post_index}.json"
+        with open(detail_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "post_index": post_index,
+                "note_id": note_id,
+                "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "error": error,
+                "failure": failure,
+                "attempts": attempts
+            }, f, ensure_ascii=False, indent=2)
+
+        if self.retry_policy is not None:
+            self.retry_policy.dead_letters.add(batch_dir, post_index, post_url, failure, error, attempts)
+        return {"error": error, "failure": failure}
+
+    async def _run_agent(self, phase: str, agent: Agent, expect_json: Optional[bool] = None):
+        """
+        在阶段预算内运行 Agent
+        ====================================
+
+        每一步结束时检查：
+        - expect_json 不为 None 且已提取到合法 JSON：立即结束（不再等 Agent 自行 done）
+        - 累计 token 数超出预算：停止
+        - 超过截止时间：停止
+        最大步数通过 run(max_steps=...) 限制；截止时间同时由 asyncio.wait_for 兜底，
+        避免单步卡住时超时检查无法执行。
+
+        参数：
+            phase (str): 阶段名（scout / list / detail）
+            agent (Agent): 待运行的 Agent
+            expect_json (Optional[bool]): 期望的提取结果
+                None: 不检查（Scout 阶段只产出文字报告）
+                False: JSON 对象（详情）
+                True: JSON 数组（列表）
+
+        返回：
+            Tuple[AgentHistoryList, str]: 运行历史（超时被取消时为已完成步骤的历史）和停止原因
+                停止原因：json / done / max_steps / max_tokens / deadline / failed
+        """
+        budget = self.phase_budgets[phase]
+        started = time.monotonic()
+        stop_reason: Optional[str] = None
+
+        def used_tokens() -> int:
+            usage_history = getattr(agent.token_cost_service, "usage_history", [])
+            return sum(entry.usage.total_tokens for entry in usage_history)
+
+        def has_json(history) -> bool:
+            return any(
+                self.extract_json_from_text(str(content), is_array=expect_json) is not None
+                for content in history.extracted_content()
+            )
+
+        async def check_budget(running_agent) -> None:
+            nonlocal stop_reason
+            if expect_json is not None and has_json(running_agent.history):
+                stop_reason = "json"
+            elif used_tokens() >= budget["max_tokens"]:
+                stop_reason = "max_tokens"
+            elif time.monotonic() - started >= budget["deadline"]:
+                stop_reason = "deadline"
+            if stop_reason:
+                running_agent.stop()
+
+        try:
+            history = await asyncio.wait_for(
+                agent.run(max_steps=budget["max_steps"], on_step_end=check_budget),
+                timeout=budget["deadline"]
+            )
+        except asyncio.TimeoutError:
+            stop_reason = "deadline"
+            history = agent.history
+
+        if stop_reason is None:
+            if history.is_done():
+                stop_reason = "done"
+            elif history.number_of_steps() >= budget["max_steps"]:
+                stop_reason = "max_steps"
+            else:
+                stop_reason = "failed"
+
+        stats = self.phase_stats.setdefault(phase, {
+            "runs": 0, "steps": 0, "tokens": 0, "seconds": 0.0, "stop_reasons": {}
+        })
+        stats["runs"] += 1
+        stats["steps"] += history.number_of_steps()
+        stats["tokens"] += used_tokens()
+        stats["seconds"] = round(stats["seconds"] + time.monotonic() - started, 2)
+        stats["stop_reasons"][stop_reason] = stats["stop_reasons"].get(stop_reason, 0) + 1
+
+        if stop_reason in ("max_tokens", "deadline", "max_steps"):
+            print(f"  ⏱️  {phase} 阶段 Agent 超出预算（{stop_reason}），已停止")
+        return history, stop_reason
+
     async def scout_posts(self) -> Dict:
         """
         Scout 探测模式：先识别页面结构，再执行收集
@@ -246,11 +695,11 @@ class XiaohongshuCollector:
         scout_agent = Agent(
             task=scout_task,
             llm=self.llm,
-            browser_context=self.context,
+            browser_session=self.context,
             use_vision=self.use_vision
         )
 
-        scout_result = await scout_agent.run()
+        scout_result, _ = await self._run_agent("scout", scout_agent)
         scout_report = str(scout_result.final_result()) if hasattr(scout_result, 'final_result') else str(scout_result)
 
         print(f"✅ Scout 完成，页面结构已识别")
@@ -296,6 +745,16 @@ class XiaohongshuCollector:
         """
         print("📋 步骤1: 收集帖子列表...")
 
+        # 快速路径：直接读取 DOM，校验通过则跳过 AI Agent
+        if self.dom_extractor is not None:
+            posts_list = await self.dom_extractor.extract_post_list(
+                self.context, self.xiaohongshu_url, self.max_posts
+            )
+            if posts_list:
+                self.extraction_stats["dom"] += 1
+                print(f"✅ 收集到 {len(posts_list)} 个帖子（DOM 直接提取）\n")
+                return posts_list
+
         list_task = f"""
         访问 {self.xiaohongshu_url}
 
@@ -305,7 +764,7 @@ class XiaohongshuCollector:
         2. 或点击弹窗外部的深色遮罩层
         3. 或按 ESC 键
         确认弹窗已关闭后再继续。
-
+        {self._scout_hint()}
         **然后收集数据：**
         使用 extract_structured_data 收集页面前 {self.max_posts} 个帖子的信息：
         - position: 序号（1, 2, 3...）
@@ -320,11 +779,11 @@ class XiaohongshuCollector:
         list_agent = Agent(
             task=list_task,
             llm=self.llm,
-            browser_context=self.context,
+            browser_session=self.context,
             use_vision=self.use_vision
         )
 
-        list_result = await list_agent.run()
+        list_result, _ = await self._run_agent("list", list_agent, expect_json=True)
 
         # 提取帖子列表
         posts_list = []
@@ -334,6 +793,7 @@ class XiaohongshuCollector:
                 posts_list = extracted
                 break
 
+        self.extraction_stats["agent"] += 1
         print(f"✅ 收集到 {len(posts_list)} 个帖子\n")
         return posts_list
 
@@ -341,7 +801,9 @@ class XiaohongshuCollector:
         self,
         post_index: int,
         batch_dir: str,
-        retry_count: int = 2
+        retry_count: int = 2,
+        post_url: Optional[str] = None,
+        browser_context=None
     ) -> Dict:
         """
         收集单个帖子详情（第二阶段：深层收集）
@@ -369,35 +831,82 @@ class XiaohongshuCollector:
             - time: 评论时间
 
         重试机制：
-        - 失败会自动重试（默认 2 次）
-        - 每次重试间隔 2 秒
+        - 提供 retry_policy 时：按失败类别（LLM 配额 / 访问频繁 / 超时 / 登录墙 /
+          解析失败）决定重试次数，指数退避 + 随机抖动；熔断器打开时等待冷却后的
+          试探结果（不消耗重试次数），重试耗尽的帖子记入死信列表，详情阶段结束后重新排队一次
+        - 未提供时：失败自动重试（默认 2 次），每次间隔 2 秒
         - 超过重试次数后保存错误信息
 
         参数：
             post_index (int): 帖子序号（从 1 开始）
             batch_dir (str): 数据保存目录
-            retry_count (int): 最大重试次数（默认 2）
+            retry_count (int): 最大重试次数（默认 2，提供 retry_policy 时按失败类别决定）
+            post_url (Optional[str]): 帖子详情页 URL
+                提供时直接打开详情页，不依赖列表页的点击和返回
+            browser_context: 执行任务的浏览器会话（默认 self.context）
+                并发模式下每个 worker 传入自己独占的会话
 
         返回：
             Dict: 帖子详细数据或错误信息
 
         工作流程：
-        1. 点击第 N 个帖子
+        1. 点击第 N 个帖子（或直接打开 post_url）
         2. 等待详情页加载
         3. 提取帖子信息和评论
         4. 保存为 post_N.json
-        5. 返回列表页
+        5. 返回列表页（直接打开 URL 时省略）
         """
-        for attempt in range(retry_count + 1):
+        context = browser_context if browser_context is not None else self.context
+        note_id = self.parse_note_id(post_url)
+
+        # 快速路径：直接读取详情页 DOM，校验通过则跳过 AI Agent
+        if self.dom_extractor is not None and post_url:
+            post_data = await self.dom_extractor.extract_post_detail(context, post_url)
+            if post_data:
+                self.extraction_stats["dom"] += 1
+                detail_file = f"{batch_dir}/post_{post_index}.json"
+                with open(detail_file, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "post_index": post_index,
+                        "note_id": note_id,
+                        "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "data": post_data,
+                        "attempts": 1,
+                        "method": "dom"
+                    }, f, ensure_ascii=False, indent=2)
+                return post_data
+
+        if post_url:
+            # 直接打开详情页：不依赖列表页状态，可在独立会话中并行执行
+            open_step = f"访问第 {post_index} 个帖子的详情页 {post_url}"
+            finish_step = "完成后直接结束任务，不需要返回列表页"
+        elif browser_context is not None:
+            # 独立会话但没有链接：先打开列表页再点击
+            open_step = f"访问 {self.xiaohongshu_url}，点击第 {post_index} 个帖子"
+            finish_step = "完成后直接结束任务，不需要返回列表页"
+        else:
+            open_step = f"点击第 {post_index} 个帖子"
+            finish_step = "完成后返回列表页"
+
+        attempt = 0
+        while True:
+            attempt += 1
+
+            # 熔断器打开：等待冷却后的试探结果，不消耗重试次数
+            if self.retry_policy is not None:
+                waited = await self.retry_policy.breaker.wait()
+                if waited:
+                    print(f"  ⏸️  熔断器打开，第 {post_index} 个帖子等待 {waited:.0f} 秒后继续")
+
             try:
                 detail_task = f"""
                 **如果出现登录弹窗，请先关闭它：**
                 1. 点击关闭按钮（X）
                 2. 或点击弹窗外部遮罩层
                 3. 或按 ESC 键
-
+                {self._scout_hint()}
                 **然后执行收集：**
-                点击第 {post_index} 个帖子，使用 extract_structured_data 收集：
+                {open_step}，使用 extract_structured_data 收集：
 
                 帖子信息：
                 - title: 标题
@@ -416,17 +925,17 @@ class XiaohongshuCollector:
                   - likes: 点赞
                   - time: 时间
 
-                完成后返回列表页
+                {finish_step}
                 """
 
                 detail_agent = Agent(
                     task=detail_task,
                     llm=self.llm,
-                    browser_context=self.context,
+                    browser_session=context,
                     use_vision=self.use_vision
                 )
 
-                detail_result = await detail_agent.run()
+                detail_result, stop_reason = await self._run_agent("detail", detail_agent, expect_json=False)
 
                 # 提取数据
                 post_data = None
@@ -436,153 +945,560 @@ class XiaohongshuCollector:
                         post_data = extracted
                         break
 
-                if not post_data:
-                    if attempt < retry_count:
-                        print(f"  ⚠️  第 {post_index} 个帖子数据提取失败，重试 {attempt + 1}/{retry_count}...")
-                        await asyncio.sleep(2)
-                        continue
-                    else:
-                        post_data = {"error": "未提取到数据", "attempts": attempt + 1}
+                if post_data:
+                    self.extraction_stats["agent"] += 1
+                    self._record_attempt(None)
 
-                # 保存数据
-                detail_file = f"{batch_dir}/post_{post_index}.json"
-                with open(detail_file, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        "post_index": post_index,
-                        "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "data": post_data,
-                        "attempts": attempt + 1
-                    }, f, ensure_ascii=False, indent=2)
-
-                return post_data
-
-            except Exception as e:
-                if attempt < retry_count:
-                    print(f"  ⚠️  第 {post_index} 个帖子收集出错，重试 {attempt + 1}/{retry_count}: {str(e)}")
-                    await asyncio.sleep(2)
-                else:
-                    print(f"  ❌ 第 {post_index} 个帖子收集失败: {str(e)}")
-                    # 保存错误信息
+                    # 保存数据
                     detail_file = f"{batch_dir}/post_{post_index}.json"
                     with open(detail_file, 'w', encoding='utf-8') as f:
                         json.dump({
                             "post_index": post_index,
+                            "note_id": note_id,
                             "collected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "error": str(e),
-                            "attempts": attempt + 1
+                            "data": post_data,
+                            "attempts": attempt,
+                            "method": "agent"
                         }, f, ensure_ascii=False, indent=2)
-                    return {"error": str(e)}
 
-        return {"error": "未知错误"}
+                    return post_data
+
+                failure = self._classify_failure(
+                    detail_result, timed_out=stop_reason == "deadline", default="parse"
+                )
+                error = "未提取到数据"
+
+            except Exception as e:
+                failure = self._classify_failure(error=e)
+                error = str(e)
+
+            self._record_attempt(failure)
+            delay = self._retry_delay(failure, attempt, retry_count)
+            if delay is None:
+                print(f"  ❌ 第 {post_index} 个帖子收集失败（{failure or '错误'}）: {error}")
+                return self._give_up(post_index, batch_dir, note_id, post_url, failure, error, attempt)
+
+            print(f"  ⚠️  第 {post_index} 个帖子收集失败（{failure or '错误'}）: {error}，{delay:.1f} 秒后重试（第 {attempt} 次）...")
+            await asyncio.sleep(delay)
 
-    async def collect_posts_sequential(self, posts_list: List[Dict], batch_dir: str):
-        """顺序收集帖子详情"""
+    async def _report_progress(self, event: Dict) -> None:
+        """
+        调用进度回调（回调异常不影响收集）
+
+        参数：
+            event (Dict): 进度事件
+        """
+        if self.on_progress is None:
+            return
+
+        try:
+            result = self.on_progress(event)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            print(f"  ⚠️  进度回调出错: {str(e)}")
+
+    async def _report_post_progress(self, post_index: int, total: int, result: Optional[Dict]) -> None:
+        """上报单个帖子的收集结果"""
+        failed = not isinstance(result, dict) or "error" in result
+        await self._report_progress({
+            "stage": "post",
+            "index": post_index,
+            "total": total,
+            "status": "error" if failed else "ok",
+            "title": None if failed else result.get("title"),
+        })
+
+    def _select_posts(self, posts_list: List[Dict]) -> List[int]:
+        """
+        增量收集：挑选需要抓取详情的帖子
+
+        参数：
+            posts_list (List[Dict]): 帖子列表
+
+        返回：
+            List[int]: 需要抓取详情的帖子序号（从 1 开始）
+        """
+        total = min(self.max_posts, len(posts_list))
+        if self.seen_posts is None:
+            return list(range(1, total + 1))
+
+        indices = []
+        self.skipped_posts = []
+        for i in range(1, total + 1):
+            post = posts_list[i - 1]
+            previous = self.seen_posts.get(post)
+            if previous is None or self.seen_posts.should_collect(post):
+                indices.append(i)
+            else:
+                self.skipped_posts.append({
+                    "post_index": i,
+                    "note_id": post.get("note_id"),
+                    "batch_dir": previous["batch_dir"],
+                    "previous_index": previous["post_index"],
+                })
+
+        if self.skipped_posts:
+            print(f"♻️  增量收集: {len(self.skipped_posts)} 个帖子已收集过且无明显变化，跳过详情\n")
+        return indices
+
+    @staticmethod
+    def read_manifest(batch_dir: str) -> Dict:
+        """
+        读取批次清单，并按目录中实际存在的文件校正
+        ====================================
+
+        清单在对应文件写入之后才更新，进程崩溃时可能落后一步；
+        旧版本生成的批次没有清单。两种情况都以目录中的文件为准：
+        - scout_report.json 能正常解析：Scout 阶段已完成
+        - posts_list.json 能正常解析且帖子列表非空：列表阶段已完成
+        （文件缺失、被截断或列表为空时该阶段视为未完成，续跑时重新执行）
+        - post_N.json：有数据且没有错误为 ok，否则为 error
+
+        参数：
+            batch_dir (str): 批次目录
+
+        返回：
+            Dict: 批次清单（phases 为各阶段完成时间，posts 为 序号 → ok / error）
+        """
+        manifest_file = os.path.join(batch_dir, MANIFEST_FILE)
+        manifest: Dict = {}
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+        phases = manifest.setdefault("phases", {})
+        for phase, filename in (("scout", "scout_report.json"), ("list", "posts_list.json")):
+            path = os.path.join(batch_dir, filename)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            valid = isinstance(data, dict)
+            if valid and phase == "list":
+                # 列表提取失败或超出预算时会留下空列表，不能当作已完成
+                valid = isinstance(data.get("posts"), list) and bool(data["posts"])
+            if not valid:
+                phases.pop(phase, None)
+            elif not phases.get(phase):
+                phases[phase] = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M:%S")
+
+        posts = manifest.setdefault("posts", {})
+        for name in os.listdir(batch_dir):
+            match = POST_FILE_PATTERN.fullmatch(name)
+            if not match:
+                continue
+            try:
+                with open(os.path.join(batch_dir, name), 'r', encoding='utf-8') as f:
+                    detail = json.load(f)
+            except (OSError, ValueError):
+                posts[match.group(1)] = "error"
+                continue
+            data = detail.get("data")
+            failed = "error" in detail or not isinstance(data, dict) or "error" in data
+            posts[match.group(1)] = "error" if failed else "ok"
+
+        return manifest
+
+    def _start_manifest(self, resume: bool) -> None:
+        """
+        创建（或断点续跑时读取）当前批次的清单
+
+        参数：
+            resume (bool): 是否断点续跑
+        """
+        if resume:
+            self.manifest = self.read_manifest(self.batch_dir)
+            # 旧版本批次没有清单，补上本次续跑的设置
+            self.manifest.setdefault("url", self.xiaohongshu_url)
+            self.manifest.setdefault("max_posts", self.max_posts)
+            self.manifest["runs"] = self.manifest.get("runs", 1) + 1
+            self.manifest["completed"] = False
+        else:
+            self.manifest = {
+                "url": self.xiaohongshu_url,
+                "max_posts": self.max_posts,
+                "mode": "concurrent" if self.concurrent else "sequential",
+                "use_vision": self.use_vision,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "runs": 1,
+                "completed": False,
+                "phases": {},
+                "posts": {},
+            }
+        self._save_manifest()
+
+    @staticmethod
+    def _write_json_atomic(path: str, data: Dict) -> None:
+        """写入 JSON 文件（先写临时文件再替换，崩溃时不会留下半个文件）"""
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def _save_manifest(self) -> None:
+        """写入批次清单"""
+        self.manifest["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._write_json_atomic(f"{self.batch_dir}/{MANIFEST_FILE}", self.manifest)
+
+    def _checkpoint_phase(self, phase: str) -> None:
+        """记录阶段完成（scout / list / detail）"""
+        self.manifest["phases"][phase] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._save_manifest()
+
+    def _checkpoint_post(self, post_index: int, result: Optional[Dict]) -> None:
+        """记录单个帖子的收集状态"""
+        failed = not isinstance(result, dict) or "error" in result
+        self.manifest["posts"][str(post_index)] = "error" if failed else "ok"
+        self._save_manifest()
+
+    def _mark_seen(self, post: Dict, post_index: int, batch_dir: str, result: Optional[Dict]) -> None:
+        """详情收集成功后写入已收集记录"""
+        if self.seen_posts is None or not isinstance(result, dict) or "error" in result:
+            return
+        self.seen_posts.mark_collected(post, batch_dir, post_index)
+
+    async def collect_posts_sequential(
+        self,
+        posts_list: List[Dict],
+        batch_dir: str,
+        indices: Optional[List[int]] = None
+    ):
+        """
+        顺序收集帖子详情
+
+        参数：
+            posts_list (List[Dict]): 帖子列表
+            batch_dir (str): 数据保存目录
+            indices (Optional[List[int]]): 要收集的帖子序号（默认前 max_posts 个）
+        """
         print(f"📝 步骤2: 顺序收集帖子详情...\n")
 
-        for i in range(1, min(self.max_posts, len(posts_list)) + 1):
+        total = min(self.max_posts, len(posts_list))
+        if indices is None:
+            indices = list(range(1, total + 1))
+
+        for i in indices:
             print(f"  [{i}/{self.max_posts}] 收集第 {i} 个帖子...")
-            await self.collect_single_post(i, batch_dir)
+            # 有链接时直接打开详情页（DOM 快速路径需要 URL）
+            resources_before = self._resource_snapshot(self.context)
+            result = await self.collect_single_post(
+                i,
+                batch_dir,
+                post_url=self.resolve_post_url(posts_list[i - 1]),
+                browser_context=self.context
+            )
+            self._record_page_resources(i, self.context, resources_before)
+            self._mark_seen(posts_list[i - 1], i, batch_dir, result)
+            self._checkpoint_post(i, result)
+            await self._report_post_progress(i, total, result)
             print(f"  ✅ 第 {i} 个帖子收集完成\n")
             await asyncio.sleep(1)
 
-    async def collect_posts_concurrent(self, posts_list: List[Dict], batch_dir: str):
+    @asynccontextmanager
+    async def _worker_browser(self):
+        """
+        为并发 worker 提供独占的浏览器会话
+
+        - 使用浏览器池时：从池中借出，用完归还
+        - 独立脚本模式：新建浏览器，用完关闭
+        - 两种情况下都按 browser_profile 启用资源拦截，结束前关闭
+        """
+        if self.browser_pool is not None:
+            async with self.browser_pool.session() as browser:
+                await self._install_blocker(browser)
+                try:
+                    yield browser
+                finally:
+                    await self._uninstall_blocker(browser)
+        else:
+            browser = self._create_browser()
+            await self._install_blocker(browser)
+            try:
+                yield browser
+            finally:
+                self._blockers.pop(id(browser), None)
+                try:
+                    await browser.kill()
+                except Exception:
+                    pass
+
+    @asynccontextmanager
+    async def _detail_slot(self):
+        """占用一个详情收集名额（没有并发控制器时不限制，worker 数即并发数）"""
+        if self.concurrency is None:
+            yield
+        else:
+            async with self.concurrency.slot():
+                yield
+
+    async def collect_posts_concurrent(
+        self,
+        posts_list: List[Dict],
+        batch_dir: str,
+        indices: Optional[List[int]] = None
+    ):
         """
         并发收集帖子详情
         ====================================
 
         并发原理：
-        使用 asyncio.Semaphore 控制并发数量：
-        1. 同时运行多个收集任务
-        2. 限制最大并发数（避免浏览器卡顿）
-        3. 使用 asyncio.gather 等待所有任务完成
-
-        优势：
-        - 速度快：3 个帖子并发收集可节省 60% 时间
-        - 可控：通过 max_concurrent 限制并发数
+        启动 N 个 worker（N = max_concurrent），从共享队列中领取帖子：
+        1. 每个 worker 独占一个浏览器会话，互不抢占页面
+        2. 直接打开 posts_list.json 中的帖子 URL，不再"点击第 N 个 → 返回列表页"
+        3. 所有帖子处理完后结束，吞吐量随 max_concurrent 近似线性增长
+
+        会话分配：
+        - worker 1 复用主会话（Scout / 列表阶段使用的浏览器）
+        - 其余 worker 领到第一个帖子时才从浏览器池借出（或新建）独立会话
+        - 使用浏览器池时 worker 数不超过池容量（主会话也占用池中的一个浏览器）
+        - 先拿到浏览器再占用并发名额，等待浏览器的 worker 不占用进程共享的名额
+        - 队列清空后，仍在等待浏览器的 worker 会被取消（避免池耗尽时死锁）
+
+        自适应并发（提供 concurrency 时）：
+        - 启动"控制器上界"个 worker，每个帖子开始前先占用控制器的并发名额
+        - 同时进行的帖子数随 AIMD 上限变化，上限降低时多余的 worker 等待名额
+        - 每个帖子完成后上报耗时和成败，过载信号在 Agent 运行结束时上报
 
         注意事项：
-        - 所有任务共享同一个浏览器 context
-        - 需要 AI 自己管理页面导航（返回列表页）
-        - 并发数过高会导致浏览器卡顿或 AI 混乱
+        - 列表中没有链接的帖子会退化为"打开列表页 → 点击第 N 个"
+        - 并发数受 CPU 和浏览器池容量限制
 
         推荐配置：
-        - 2-3 个并发：平衡速度和稳定性
-        - 4-5 个并发：速度优先（可能不稳定）
+        - 2-4 个并发：普通开发机
+        - 更高并发：CPU 充足且浏览器池容量足够时
         - 1 个并发：等同于顺序模式
 
         参数：
             posts_list (List[Dict]): 帖子列表
             batch_dir (str): 数据保存目录
+            indices (Optional[List[int]]): 要收集的帖子序号（默认前 max_posts 个）
         """
-        print(f"📝 步骤2: 并发收集帖子详情（最大并发数: {self.max_concurrent}）...\n")
-
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-
-        async def collect_with_semaphore(post_index: int):
-            async with semaphore:
-                print(f"  🔄 开始收集第 {post_index} 个帖子...")
-                result = await self.collect_single_post(post_index, batch_dir)
-                print(f"  ✅ 第 {post_index} 个帖子收集完成")
-                return result
+        total = min(self.max_posts, len(posts_list))
+        if indices is None:
+            indices = list(range(1, total + 1))
+        if not indices:
+            return
+
+        max_workers = self.concurrency.max_limit if self.concurrency is not None else self.max_concurrent
+        if self.browser_pool is not None:
+            # 多出来的 worker 只会阻塞在借出浏览器上
+            max_workers = min(max_workers, self.browser_pool.size)
+        workers = max(1, min(max_workers, len(indices)))
+        if self.concurrency is not None:
+            print(f"📝 步骤2: 并发收集帖子详情（worker 数: {workers}，当前并发上限: {self.concurrency.limit}）...\n")
+        else:
+            print(f"📝 步骤2: 并发收集帖子详情（worker 数: {workers}）...\n")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in indices:
+            queue.put_nowait((i, self.resolve_post_url(posts_list[i - 1])))
+
+        async def collect_one(worker_id: int, session, post_index: int, post_url: Optional[str]) -> None:
+            result = None
+            started = time.monotonic()
+            resources_before = self._resource_snapshot(session)
+            try:
+                print(f"  🔄 [worker {worker_id}] 开始收集第 {post_index} 个帖子...")
+                result = await self.collect_single_post(
+                    post_index,
+                    batch_dir,
+                    post_url=post_url,
+                    browser_context=session
+                )
+                print(f"  ✅ [worker {worker_id}] 第 {post_index} 个帖子收集完成")
+            except Exception as e:
+                print(f"  ❌ [worker {worker_id}] 第 {post_index} 个帖子收集异常: {str(e)}")
+            finally:
+                if self.concurrency is not None:
+                    if isinstance(result, dict) and "error" not in result:
+                        self.concurrency.record_success(time.monotonic() - started)
+                    else:
+                        self.concurrency.record_failure()
+                self._record_page_resources(post_index, session, resources_before)
+                self._mark_seen(posts_list[post_index - 1], post_index, batch_dir, result)
+                self._checkpoint_post(post_index, result)
+                await self._report_post_progress(post_index, total, result)
+                queue.task_done()
+
+        async def run_worker(worker_id: int) -> None:
+            session = self.context if worker_id == 1 else None
+            async with AsyncExitStack() as stack:
+                while not queue.empty():
+                    if session is None:
+                        session = await stack.enter_async_context(self._worker_browser())
+                    async with self._detail_slot():
+                        try:
+                            post_index, post_url = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        await collect_one(worker_id, session, post_index, post_url)
 
-        # 并发收集
         tasks = [
-            collect_with_semaphore(i)
-            for i in range(1, min(self.max_posts, len(posts_list)) + 1)
+            asyncio.create_task(run_worker(worker_id))
+            for worker_id in range(1, workers + 1)
         ]
 
+        # 等待所有帖子处理完毕，然后回收仍在等待浏览器的 worker
+        await queue.join()
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
         await asyncio.gather(*tasks, return_exceptions=True)
         print()
 
-    async def collect_posts(self):
-        """主收集流程"""
-        # 创建浏览器上下文（始终可见）
+    async def _requeue_dead_letters(self, posts_list: List[Dict], batch_dir: str) -> None:
+        """
+        死信重新排队：本批次因过载放弃的帖子，等熔断器冷却后再收集一次
+
+        仍然失败的帖子重新进入死信列表，不再在本次收集中重试。
+
+        参数：
+            posts_list (List[Dict]): 帖子列表
+            batch_dir (str): 数据保存目录
+        """
+        if self.retry_policy is None:
+            return
+        entries = self.retry_policy.requeue(batch_dir)
+        if not entries:
+            return
+
+        wait = self.retry_policy.breaker.retry_after()
+        print(f"🔁 {len(entries)} 个帖子因过载未能收集，{wait:.0f} 秒后重新排队...\n")
+        await asyncio.sleep(wait)
+
+        indices = sorted(entry["post_index"] for entry in entries)
+        if self.concurrent:
+            await self.collect_posts_concurrent(posts_list, batch_dir, indices)
+        else:
+            await self.collect_posts_sequential(posts_list, batch_dir, indices)
+
+    async def collect_posts(self, resume_dir: Optional[str] = None):
+        """
+        主收集流程
+
+        每个批次目录中维护 manifest.json，记录各阶段完成时间和每个帖子的收集状态。
+
+        参数：
+            resume_dir (Optional[str]): 断点续跑的批次目录（可选）
+                提供时沿用该目录：已完成的 Scout / 列表阶段直接读取保存的结果，
+                详情阶段只重新收集缺失或失败的帖子
+        """
+        # 从浏览器池借出已预热的浏览器（免去 Chromium 冷启动）
+        if self.browser_pool is not None and self._pooled is None:
+            self._pooled = await self.browser_pool.acquire()
+            self.browser = self._pooled.browser
+            self.context = None
+
+        # 创建浏览器上下文
         # 注意：browser-use 最新版本的 Browser 本身就是上下文
         if self.context is None:
             self.context = self.browser
 
-        # 创建批次目录
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        batch_dir = f"{self.output_dir}/batch_{timestamp}"
+        # 生产配置：拦截媒体资源和统计请求
+        self.resource_stats = []
+        self.phase_stats = {}
+        await self._install_blocker(self.browser)
+
+        # 创建批次目录（断点续跑时沿用原目录）
+        if resume_dir is not None:
+            batch_dir = resume_dir.rstrip("/")
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            batch_dir = f"{self.output_dir}/batch_{timestamp}"
         os.makedirs(batch_dir, exist_ok=True)
+        self.batch_dir = batch_dir
+        self._start_manifest(resume=resume_dir is not None)
+        phases = self.manifest["phases"]
 
         print(f"\n{'='*60}")
         print(f"小红书帖子收集器")
         print(f"{'='*60}")
         print(f"目标页面: {self.xiaohongshu_url}")
         print(f"收集数量: {self.max_posts} 个帖子")
-        print(f"保存目录: {batch_dir}")
+        print(f"保存目录: {batch_dir}{'（断点续跑）' if resume_dir is not None else ''}")
         print(f"模式: {'并发' if self.concurrent else '顺序'}")
         print(f"视觉模式: {'开启' if self.use_vision else '关闭'}")
-        print(f"浏览器: 可见窗口")
+        print(f"浏览器: {'无头' if self.headless else '可见窗口'}{'（浏览器池）' if self._pooled else ''}"
+              f"{'，拦截媒体资源' if self._blockers else ''}")
         print(f"{'='*60}\n")
 
         try:
-            # Scout 探测
-            scout_data = await self.scout_posts()
-
-            # 保存 Scout 报告
             scout_file = f"{batch_dir}/scout_report.json"
-            with open(scout_file, 'w', encoding='utf-8') as f:
-                json.dump(scout_data, f, ensure_ascii=False, indent=2)
+            if phases.get("scout"):
+                # 断点续跑：沿用批次中保存的 Scout 报告
+                with open(scout_file, 'r', encoding='utf-8') as f:
+                    scout_data = json.load(f)
+                print("🔍 步骤0: Scout - 断点续跑，沿用批次中的页面结构报告\n")
+            else:
+                # Scout 探测（同类页面优先复用缓存的报告）
+                scout_data = self.scout_cache.get(self.xiaohongshu_url) if self.scout_cache else None
+                if scout_data is not None:
+                    scout_data["cached"] = True
+                    print("🔍 步骤0: Scout - 复用缓存的页面结构报告，跳过探测\n")
+                else:
+                    scout_data = await self.scout_posts()
+                    if self.scout_cache:
+                        self.scout_cache.set(self.xiaohongshu_url, scout_data)
 
-            # 收集帖子列表
-            posts_list = await self.collect_post_list()
+                # 保存 Scout 报告
+                self._write_json_atomic(scout_file, scout_data)
+                self._checkpoint_phase("scout")
+            self.scout_report = scout_data.get("report")
 
-            # 保存帖子列表
             list_file = f"{batch_dir}/posts_list.json"
-            with open(list_file, 'w', encoding='utf-8') as f:
-                json.dump({
+            if phases.get("list"):
+                # 断点续跑：沿用已收集的帖子列表
+                with open(list_file, 'r', encoding='utf-8') as f:
+                    posts_list = json.load(f).get("posts", [])
+                print(f"📋 步骤1: 断点续跑，沿用已收集的帖子列表（{len(posts_list)} 个帖子）\n")
+            else:
+                # 收集帖子列表
+                posts_list = await self.collect_post_list()
+
+                # 记录笔记 ID（帖子的稳定标识）
+                for post in posts_list:
+                    if isinstance(post, dict) and not post.get("note_id"):
+                        post["note_id"] = self.parse_note_id(self.resolve_post_url(post))
+
+                # 复用的报告可能已过时（页面改版），列表为空时让缓存失效
+                if not posts_list and scout_data.get("cached"):
+                    self.scout_cache.invalidate(self.xiaohongshu_url)
+
+                # 保存帖子列表（列表为空时不记为完成，续跑时重新提取）
+                self._write_json_atomic(list_file, {
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "total": len(posts_list),
                     "posts": posts_list
-                }, f, ensure_ascii=False, indent=2)
+                })
+                if posts_list:
+                    self._checkpoint_phase("list")
+
+            await self._report_progress({
+                "stage": "list",
+                "total": min(self.max_posts, len(posts_list)),
+            })
+
+            # 增量收集：只抓取新帖子和有明显变化的帖子
+            indices = self._select_posts(posts_list)
+
+            # 断点续跑：跳过本批次中已成功的帖子
+            if resume_dir is not None:
+                done = {int(i) for i, status in self.manifest["posts"].items() if status == "ok"}
+                self.skipped_posts = [p for p in self.skipped_posts if p["batch_dir"] != batch_dir]
+                indices = [i for i in indices if i not in done]
+                print(f"♻️  断点续跑: {len(done)} 个帖子已完成，重新收集 {len(indices)} 个缺失或失败的帖子\n")
 
             # 收集详情（顺序或并发）
             if self.concurrent:
-                await self.collect_posts_concurrent(posts_list, batch_dir)
+                await self.collect_posts_concurrent(posts_list, batch_dir, indices)
             else:
-                await self.collect_posts_sequential(posts_list, batch_dir)
+                await self.collect_posts_sequential(posts_list, batch_dir, indices)
+
+            # 因过载放弃的帖子重新排队一次
+            await self._requeue_dead_letters(posts_list, batch_dir)
+            self._checkpoint_phase("detail")
 
             # 保存汇总信息
             summary_file = f"{batch_dir}/summary.json"
@@ -594,9 +1510,28 @@ class XiaohongshuCollector:
                     "output_dir": batch_dir,
                     "mode": "concurrent" if self.concurrent else "sequential",
                     "use_vision": self.use_vision,
-                    "headless": False
+                    "headless": self.headless,
+                    "extraction": self.extraction_stats,
+                    "collected": len(indices),
+                    "resumed": resume_dir is not None,
+                    "skipped": self.skipped_posts,
+                    "resources": self._resource_summary(),
+                    "agent_budget": {
+                        "budgets": self.phase_budgets,
+                        "phases": self.phase_stats
+                    },
+                    "concurrency": self.concurrency.stats() if self.concurrency is not None else None,
+                    "retry": {
+                        "policy": self.retry_policy.stats(),
+                        "dead_letters": self.retry_policy.dead_letters.entries(batch_dir)
+                    } if self.retry_policy is not None else None
                 }, f, ensure_ascii=False, indent=2)
 
+            self.manifest["completed"] = True
+            self._save_manifest()
+
+            await self._report_progress({"stage": "done", "batch_dir": batch_dir})
+
             print(f"\n{'='*60}")
             print(f"✅ 收集完成！")
             print(f"📁 数据保存在: {batch_dir}")
@@ -607,20 +1542,24 @@ class XiaohongshuCollector:
             raise
 
         finally:
-            # 清理资源（借鉴 vibetest 的严格资源管理）
-            if self.context:
+            # 池化浏览器：归还到池中，保留会话供下次使用
+            await self._uninstall_blocker(self.browser)
+            if self._pooled is not None:
+                pooled, self._pooled = self._pooled, None
+                self.context = None
+                self.browser = None
+                await self.browser_pool.release(pooled)
+
+            else:
+                # 清理资源（借鉴 vibetest 的严格资源管理）
+                # 注意：browser-use 最新版本的 Browser 本身就是上下文，kill() 关闭浏览器进程
                 try:
-                    await self.context.close()
+                    await self.browser.kill()
                 except Exception:
                     pass
 
-            try:
-                await self.browser.close()
-            except Exception:
-                pass
-
-            # 等待资源完全释放
-            await asyncio.sleep(1)
+                # 等待资源完全释放
+                await asyncio.sleep(1)
 
 
 async def main():
@@ -653,6 +1592,10 @@ async def main():
        建议：2-3
        说明：只在 concurrent=True 时有效
 
+    6. resume_dir - 断点续跑
+       None: 新建批次目录
+       批次目录: 沿用该批次已完成的阶段，只重新收集缺失或失败的帖子
+
     使用场景推荐：
 
     场景 1：开发调试
@@ -683,6 +1626,7 @@ async def main():
     use_vision = False        # 是否启用视觉模式（显示元素标识）
     concurrent = False        # 是否并发收集（True = 更快但占用更多资源）
     max_concurrent = 2        # 最大并发数（仅在 concurrent=True 时有效）
+    resume_dir = None         # 断点续跑：填入中断的批次目录，如 "collected_posts/batch_20250102_120000"
 
     # ============================================================
     # 创建并运行收集器
@@ -696,7 +1640,7 @@ async def main():
         max_concurrent=max_concurrent
     )
 
-    await collector.collect_posts()
+    await collector.collect_posts(resume_dir=resume_dir)
 
 
 if __name__ == "__main__":
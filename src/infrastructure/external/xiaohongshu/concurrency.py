@@ -0,0 +1,198 @@
+"""
+详情收集的自适应并发控制（AIMD）
+================================
+
+固定的 max_concurrent 很难调：太低浪费机器，太高浏览器卡顿、AI 出错，
+还容易触发小红书的访问频率限制和 Gemini 的 429。这里按 AIMD
+（加性增、乘性减）动态调整同时收集的帖子数：
+- 加性增：帖子成功且耗时不超过目标、近期成功率健康时，上限每轮增加约 1
+  （每次成功 +1/上限，上限个帖子成功后 +1）
+- 乘性减：出现超时、访问频繁页面或 LLM 429 时（由 retry_policy 分类），
+  上限乘以 decrease_factor；同一次拥塞会让多个进行中的帖子同时失败，冷却期内只减一次
+
+控制器在进程内共享（见 detail_concurrency），多次收集都从上次收敛的上限开始，
+每台机器最终稳定在自己的最佳吞吐量上。当前上限通过 stats() 暴露为监控指标。
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import time
+
+from ...utils.config import settings
+from ...utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+class AdaptiveConcurrency:
+    """AIMD 并发上限控制器"""
+
+    def __init__(
+        self,
+        initial: Optional[int] = None,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        min_success_rate: float = 0.8,
+        decrease_factor: float = 0.5,
+        cooldown: float = 30.0,
+        window: int = 20
+    ):
+        """
+        初始化控制器
+
+        Args:
+            initial: 初始并发上限（默认使用配置文件）
+            min_limit: 并发上限下界
+            max_limit: 并发上限上界（默认使用配置文件）
+            latency_target: 单个帖子的健康耗时（秒，默认使用配置文件），超过时不再增加
+            min_success_rate: 近期成功率低于该值时不再增加
+            decrease_factor: 过载时上限的缩小比例
+            cooldown: 两次缩小之间的最短间隔（秒）
+            window: 计算近期成功率的样本数
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(
+            self.min_limit,
+            max_limit if max_limit is not None else settings.DETAIL_CONCURRENCY_MAX
+        )
+        initial = initial if initial is not None else settings.DETAIL_CONCURRENCY_INITIAL
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_target = (
+            latency_target if latency_target is not None
+            else settings.DETAIL_LATENCY_TARGET
+        )
+        self.min_success_rate = min_success_rate
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._outcomes: deque = deque(maxlen=window)
+        self._last_decrease = float("-inf")
+
+        # 统计
+        self.successes = 0
+        self.failures = 0
+        self.overloads: Dict[str, int] = {}
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """正在收集的帖子数"""
+        return self._in_flight
+
+    @property
+    def success_rate(self) -> float:
+        """近期成功率（没有样本时为 1）"""
+        if not self._outcomes:
+            return 1.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        占用一个并发名额（正在进行的数量达到上限时等待）
+
+        Example:
+            >>> async with detail_concurrency.slot():
+            ...     await collect_one_post()
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        """
+        记录一个成功收集的帖子
+
+        Args:
+            latency: 收集耗时（秒）
+        """
+        self.successes += 1
+        self._outcomes.append(True)
+        healthy = latency <= self.latency_target and self.success_rate >= self.min_success_rate
+        if healthy and self._limit < self.max_limit:
+            previous = self.limit
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            if self.limit > previous:
+                self.increases += 1
+                logger.info(f"详情并发上限提高到 {self.limit}")
+                self._notify()
+
+    def record_failure(self) -> None:
+        """记录一个收集失败的帖子（非过载原因，只影响成功率）"""
+        self.failures += 1
+        self._outcomes.append(False)
+
+    def record_overload(self, reason: str) -> None:
+        """
+        记录过载信号（超时、访问频繁、LLM 429），乘性缩小上限
+
+        Args:
+            reason: 过载原因（timeout / rate_limit / llm_quota，见 retry_policy）
+        """
+        self.overloads[reason] = self.overloads.get(reason, 0) + 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        if self.limit < previous:
+            self.decreases += 1
+            logger.warning(f"检测到过载（{reason}），详情并发上限降低到 {self.limit}")
+
+    def stats(self) -> dict:
+        """返回控制器状态（用于监控）"""
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "success_rate": round(self.success_rate, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "overloads": dict(self.overloads),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        """延迟创建条件变量（绑定到首次使用时的事件循环）"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _notify(self) -> None:
+        """上限提高后唤醒等待名额的 worker"""
+        condition = self._condition
+        if condition is None:
+            return
+
+        async def wake() -> None:
+            async with condition:
+                condition.notify_all()
+
+        asyncio.ensure_future(wake())
+
+
+# 全局详情并发控制器（进程内所有收集共享）
+detail_concurrency = AdaptiveConcurrency()
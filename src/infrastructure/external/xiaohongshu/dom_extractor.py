@@ -0,0 +1,219 @@
+"""
+DOM 直接提取（快速路径）
+========================
+
+小红书的列表卡片和笔记详情页字段位置稳定，用 CSS 选择器即可直接读取，
+无需让 AI Agent 多轮操作页面。提取结果通过校验后直接使用；校验失败
+（页面改版、未登录墙、加载超时等）时返回 None，由调用方回退到 AI Agent。
+
+实现说明：
+browser-use 0.7 的 Page 是基于 CDP 的类 Playwright 接口，
+这里通过 page.evaluate() 在页面中执行选择器脚本，一次往返拿到全部字段。
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+
+from ...utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+# 列表页卡片（探索页 / 搜索结果页）
+LIST_CARD_SELECTOR = "section.note-item"
+
+# 详情页容器
+DETAIL_SELECTOR = "#noteContainer, .note-container, #detail-title"
+
+LIST_SCRIPT = """(limit) => {
+    const text = (root, sels) => {
+        for (const sel of sels) {
+            const el = root.querySelector(sel);
+            if (el && el.textContent.trim()) return el.textContent.trim();
+        }
+        return '';
+    };
+    const cards = Array.from(document.querySelectorAll('section.note-item'))
+        .filter(card => !card.querySelector('.query-note-wrapper'));
+    return JSON.stringify(cards.slice(0, Number(limit)).map((card, i) => {
+        const link = card.querySelector('a.cover[href], a[href*="/explore/"], a[href*="/search_result/"]');
+        return {
+            position: i + 1,
+            title: text(card, ['.footer .title span', '.footer .title', 'a.title span', '.title']),
+            author: text(card, ['.author-wrapper .name', '.card-bottom-wrapper .name', '.author .name', '.name']),
+            likes: text(card, ['.like-wrapper .count', '.count']),
+            url: link ? link.getAttribute('href') : ''
+        };
+    }));
+}"""
+
+DETAIL_SCRIPT = """() => {
+    const text = (root, sels) => {
+        for (const sel of sels) {
+            const el = root.querySelector(sel);
+            if (el && el.textContent.trim()) return el.textContent.trim();
+        }
+        return '';
+    };
+    const root = document.querySelector('#noteContainer') || document;
+    const bar = root.querySelector('.engage-bar-style, .interactions, .buttons') || root;
+    const tags = Array.from(root.querySelectorAll('#detail-desc a.tag, #hash-tag, a.tag'))
+        .map(el => el.textContent.trim())
+        .filter(Boolean);
+    const comments = Array.from(root.querySelectorAll('.parent-comment .comment-item, .comment-item'))
+        .slice(0, 10)
+        .map(item => ({
+            nickname: text(item, ['.author .name', '.name']),
+            content: text(item, ['.content .note-text', '.content']),
+            likes: text(item, ['.like .count', '.like-wrapper .count']),
+            time: text(item, ['.info .date span', '.date'])
+        }));
+    return JSON.stringify({
+        title: text(root, ['#detail-title', '.note-content .title', '.title']),
+        author: text(root, ['.author-wrapper .username', '.author .username', '.author-wrapper .name']),
+        publish_time: text(root, ['.bottom-container .date', '.note-content .date', '.date']),
+        likes: text(bar, ['.like-wrapper .count', '.like-lottie + .count']),
+        collections: text(bar, ['.collect-wrapper .count', '#note-page-collect-board-guide .count']),
+        comments_count: text(bar, ['.chat-wrapper .count']),
+        content: text(root, ['#detail-desc .note-text', '#detail-desc', '.desc']),
+        tags: Array.from(new Set(tags)),
+        top_comments: comments
+    });
+}"""
+
+
+class DomExtractor:
+    """基于 CSS 选择器的确定性提取器"""
+
+    def __init__(self, timeout: float = 10.0, poll_interval: float = 0.5):
+        """
+        初始化提取器
+
+        Args:
+            timeout: 等待目标元素出现的超时时间（秒）
+            poll_interval: 轮询间隔（秒）
+        """
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    async def extract_post_list(
+        self,
+        browser: Any,
+        url: str,
+        limit: int
+    ) -> Optional[List[Dict]]:
+        """
+        直接从列表页读取帖子卡片
+
+        Args:
+            browser: browser-use 浏览器会话
+            url: 列表页 URL
+            limit: 读取的帖子数量
+
+        Returns:
+            帖子列表（字段与 AI 提取一致），校验失败返回 None
+        """
+        try:
+            page = await self._open(browser, url)
+            if not await self._wait_for(page, LIST_CARD_SELECTOR):
+                return None
+
+            posts = json.loads(await page.evaluate(LIST_SCRIPT, limit))
+        except Exception as e:
+            logger.warning(f"列表 DOM 提取失败，回退到 AI: {e}")
+            return None
+
+        if not self.validate_post_list(posts, limit):
+            logger.info(f"列表 DOM 提取未通过校验（{len(posts)}/{limit}），回退到 AI")
+            return None
+        return posts
+
+    async def extract_post_detail(
+        self,
+        browser: Any,
+        url: str
+    ) -> Optional[Dict]:
+        """
+        直接从详情页读取帖子信息和评论
+
+        Args:
+            browser: browser-use 浏览器会话
+            url: 帖子详情页 URL
+
+        Returns:
+            帖子数据（字段与 AI 提取一致），校验失败返回 None
+        """
+        try:
+            page = await self._open(browser, url)
+            if not await self._wait_for(page, DETAIL_SELECTOR):
+                return None
+
+            post = json.loads(await page.evaluate(DETAIL_SCRIPT))
+        except Exception as e:
+            logger.warning(f"详情 DOM 提取失败，回退到 AI: {e}")
+            return None
+
+        if not self.validate_post_detail(post):
+            logger.info(f"详情 DOM 提取未通过校验，回退到 AI: {url}")
+            return None
+        return post
+
+    @staticmethod
+    def validate_post_list(posts: Any, limit: int) -> bool:
+        """
+        校验列表提取结果：数量足够，且每条都有标题和链接
+
+        Args:
+            posts: 提取结果
+            limit: 期望数量
+
+        Returns:
+            是否有效
+        """
+        if not isinstance(posts, list) or len(posts) < limit:
+            return False
+        return all(p.get("title") and p.get("url") for p in posts)
+
+    @staticmethod
+    def validate_post_detail(post: Any) -> bool:
+        """
+        校验详情提取结果：必须有标题或正文，且有作者和点赞数
+
+        Args:
+            post: 提取结果
+
+        Returns:
+            是否有效
+        """
+        if not isinstance(post, dict):
+            return False
+        has_body = bool(post.get("title") or post.get("content"))
+        return has_body and bool(post.get("author")) and bool(post.get("likes"))
+
+    async def _open(self, browser: Any, url: str) -> Any:
+        """在会话的当前标签页打开 URL（没有标签页时新建）"""
+        page = await browser.get_current_page()
+        if page is None:
+            return await browser.new_page(url)
+
+        await page.goto(url)
+        return page
+
+    async def _wait_for(self, page: Any, selector: str) -> bool:
+        """轮询等待选择器匹配到元素"""
+        script = "(sel) => String(document.querySelectorAll(sel).length)"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        while loop.time() < deadline:
+            try:
+                if int(await page.evaluate(script, selector)) > 0:
+                    return True
+            except Exception:
+                # 导航过程中执行上下文可能被销毁，稍后重试
+                pass
+            await asyncio.sleep(self.poll_interval)
+
+        return False
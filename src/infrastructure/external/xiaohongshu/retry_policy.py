@@ -0,0 +1,447 @@
+"""
+详情收集的重试策略
+==================
+
+collect_single_post 原先对任何失败都固定等待 2 秒后重试：Gemini 配额耗尽、
+页面超时、登录墙、JSON 解析失败一视同仁，多个 worker 同时失败时还会在同一时刻
+一起重试，把瞬时的限流放大成针对小红书和 Gemini 的重试风暴。这里提供：
+- 失败分类（classify）：llm_quota / rate_limit / timeout / login_wall / parse / unknown
+- 按类别的指数退避 + 全抖动（delay = uniform(0, min(上限, 基数 × 2^重试次数))），
+  错开各 worker 的重试时刻
+- 熔断器（CircuitBreaker）：所有 worker 共享，连续出现过载类失败后打开，
+  打开期间不再发起新的尝试，冷却后放行一次试探（半开），成功即关闭；
+  其余 worker 等待试探结果，不消耗重试次数
+- 死信列表（DeadLetterQueue）：重试耗尽的帖子记录下来，稍后重新排队
+
+策略在进程内共享（见 retry_policy），多次收集共用同一个熔断器。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import random
+import re
+import threading
+import time
+
+from ...utils.config import settings
+from ...utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+# 失败类别
+LLM_QUOTA = "llm_quota"
+RATE_LIMIT = "rate_limit"
+TIMEOUT = "timeout"
+LOGIN_WALL = "login_wall"
+PARSE = "parse"
+UNKNOWN = "unknown"
+
+# 过载类失败：计入熔断器，并通知并发控制器降低并发；进入死信后值得稍后重新排队
+OVERLOAD_FAILURES = (LLM_QUOTA, RATE_LIMIT, TIMEOUT)
+
+# 分类依据（小写比较）
+LLM_QUOTA_MARKERS = ("resource_exhausted", "resource exhausted", "rate limit", "quota", "too many requests")
+RATE_LIMIT_MARKERS = ("访问频繁", "操作频繁", "请求太频繁", "安全限制", "安全验证", "website-login/captcha")
+LOGIN_WALL_MARKERS = ("登录后查看", "扫码登录", "手机号登录", "登录查看更多", "/website-login")
+TIMEOUT_MARKERS = ("timeout", "timed out", "超时")
+# 429 只在作为状态码/错误码出现时计入（status 429、HTTP/1.1 429、status_code=429、
+# Error code: 429），裸 "429" 会误命中笔记 ID 和 URL 中的十六进制串
+LLM_QUOTA_STATUS = re.compile(r"\b(?:status|http|error|code)(?:[_\s]*code)?(?:/[\d.]+)?[\s:='\"]*429\b")
+
+
+@dataclass(frozen=True)
+class BackoffRule:
+    """单个失败类别的重试规则"""
+
+    retries: int  # 最大重试次数
+    base_delay: float  # 首次重试的退避上限（秒）
+    max_delay: float  # 退避上限（秒）
+
+
+# 各失败类别的默认重试规则
+DEFAULT_BACKOFF_RULES: Dict[str, BackoffRule] = {
+    LLM_QUOTA: BackoffRule(retries=3, base_delay=10.0, max_delay=120.0),
+    RATE_LIMIT: BackoffRule(retries=2, base_delay=30.0, max_delay=300.0),
+    TIMEOUT: BackoffRule(retries=2, base_delay=5.0, max_delay=60.0),
+    LOGIN_WALL: BackoffRule(retries=1, base_delay=5.0, max_delay=30.0),
+    PARSE: BackoffRule(retries=2, base_delay=2.0, max_delay=10.0),
+    UNKNOWN: BackoffRule(retries=2, base_delay=2.0, max_delay=30.0),
+}
+
+
+def classify_failure(
+    error: Optional[BaseException] = None,
+    errors: Iterable[str] = (),
+    pages: Iterable[str] = (),
+    timed_out: bool = False
+) -> Optional[str]:
+    """
+    失败分类
+
+    Args:
+        error: 收集时抛出的异常
+        errors: Agent 步骤中的错误信息
+        pages: Agent 提取的内容和访问过的 URL
+        timed_out: Agent 是否超出截止时间
+
+    Returns:
+        失败类别；没有任何失败信号时返回 None（由调用方决定是否按 parse 处理）
+    """
+    error_texts = [str(error)] if error is not None else []
+    error_texts.extend(str(e) for e in errors if e)
+    errors_text = " ".join(error_texts).lower()
+    pages_text = " ".join(str(p) for p in pages if p).lower()
+
+    if any(marker in errors_text for marker in LLM_QUOTA_MARKERS) or LLM_QUOTA_STATUS.search(errors_text):
+        return LLM_QUOTA
+    if any(marker in pages_text or marker in errors_text for marker in RATE_LIMIT_MARKERS):
+        return RATE_LIMIT
+    if timed_out or isinstance(error, TimeoutError) or any(m in errors_text for m in TIMEOUT_MARKERS):
+        return TIMEOUT
+    if any(marker in pages_text or marker in errors_text for marker in LOGIN_WALL_MARKERS):
+        return LOGIN_WALL
+    if isinstance(error, ValueError):  # json.JSONDecodeError 是 ValueError 的子类
+        return PARSE
+    if error is not None:
+        return UNKNOWN
+    return None
+
+
+class CircuitBreaker:
+    """熔断器（关闭 → 连续过载后打开 → 冷却后半开试探 → 成功关闭 / 失败重新打开）"""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 连续过载失败多少次后打开（默认使用配置文件）
+            reset_timeout: 打开后多久进入半开状态（秒，默认使用配置文件）
+        """
+        self.failure_threshold = failure_threshold or settings.RETRY_BREAKER_THRESHOLD
+        self.reset_timeout = (
+            reset_timeout if reset_timeout is not None
+            else settings.RETRY_BREAKER_RESET_TIMEOUT
+        )
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+        # 统计
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """当前状态：closed / open / half_open"""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """距离进入半开状态还需等待的秒数（关闭时为 0）"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        是否允许发起一次尝试
+
+        Returns:
+            关闭时总是允许；半开时只放行一个试探请求；打开时拒绝
+        """
+        if self._acquire():
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    async def wait(self, poll_interval: float = 1.0) -> float:
+        """
+        等待熔断器放行一次尝试
+
+        打开时等到进入半开状态；半开且已有试探进行中时轮询，直到试探结束
+        （成功则关闭、放行所有等待的 worker，失败则重新打开继续等待）。
+
+        Args:
+            poll_interval: 试探进行中时的轮询间隔（秒）
+
+        Returns:
+            等待的秒数（未被拦下时为 0）
+        """
+        if self.allow():
+            return 0.0
+        started = time.monotonic()
+        while True:
+            await asyncio.sleep(self.retry_after() or poll_interval)
+            if self._acquire():
+                return time.monotonic() - started
+
+    def _acquire(self) -> bool:
+        """尝试通过熔断器（半开时占用试探名额）"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            # 试探请求超过冷却时间仍未结束（如被取消）时，放行新的试探
+            probe_expired = time.monotonic() - self._probe_started >= self.reset_timeout
+            if state == "half_open" and (not self._probing or probe_expired):
+                self._probing = True
+                self._probe_started = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """记录成功（关闭熔断器）"""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("熔断器关闭，恢复收集")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """记录过载类失败（达到阈值或半开试探失败时打开）"""
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self.trips += 1
+                logger.warning(
+                    f"连续 {self._failures} 次过载失败，熔断器打开 {self.reset_timeout:.0f} 秒"
+                )
+
+    def release_probe(self) -> None:
+        """试探请求以非过载原因结束（如解析失败）时归还试探名额"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        """返回熔断器状态（用于监控）"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after": round(self.retry_after(), 1),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class DeadLetterQueue:
+    """死信列表：重试耗尽仍未能收集的帖子"""
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        初始化列表
+
+        Args:
+            max_entries: 最多保留的条目数（超出时丢弃最早的）
+        """
+        self.max_entries = max_entries
+        self._entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        batch_dir: str,
+        post_index: int,
+        post_url: Optional[str],
+        failure: str,
+        error: str,
+        attempts: int
+    ) -> Dict:
+        """
+        记录一个未能收集的帖子（同一批次的同一帖子只保留最新一条）
+
+        Args:
+            batch_dir: 批次目录
+            post_index: 帖子序号
+            post_url: 详情页 URL
+            failure: 失败类别
+            error: 错误信息
+            attempts: 已尝试次数
+
+        Returns:
+            死信条目
+        """
+        entry = {
+            "batch_dir": batch_dir,
+            "post_index": post_index,
+            "post_url": post_url,
+            "failure": failure,
+            "error": error,
+            "attempts": attempts,
+            "dead_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            self._entries = [
+                e for e in self._entries
+                if (e["batch_dir"], e["post_index"]) != (batch_dir, post_index)
+            ]
+            self._entries.append(entry)
+            del self._entries[:-self.max_entries]
+        return entry
+
+    def entries(self, batch_dir: Optional[str] = None) -> List[Dict]:
+        """
+        查看死信（不移除）
+
+        Args:
+            batch_dir: 只看该批次（可选）
+
+        Returns:
+            死信条目列表
+        """
+        with self._lock:
+            return [
+                dict(e) for e in self._entries
+                if batch_dir is None or e["batch_dir"] == batch_dir
+            ]
+
+    def drain(
+        self,
+        batch_dir: Optional[str] = None,
+        failures: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        取出死信重新排队
+
+        Args:
+            batch_dir: 只取该批次（可选）
+            failures: 只取这些失败类别（可选）
+
+        Returns:
+            取出的死信条目列表
+        """
+        failures = set(failures) if failures is not None else None
+        with self._lock:
+            drained = [
+                e for e in self._entries
+                if (batch_dir is None or e["batch_dir"] == batch_dir)
+                and (failures is None or e["failure"] in failures)
+            ]
+            self._entries = [e for e in self._entries if e not in drained]
+        return drained
+
+
+class RetryPolicy:
+    """详情收集重试策略（分类 + 按类别退避 + 共享熔断器 + 死信列表）"""
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, BackoffRule]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        dead_letters: Optional[DeadLetterQueue] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        初始化策略
+
+        Args:
+            rules: 按失败类别覆盖 DEFAULT_BACKOFF_RULES
+            breaker: 熔断器（默认新建）
+            dead_letters: 死信列表（默认新建）
+            rng: 抖动使用的随机数生成器（默认使用全局随机数）
+        """
+        self.rules = {**DEFAULT_BACKOFF_RULES, **(rules or {})}
+        self.breaker = breaker or CircuitBreaker()
+        self.dead_letters = dead_letters or DeadLetterQueue()
+        self._rng = rng or random.Random()
+
+        # 统计
+        self.failures: Dict[str, int] = {}
+        self.retries = 0
+
+    @staticmethod
+    def classify(
+        error: Optional[BaseException] = None,
+        errors: Iterable[str] = (),
+        pages: Iterable[str] = (),
+        timed_out: bool = False
+    ) -> Optional[str]:
+        """失败分类（见 classify_failure）"""
+        return classify_failure(error, errors, pages, timed_out)
+
+    @staticmethod
+    def is_overload(failure: Optional[str]) -> bool:
+        """是否为过载类失败"""
+        return failure in OVERLOAD_FAILURES
+
+    def requeue(self, batch_dir: Optional[str] = None) -> List[Dict]:
+        """
+        取出值得重新排队的死信（过载类失败）
+
+        解析失败、登录墙等重试也无济于事的死信保留在列表中供排查。
+
+        Args:
+            batch_dir: 只取该批次（可选）
+
+        Returns:
+            取出的死信条目列表
+        """
+        return self.dead_letters.drain(batch_dir, OVERLOAD_FAILURES)
+
+    def record_success(self) -> None:
+        """记录一次成功的尝试"""
+        self.breaker.record_success()
+
+    def record_failure(self, failure: str) -> None:
+        """
+        记录一次失败的尝试
+
+        Args:
+            failure: 失败类别
+        """
+        self.failures[failure] = self.failures.get(failure, 0) + 1
+        if self.is_overload(failure):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+    def next_delay(self, failure: str, attempt: int) -> Optional[float]:
+        """
+        计算下一次重试前的等待时间
+
+        Args:
+            failure: 本次失败的类别
+            attempt: 已完成的尝试次数（从 1 开始）
+
+        Returns:
+            等待秒数（全抖动）；重试次数用尽时返回 None
+        """
+        rule = self.rules.get(failure, self.rules[UNKNOWN])
+        if attempt > rule.retries:
+            return None
+        self.retries += 1
+        ceiling = min(rule.max_delay, rule.base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(0, ceiling)
+
+    def stats(self) -> dict:
+        """返回策略状态（用于监控）"""
+        return {
+            "failures": dict(self.failures),
+            "retries": self.retries,
+            "breaker": self.breaker.stats(),
+            "dead_letters": len(self.dead_letters),
+        }
+
+
+# 全局重试策略（进程内所有收集共享熔断器和死信列表）
+retry_policy = RetryPolicy()
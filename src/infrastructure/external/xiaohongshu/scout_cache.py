@@ -0,0 +1,139 @@
+"""
+Scout 报告缓存
+================
+
+Scout 阶段用一次完整的 AI Agent 运行来描述页面布局，而同一类页面
+（探索页、搜索结果页）的布局几乎不变。这里按 URL 模式缓存 Scout 报告，
+在 TTL 内直接复用，跳过整轮 Scout 及其 token 消耗。
+
+缓存键只取 URL 的路径模式，不包含搜索关键词：
+- https://www.xiaohongshu.com/explore                    → explore
+- https://www.xiaohongshu.com/search_result?keyword=成都 → search_result
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import json
+import threading
+import time
+
+from ...utils.config import settings
+from ...utils.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+class ScoutCache:
+    """按 URL 模式缓存 Scout 报告（内存 + JSON 文件持久化）"""
+
+    def __init__(
+        self,
+        cache_file: str = "./collected_posts/scout_cache.json",
+        ttl: Optional[int] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_file: 持久化文件路径
+            ttl: 过期时间（秒，默认使用配置文件）
+        """
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl if ttl is not None else settings.SCOUT_CACHE_TTL
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def url_pattern(url: str) -> str:
+        """
+        计算 URL 对应的页面模式
+
+        Args:
+            url: 页面 URL
+
+        Returns:
+            页面模式（路径第一段，如 explore、search_result）
+        """
+        path = urlparse(url).path.strip("/")
+        return path.split("/")[0] if path else "home"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        获取未过期的 Scout 报告
+
+        Args:
+            url: 页面 URL
+
+        Returns:
+            Scout 报告（包含 report / timestamp），未命中返回 None
+        """
+        pattern = self.url_pattern(url)
+        with self._lock:
+            entry = self._entries.get(pattern)
+            if entry is None:
+                return None
+
+            if time.time() - entry["cached_at"] > self.ttl:
+                del self._entries[pattern]
+                self._save()
+                return None
+
+            return dict(entry["scout"])
+
+    def set(self, url: str, scout_data: Dict) -> None:
+        """
+        写入 Scout 报告
+
+        Args:
+            url: 页面 URL
+            scout_data: scout_posts() 返回的报告
+        """
+        pattern = self.url_pattern(url)
+        with self._lock:
+            self._entries[pattern] = {
+                "url": url,
+                "cached_at": time.time(),
+                "scout": scout_data,
+            }
+            self._save()
+
+    def invalidate(self, url: str) -> None:
+        """
+        使某个页面模式的缓存失效（例如页面改版导致收集失败时）
+
+        Args:
+            url: 页面 URL
+        """
+        pattern = self.url_pattern(url)
+        with self._lock:
+            if self._entries.pop(pattern, None) is not None:
+                logger.info(f"Scout 缓存已失效: {pattern}")
+                self._save()
+
+    def _load(self) -> None:
+        """从文件加载缓存"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Scout 缓存读取失败，将重新探测: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        """持久化缓存到文件"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Scout 缓存写入失败: {e}")
+
+
+# 全局 Scout 缓存实例
+scout_cache = ScoutCache()
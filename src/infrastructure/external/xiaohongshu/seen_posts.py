@@ -0,0 +1,169 @@
+"""
+已收集帖子记录（增量收集）
+==========================
+
+每次 collect_posts 都会新建批次目录并重新抓取全部详情，而热门目的地的
+搜索结果在两次收集之间大多不变。这里持久化记录已收集过的帖子，
+详情阶段只处理：
+- 从未收集过的帖子
+- 列表页点赞数相对上次收集变化超过阈值的帖子（内容热度明显变化）
+
+其余帖子跳过详情抓取，沿用上次收集的数据（记录中保存了所在批次和序号）。
+
+帖子以小红书笔记 ID 作为键（无法解析时退回到去掉查询参数的详情页路径）。
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlparse
+import json
+import threading
+import time
+
+from ...utils.config import settings
+from ...utils.logger import setup_logger
+from ....shared.utils import parse_count, parse_note_id
+
+
+logger = setup_logger(__name__)
+
+
+class SeenPostsStore:
+    """已收集帖子记录（内存 + JSON 文件持久化）"""
+
+    def __init__(
+        self,
+        store_file: str = "./collected_posts/seen_posts.json",
+        likes_threshold: Optional[float] = None
+    ):
+        """
+        初始化记录
+
+        Args:
+            store_file: 持久化文件路径
+            likes_threshold: 点赞数相对变化超过该比例时重新收集（默认使用配置文件）
+        """
+        self.store_file = Path(store_file)
+        self.likes_threshold = (
+            likes_threshold if likes_threshold is not None
+            else settings.SEEN_POSTS_LIKES_THRESHOLD
+        )
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def post_key(post: Dict) -> Optional[str]:
+        """
+        计算列表项的键（笔记 ID，无法解析时为详情页链接的路径部分）
+
+        Args:
+            post: 列表中的帖子
+
+        Returns:
+            键，没有链接返回 None
+        """
+        url = post.get("url") or post.get("url_link") or post.get("link")
+        note_id = post.get("note_id") or parse_note_id(url)
+        if note_id:
+            return note_id
+        if not url:
+            return None
+
+        path = urlparse(urljoin("https://www.xiaohongshu.com/", str(url))).path
+        return path.rstrip("/") or None
+
+    def should_collect(self, post: Dict) -> bool:
+        """
+        判断列表项是否需要抓取详情
+
+        Args:
+            post: 列表中的帖子
+
+        Returns:
+            新帖子或点赞数变化超过阈值时返回 True
+        """
+        key = self.post_key(post)
+        if key is None:
+            return True
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return True
+
+        previous = entry.get("likes")
+        current = parse_count(post.get("likes"))
+        if previous is None or current is None:
+            return False
+
+        return abs(current - previous) > self.likes_threshold * max(previous, 1)
+
+    def get(self, post: Dict) -> Optional[Dict]:
+        """
+        获取上次收集的记录
+
+        Args:
+            post: 列表中的帖子
+
+        Returns:
+            记录（包含 batch_dir / post_index / likes / collected_at），不存在返回 None
+        """
+        key = self.post_key(post)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+        return dict(entry) if entry else None
+
+    def mark_collected(self, post: Dict, batch_dir: str, post_index: int) -> None:
+        """
+        记录帖子已收集
+
+        Args:
+            post: 列表中的帖子
+            batch_dir: 详情所在批次目录
+            post_index: 详情文件序号（post_{post_index}.json）
+        """
+        key = self.post_key(post)
+        if key is None:
+            return
+
+        with self._lock:
+            self._entries[key] = {
+                "likes": parse_count(post.get("likes")),
+                "batch_dir": batch_dir,
+                "post_index": post_index,
+                "collected_at": time.time(),
+            }
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """从文件加载记录"""
+        if not self.store_file.exists():
+            return
+
+        try:
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"已收集帖子记录读取失败，将全量收集: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        """持久化记录到文件（先写临时文件再替换，避免中断时损坏）"""
+        try:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.store_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            tmp_file.replace(self.store_file)
+        except OSError as e:
+            logger.warning(f"已收集帖子记录写入失败: {e}")
+
+
+# 全局已收集帖子记录实例
+seen_posts = SeenPostsStore()
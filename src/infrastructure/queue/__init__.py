@@ -0,0 +1,7 @@
+"""
+任务队列模块
+"""
+
+from .task_queue import CollectionTaskQueue, task_queue
+
+__all__ = ["CollectionTaskQueue", "task_queue"]
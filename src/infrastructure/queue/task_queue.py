@@ -0,0 +1,277 @@
+"""
+收集任务队列
+
+将耗时的浏览器采集从 HTTP 请求中剥离：提交时写入 collection_tasks 表并立即返回
+task_id，由进程内独立的 worker 池异步执行，状态变化持久化到数据库并推送给订阅者。
+
+状态流转：pending → running → completed / failed
+
+进程重启后，未完成的任务（pending / running）会在 start() 时重新入队。
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import uuid
+
+from sqlalchemy import select, update
+
+from ..database.connection import async_session_maker
+from ..database.models import CollectionTaskModel
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+from ...shared.types import TaskStatus
+
+
+logger = setup_logger(__name__)
+
+
+# 任务处理函数：接收任务参数，返回可 JSON 序列化的结果
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# 终止状态
+FINAL_STATUSES = {
+    TaskStatus.COMPLETED.value,
+    TaskStatus.FAILED.value,
+    TaskStatus.CANCELLED.value,
+}
+
+
+class CollectionTaskQueue:
+    """基于 CollectionTaskModel 的持久化任务队列"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        session_maker=async_session_maker
+    ):
+        """
+        初始化任务队列
+
+        Args:
+            workers: worker 数量（默认使用配置文件）
+            session_maker: 数据库会话工厂
+        """
+        self.workers = workers or settings.TASK_QUEUE_WORKERS
+        self.session_maker = session_maker
+        self._handlers: Dict[str, TaskHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def register(self, task_type: str, handler: TaskHandler) -> None:
+        """
+        注册任务处理函数
+
+        Args:
+            task_type: 任务类型（如 guide）
+            handler: 处理函数
+        """
+        self._handlers[task_type] = handler
+
+    async def start(self) -> None:
+        """恢复未完成任务并启动 worker 池"""
+        if self._worker_tasks:
+            return
+
+        self._queue = asyncio.Queue()
+
+        # 恢复上次进程退出时未完成的任务
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(CollectionTaskModel.task_id)
+                .where(CollectionTaskModel.status.in_([
+                    TaskStatus.PENDING.value,
+                    TaskStatus.RUNNING.value,
+                ]))
+                .order_by(CollectionTaskModel.created_at)
+            )
+            pending_ids = list(result.scalars())
+
+        for task_id in pending_ids:
+            self._queue.put_nowait(task_id)
+
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(i))
+            for i in range(self.workers)
+        ]
+        logger.info(
+            f"任务队列已启动: {self.workers} 个 worker，恢复 {len(pending_ids)} 个未完成任务"
+        )
+
+    async def stop(self) -> None:
+        """停止 worker 池（执行中的任务保持 running，下次启动时恢复）"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        logger.info("任务队列已停止")
+
+    async def submit(self, task_type: str, parameters: Dict[str, Any]) -> str:
+        """
+        提交任务
+
+        Args:
+            task_type: 任务类型
+            parameters: 任务参数
+
+        Returns:
+            任务 ID
+        """
+        if task_type not in self._handlers:
+            raise ValueError(f"未注册的任务类型: {task_type}")
+        if self._queue is None:
+            raise RuntimeError("任务队列未启动")
+
+        task_id = uuid.uuid4().hex
+        async with self.session_maker() as session:
+            session.add(CollectionTaskModel(
+                task_id=task_id,
+                task_type=task_type,
+                parameters=parameters,
+                status=TaskStatus.PENDING.value,
+                created_at=datetime.utcnow(),
+            ))
+            await session.commit()
+
+        self._queue.put_nowait(task_id)
+
+        logger.info(f"任务已提交: {task_id} ({task_type})")
+        return task_id
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务状态
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            任务快照，不存在返回 None
+        """
+        async with self.session_maker() as session:
+            task = await session.get(CollectionTaskModel, task_id)
+            return self._to_dict(task) if task else None
+
+    async def subscribe(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        订阅任务状态变化
+
+        先推送当前快照，之后每次状态变化推送一次，到达终止状态后结束。
+
+        Args:
+            task_id: 任务 ID
+
+        Yields:
+            任务快照
+        """
+        # 先注册订阅再读快照，避免两者之间的状态变化丢失
+        events: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(task_id, []).append(events)
+        try:
+            snapshot = await self.get(task_id)
+            if snapshot is None:
+                return
+
+            yield snapshot
+            while snapshot["status"] not in FINAL_STATUSES:
+                snapshot = await events.get()
+                yield snapshot
+        finally:
+            subscribers = self._subscribers.get(task_id, [])
+            if events in subscribers:
+                subscribers.remove(events)
+            if not subscribers:
+                self._subscribers.pop(task_id, None)
+
+    async def _worker(self, worker_id: int) -> None:
+        """worker 主循环"""
+        while True:
+            task_id = await self._queue.get()
+            try:
+                await self._run(task_id)
+            except Exception as e:
+                logger.error(f"[worker {worker_id}] 任务 {task_id} 执行异常: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, task_id: str) -> None:
+        """执行单个任务"""
+        async with self.session_maker() as session:
+            task = await session.get(CollectionTaskModel, task_id)
+            if task is None or task.status in FINAL_STATUSES:
+                return
+            task_type, parameters = task.task_type, task.parameters or {}
+
+        handler = self._handlers.get(task_type)
+        if handler is None:
+            await self._update(
+                task_id,
+                status=TaskStatus.FAILED.value,
+                error=f"未注册的任务类型: {task_type}",
+                completed_at=datetime.utcnow(),
+            )
+            return
+
+        await self._update(
+            task_id,
+            status=TaskStatus.RUNNING.value,
+            started_at=datetime.utcnow(),
+        )
+
+        try:
+            result = await handler(parameters)
+        except Exception as e:
+            logger.error(f"任务 {task_id} 失败: {e}")
+            await self._update(
+                task_id,
+                status=TaskStatus.FAILED.value,
+                error=str(e),
+                completed_at=datetime.utcnow(),
+            )
+            return
+
+        await self._update(
+            task_id,
+            status=TaskStatus.COMPLETED.value,
+            result=result,
+            completed_at=datetime.utcnow(),
+        )
+        logger.info(f"任务完成: {task_id}")
+
+    async def _update(self, task_id: str, **values: Any) -> None:
+        """更新任务字段并通知订阅者"""
+        async with self.session_maker() as session:
+            await session.execute(
+                update(CollectionTaskModel)
+                .where(CollectionTaskModel.task_id == task_id)
+                .values(**values)
+            )
+            await session.commit()
+
+        if self._subscribers.get(task_id):
+            snapshot = await self.get(task_id)
+            for events in self._subscribers.get(task_id, []):
+                events.put_nowait(snapshot)
+
+    @staticmethod
+    def _to_dict(task: CollectionTaskModel) -> Dict[str, Any]:
+        """数据库模型转换为快照字典"""
+        def iso(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        return {
+            "task_id": task.task_id,
+            "task_type": task.task_type,
+            "status": task.status,
+            "parameters": task.parameters,
+            "result": task.result,
+            "error": task.error,
+            "created_at": iso(task.created_at),
+            "started_at": iso(task.started_at),
+            "completed_at": iso(task.completed_at),
+        }
+
+
+# 全局任务队列实例
+task_queue = CollectionTaskQueue()
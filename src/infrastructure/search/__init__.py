@@ -0,0 +1,7 @@
+"""
+全文检索模块
+"""
+
+from .guide_search import GuideSearchIndex, expand_synonyms, tokenize
+
+__all__ = ["GuideSearchIndex", "expand_synonyms", "tokenize"]
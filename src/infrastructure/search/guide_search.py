@@ -0,0 +1,294 @@
+"""
+攻略全文检索 - 中文 n-gram 倒排索引 + BM25 排序
+
+子串扫描（destination in title）的问题：
+- 每次查询都是 O(n) 全量扫描
+- 没有相关性：只提到一次「成都」和整篇都在讲成都的攻略地位相同
+- 不认别称：搜「成都」找不到只写了「蓉城」的攻略
+
+本模块的做法：
+- 分词：中文按字 bigram 切分（单字词保留 unigram），英文/数字按单词切分，
+  不依赖中文分词词典；文档额外索引单字，单字查询（如「渝」）也能命中
+- 字段加权：标签、地点 > 标题 > 正文，按加权词频计算 BM25
+- 别称扩展：查询按 DESTINATION_SYNONYMS 扩展，任一别称命中即可，取最高分
+- 排序：BM25 相关性与互动率融合，score = bm25 × (1 + w × log(1 + engagement_rate))
+- 增量更新：add() / remove() 只修改该帖子涉及的倒排项
+- 查询缓存：热门目的地的重复查询直接返回缓存结果；BM25 的 idf 依赖文档总数，
+  因此任何写入都会清空缓存
+"""
+
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import math
+import re
+import threading
+
+from ...core.domain.models.post import PostDetail
+from ...shared.constants import DESTINATION_SYNONYMS
+
+
+# 字段权重
+FIELD_WEIGHTS = {
+    "tags": 3.0,
+    "location": 3.0,
+    "title": 2.0,
+    "content": 1.0,
+}
+
+# 中文字符 / 英文数字单词
+_CJK_RUN = re.compile(r"[一-鿿]+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str, unigrams: bool = False) -> List[str]:
+    """
+    切分文本为检索词
+
+    中文连续片段切为字 bigram（片段只有一个字时保留该字），
+    英文和数字按单词切分并转小写。
+
+    Args:
+        text: 原始文本
+        unigrams: 是否同时输出中文单字（索引文档时开启，查询时只用 bigram）
+
+    Returns:
+        检索词列表（保留重复，用于计算词频）
+    """
+    if not text:
+        return []
+
+    text = text.lower()
+    tokens: List[str] = []
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            if unigrams:
+                tokens.extend(run)
+    tokens.extend(_WORD.findall(text))
+    return tokens
+
+
+def expand_synonyms(query: str) -> List[str]:
+    """
+    按目的地别称扩展查询
+
+    Args:
+        query: 查询词（如「成都」或「蓉城」）
+
+    Returns:
+        查询及其全部别称（原查询在首位）
+    """
+    query = query.strip()
+    variants = [query]
+    for name, aliases in DESTINATION_SYNONYMS.items():
+        group = [name, *aliases]
+        if query in group:
+            variants.extend(v for v in group if v not in variants)
+    return variants
+
+
+class GuideSearchIndex:
+    """攻略倒排索引（线程安全，支持增量更新）"""
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        engagement_weight: float = 1.0,
+        cache_size: int = 256
+    ):
+        """
+        初始化索引
+
+        Args:
+            k1: BM25 词频饱和参数
+            b: BM25 文档长度归一化参数
+            engagement_weight: 互动率在最终得分中的权重（0 表示只看相关性）
+            cache_size: 查询结果缓存容量
+        """
+        self.k1 = k1
+        self.b = b
+        self.engagement_weight = engagement_weight
+        self.cache_size = cache_size
+
+        # term → {post_id: 加权词频}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # post_id → (加权长度, 词集合, 互动率)
+        self._docs: Dict[str, Tuple[float, Set[str], float]] = {}
+        self._total_length = 0.0
+
+        # (query, limit) → 排序结果
+        self._cache: "OrderedDict[Tuple[str, Optional[int]], List[Tuple[str, float]]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._docs
+
+    # ==================== 写入 ====================
+
+    def add(self, post: PostDetail) -> None:
+        """
+        添加或更新帖子（已存在时先移除旧的倒排项）
+
+        Args:
+            post: 帖子
+        """
+        frequencies: Counter = Counter()
+        fields = {
+            "tags": " ".join(post.tags),
+            "location": post.location or "",
+            "title": post.title or "",
+            "content": post.content or "",
+        }
+        for field_name, text in fields.items():
+            weight = FIELD_WEIGHTS[field_name]
+            for token in tokenize(text, unigrams=True):
+                frequencies[token] += weight
+
+        length = sum(frequencies.values())
+
+        with self._lock:
+            self._remove(post.post_id)
+            for term, tf in frequencies.items():
+                self._postings.setdefault(term, {})[post.post_id] = tf
+            self._docs[post.post_id] = (length, set(frequencies), post.engagement_rate)
+            self._total_length += length
+            self._cache.clear()
+
+    def add_many(self, posts: Iterable[PostDetail]) -> None:
+        """批量添加帖子"""
+        for post in posts:
+            self.add(post)
+
+    def remove(self, post_id: str) -> bool:
+        """
+        移除帖子
+
+        Args:
+            post_id: 帖子 ID
+
+        Returns:
+            帖子存在返回 True
+        """
+        with self._lock:
+            removed = self._remove(post_id)
+            if removed:
+                self._cache.clear()
+            return removed
+
+    def clear(self) -> None:
+        """清空索引"""
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._cache.clear()
+            self._total_length = 0.0
+
+    def _remove(self, post_id: str) -> bool:
+        """移除帖子的倒排项（调用方持有锁）"""
+        doc = self._docs.pop(post_id, None)
+        if doc is None:
+            return False
+
+        length, terms, _ = doc
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= length
+        return True
+
+    # ==================== 查询 ====================
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        检索帖子
+
+        查询的每个别称独立打分：帖子必须包含该别称的全部检索词，
+        得分为各检索词 BM25 之和；同一帖子取各别称中的最高分，
+        最后与互动率融合排序。
+
+        Args:
+            query: 查询词（通常是目的地）
+            limit: 最大数量（None 表示全部）
+
+        Returns:
+            [(post_id, score)]，按得分降序
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        variants = [tokenize(v) for v in expand_synonyms(query)]
+
+        with self._lock:
+            cache_key = (query, limit)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return list(cached)
+
+            scores: Dict[str, float] = {}
+            for terms in variants:
+                for post_id, score in self._score_variant(set(terms)).items():
+                    if score > scores.get(post_id, 0.0):
+                        scores[post_id] = score
+
+            results = [
+                (post_id, score * (1 + self.engagement_weight * math.log1p(self._docs[post_id][2])))
+                for post_id, score in scores.items()
+            ]
+            results.sort(key=lambda item: item[1], reverse=True)
+            if limit is not None:
+                results = results[:limit]
+
+            self._cache[cache_key] = results
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+            return list(results)
+
+    def _score_variant(self, terms: Set[str]) -> Dict[str, float]:
+        """计算单个别称的 BM25 得分（调用方持有锁）"""
+        if not terms:
+            return {}
+
+        postings = []
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                return {}
+            postings.append((term, posting))
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=lambda item: len(item[1]))
+        candidates = set(postings[0][1])
+        for _, posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return {}
+
+        total_docs = len(self._docs)
+        avg_length = self._total_length / total_docs if total_docs else 1.0
+        scores: Dict[str, float] = {}
+        for term, posting in postings:
+            df = len(posting)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for post_id in candidates:
+                tf = posting[post_id]
+                norm = self.k1 * (1 - self.b + self.b * self._docs[post_id][0] / avg_length)
+                scores[post_id] = scores.get(post_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
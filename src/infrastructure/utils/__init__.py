@@ -4,6 +4,7 @@
 
 from .config import Settings, settings, get_settings
 from .logger import setup_logger, default_logger
+from .singleflight import SingleFlight
 
 __all__ = [
     "Settings",
@@ -11,4 +12,5 @@ __all__ = [
     "get_settings",
     "setup_logger",
     "default_logger",
+    "SingleFlight",
 ]
@@ -36,12 +36,45 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-2.0-flash-exp"
     GEMINI_TEMPERATURE: float = 0.7
+    GEMINI_EXTRACTION_TEMPERATURE: float = 0.1  # 结构化提取、要点提炼等确定性任务的温度（可缓存）
+    GEMINI_BATCH_MAX_CHARS: int = 12000  # 批量提取时单次请求的攻略总字数上限
+    GEMINI_MAX_CONCURRENCY: int = 3  # 同时进行的 Gemini 请求数
+
+    # LLM 响应缓存配置
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DIR: str = "./data/llm_cache"
+    LLM_CACHE_TTL: int = 604800  # 响应复用时长（秒）
+    LLM_CACHE_MAX_ENTRIES: int = 5000  # 磁盘缓存最大条目数
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3  # 高于此温度的请求不缓存（GEMINI_TEMPERATURE 的创作类请求不缓存，GEMINI_EXTRACTION_TEMPERATURE 的请求缓存）
+    LLM_CACHE_USE_REDIS: bool = False  # 是否同时使用 Redis 共享缓存
 
     # Browser Use 配置
     BROWSER_USE_API_KEY: Optional[str] = None
-    BROWSER_HEADLESS: bool = False
+    BROWSER_HEADLESS: bool = False  # 没有显示器时总是无头
+    BROWSER_BLOCK_RESOURCES: bool = True  # 非视觉提取时拦截图片/视频/字体和统计请求
     BROWSER_USE_VISION: bool = False
 
+    # 浏览器池配置
+    BROWSER_POOL_SIZE: int = 2  # 池中最多同时存在的浏览器数量
+    BROWSER_POOL_WARM_SIZE: int = 1  # 启动时预热的浏览器数量
+    BROWSER_POOL_MAX_USES: int = 20  # 单个浏览器被借出多少次后回收重建
+    BROWSER_POOL_IDLE_TIMEOUT: int = 600  # 空闲多少秒后关闭（秒）
+
+    # 详情收集自适应并发（AIMD）
+    DETAIL_CONCURRENCY_INITIAL: int = 1  # 初始并发上限
+    DETAIL_CONCURRENCY_MAX: int = 2  # 并发上限的上界（使用浏览器池时 worker 数不超过 BROWSER_POOL_SIZE，需要同时调大）
+    DETAIL_LATENCY_TARGET: float = 60.0  # 单个帖子的健康耗时（秒），超过时不再提高并发
+
+    # 详情收集重试策略
+    RETRY_BREAKER_THRESHOLD: int = 5  # 连续多少次过载失败（超时/访问频繁/LLM 429）后熔断
+    RETRY_BREAKER_RESET_TIMEOUT: float = 60.0  # 熔断后多久放行试探请求（秒）
+
+    # Scout 缓存配置
+    SCOUT_CACHE_TTL: int = 21600  # Scout 报告复用时长（秒）
+
+    # 增量收集配置
+    SEEN_POSTS_LIKES_THRESHOLD: float = 0.2  # 点赞数相对变化超过该比例时重新抓取详情
+
     # 携程 API（可选）
     CTRIP_API_KEY: Optional[str] = None
     CTRIP_API_SECRET: Optional[str] = None
@@ -56,6 +89,7 @@ class Settings(BaseSettings):
     # 任务队列
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    TASK_QUEUE_WORKERS: int = 2  # 进程内收集任务 worker 数量
 
     # 存储配置
     STORAGE_TYPE: str = "local"  # local | s3 | oss
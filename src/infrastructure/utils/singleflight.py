@@ -0,0 +1,54 @@
+"""
+请求合并（single-flight）
+
+同一个键的并发调用只执行一次，其余调用方等待同一个结果。
+"""
+
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+import asyncio
+
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """按键合并并发的异步调用"""
+
+    def __init__(self):
+        """初始化"""
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行调用（同键的并发调用共享一次执行）
+
+        实际执行放在独立的 Task 中，发起者被取消（如客户端断开）
+        不会影响其他等待同一结果的调用方。
+
+        Args:
+            key: 合并键
+            fn: 无参异步函数
+
+        Returns:
+            调用结果（异常同样会传递给所有调用方）
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """键是否有正在执行的调用"""
+        return key in self._calls
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """调用结束后移除记录"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        # 标记异常已读取，避免所有调用方都被取消时出现未处理异常警告
+        if not task.cancelled():
+            task.exception()
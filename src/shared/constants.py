@@ -14,6 +14,7 @@ MAX_PAGE_SIZE = 100
 CACHE_TTL_SHORT = 300  # 5分钟
 CACHE_TTL_MEDIUM = 1800  # 30分钟
 CACHE_TTL_LONG = 3600  # 1小时
+GUIDE_CACHE_TTL = CACHE_TTL_MEDIUM  # 目的地攻略收集结果
 
 # 任务
 MAX_RETRIES = 3
@@ -26,3 +27,22 @@ XHS_SEARCH_URL = f"{XHS_BASE_URL}/search_result"
 # AI 模型
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 GEMINI_TEMPERATURE = 0.7
+
+# 目的地别称（搜索时双向扩展）
+DESTINATION_SYNONYMS = {
+    "成都": ["蓉城", "锦城"],
+    "北京": ["京城", "帝都"],
+    "上海": ["魔都", "申城"],
+    "广州": ["羊城", "花城"],
+    "重庆": ["山城", "雾都"],
+    "杭州": ["杭城"],
+    "西安": ["长安"],
+    "南京": ["金陵"],
+    "深圳": ["鹏城"],
+    "武汉": ["江城"],
+    "厦门": ["鹭岛"],
+    "苏州": ["姑苏"],
+    "昆明": ["春城"],
+    "哈尔滨": ["冰城"],
+    "拉萨": ["日光城"],
+}
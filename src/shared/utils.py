@@ -0,0 +1,86 @@
+"""
+共享工具函数
+"""
+
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import re
+
+from .constants import XHS_BASE_URL
+
+
+# 小红书笔记 ID：24 位十六进制，出现在详情页路径中
+# 如 /explore/<note_id>?xsec_token=...、/discovery/item/<note_id>、/search_result/<note_id>
+NOTE_ID_PATTERN = re.compile(r"/(?:explore|discovery/item|search_result)/([0-9a-f]{24})(?:[/?#]|$)")
+
+
+def parse_note_id(url: Optional[str]) -> Optional[str]:
+    """
+    从帖子链接中解析小红书笔记 ID
+
+    Args:
+        url: 帖子链接（绝对或相对路径均可）
+
+    Returns:
+        笔记 ID，无法解析返回 None
+    """
+    if not url:
+        return None
+
+    path = urlparse(str(url).strip()).path
+    match = NOTE_ID_PATTERN.search(path + "/")
+    return match.group(1) if match else None
+
+
+def resolve_post_url(post: Dict) -> Optional[str]:
+    """
+    从列表数据中解析帖子详情页的绝对 URL
+
+    列表阶段由 AI 提取，字段名不固定（url / url_link / link），
+    且经常是 "/explore/<note_id>?xsec_token=..." 这样的相对路径。
+
+    Args:
+        post: posts_list.json 中的单个帖子
+
+    Returns:
+        绝对 URL，没有链接时返回 None
+    """
+    for key in ("url", "url_link", "link"):
+        url = post.get(key)
+        if isinstance(url, str) and url.strip():
+            url = url.strip()
+            if url.startswith("//"):
+                return f"https:{url}"
+            if url.startswith("/"):
+                return f"{XHS_BASE_URL}{url}"
+            if url.startswith("http"):
+                return url
+    return None
+
+
+def parse_count(value) -> Optional[int]:
+    """
+    解析小红书的计数文本
+
+    Args:
+        value: 计数（如 1234、"1234"、"1.2万"、"10w+"、"999+"）
+
+    Returns:
+        整数，无法解析返回 None
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+
+    match = re.search(r"(\d+(?:\.\d+)?)\s*([万wW千kK]?)", value.replace(",", ""))
+    if not match:
+        return None
+
+    number = float(match.group(1))
+    unit = match.group(2)
+    if unit in ("万", "w", "W"):
+        number *= 10000
+    elif unit in ("千", "k", "K"):
+        number *= 1000
+    return int(number)
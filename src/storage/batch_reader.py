@@ -0,0 +1,108 @@
+"""
+收集批次读取 - 将 collected_posts/batch_* 目录转换为 PostDetail
+
+批次目录结构（由 XiaohongshuCollector 写入）：
+- posts_list.json: {"posts": [...]} 列表阶段的帖子
+- post_N.json: 第 N 个帖子的详情，{"note_id", "data": {...}} 或 {"error": ...}
+- summary.json: 汇总信息，skipped 中记录增量收集跳过的帖子及其上次所在批次
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..core.domain.models.post import PostDetail
+from ..shared.utils import parse_count, parse_note_id, resolve_post_url
+
+
+def load_batch(batch_dir) -> List[PostDetail]:
+    """
+    读取一个批次目录
+
+    帖子以小红书笔记 ID 作为 post_id（解析不到时使用 "<批次名>_<序号>"），
+    同一笔记在列表中重复出现时只保留一次；增量收集中跳过的帖子
+    从 summary.json 记录的上次批次读取详情。
+
+    Args:
+        batch_dir: 批次目录
+
+    Returns:
+        帖子详情列表（详情收集失败的帖子不包含在内）
+    """
+    batch_dir = Path(batch_dir)
+    list_file = batch_dir / "posts_list.json"
+    if not list_file.exists():
+        return []
+
+    with open(list_file, 'r', encoding='utf-8') as f:
+        list_data = json.load(f)
+    posts_list = list_data.get("posts", []) if isinstance(list_data, dict) else list_data
+
+    skipped: Dict[int, Dict] = {}
+    summary_file = batch_dir / "summary.json"
+    if summary_file.exists():
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            skipped = {
+                item["post_index"]: item
+                for item in json.load(f).get("skipped", [])
+            }
+
+    posts: Dict[str, PostDetail] = {}
+    for i, list_post in enumerate(posts_list, 1):
+        if i in skipped:
+            previous = skipped[i]
+            detail_file = Path(previous["batch_dir"]) / f"post_{previous['previous_index']}.json"
+        else:
+            detail_file = batch_dir / f"post_{i}.json"
+        if not detail_file.exists():
+            continue
+
+        with open(detail_file, 'r', encoding='utf-8') as f:
+            detail = json.load(f)
+
+        post = to_post_detail(list_post, detail, f"{batch_dir.name}_{i}")
+        if post is not None and post.post_id not in posts:
+            posts[post.post_id] = post
+
+    return list(posts.values())
+
+
+def to_post_detail(
+    list_post: Dict,
+    detail: Dict,
+    fallback_id: str
+) -> Optional[PostDetail]:
+    """
+    合并列表数据和详情数据为 PostDetail
+
+    Args:
+        list_post: posts_list.json 中的帖子
+        detail: post_N.json 的内容
+        fallback_id: 无法解析笔记 ID 时使用的 ID
+
+    Returns:
+        PostDetail，详情收集失败时返回 None
+    """
+    data = detail.get("data")
+    if "error" in detail or not isinstance(data, dict) or "error" in data:
+        return None
+
+    url = resolve_post_url(list_post) or ""
+    note_id = detail.get("note_id") or list_post.get("note_id") or parse_note_id(url)
+
+    def count(value) -> int:
+        return parse_count(value) or 0
+
+    return PostDetail(
+        post_id=note_id or fallback_id,
+        url=url,
+        title=data.get("title") or list_post.get("title", ""),
+        content=data.get("content", ""),
+        author=data.get("author") or list_post.get("author", ""),
+        likes=count(data.get("likes", list_post.get("likes"))),
+        comments=count(data.get("comments_count", data.get("comments"))),
+        collects=count(data.get("collections", data.get("collects"))),
+        images=data.get("images", []),
+        tags=data.get("tags", []),
+        publish_time=data.get("publish_time"),
+        location=data.get("location")
+    )
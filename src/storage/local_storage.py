@@ -2,26 +2,40 @@
 本地文件存储 - 简单的 JSON 文件存储
 
 使用文件系统作为存储，避免数据库依赖。
+攻略的列表和筛选通过 SQLite 索引（post_index）完成，不再逐个解析 JSON 文件；
+单篇攻略的读取经过进程内 LRU 缓存（post_cache），文件未变化时不做磁盘解析。
+按目的地检索使用全文检索索引（GuideSearchIndex），支持别称和相关性排序。
+批量写入（save_posts / import_batches）在一个索引事务内完成，并集中 fsync。
+统计分析使用列式快照（analytics.PostMetrics），直接从 SQLite 索引按列读取。
 """
 
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 
 from ..core.domain.models.post import PostDetail
 from ..core.domain.models.travel import TravelPlan
+from ..infrastructure.analytics import PostMetrics
+from ..infrastructure.search import GuideSearchIndex
+from .post_index import PostIndex
+from .post_cache import PostCache, file_version
+from .batch_reader import load_batch
 
 
 class LocalStorage:
     """本地文件存储"""
 
-    def __init__(self, data_dir: str = "./data"):
+    def __init__(self, data_dir: str = "./data", cache_size: int = 1024):
         """
         初始化本地存储
 
         Args:
             data_dir: 数据目录路径
+            cache_size: 攻略 LRU 缓存容量
         """
         self.data_dir = Path(data_dir)
         self.posts_dir = self.data_dir / "posts"
@@ -31,14 +45,126 @@ class LocalStorage:
         self.posts_dir.mkdir(parents=True, exist_ok=True)
         self.plans_dir.mkdir(parents=True, exist_ok=True)
 
+        # 解析后的攻略缓存（按文件 mtime/大小失效）
+        self.cache = PostCache(max_size=cache_size)
+
+        # 攻略索引：启动时只重新解析新增或修改过的文件
+        self.index = PostIndex(self.data_dir / "posts_index.sqlite3")
+        self.index.sync(self.posts_dir, self._load_post_file)
+
+        # 全文检索索引：首次检索时从 SQLite 索引构建，之后按变更日志只应用变化的帖子
+        self.search_index = GuideSearchIndex()
+        self._search_marker: Optional[int] = None
+        self._search_lock = threading.Lock()
+
+        # 列式指标快照：索引签名变化时重新生成
+        self._metrics: Optional[PostMetrics] = None
+        self._metrics_signature: Optional[tuple] = None
+        self._metrics_lock = threading.Lock()
+
     # ==================== 攻略存储 ====================
 
     def save_post(self, post: PostDetail) -> None:
         """保存攻略"""
         file_path = self.posts_dir / f"{post.post_id}.json"
 
-        # 转换为字典
-        data = {
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self._to_dict(post), f, ensure_ascii=False, indent=2)
+
+        # 同步更新索引和缓存
+        self.index.upsert(post, file_path.name, file_path.stat().st_mtime)
+        self.cache.put(post.post_id, file_version(file_path), post)
+
+    def save_posts(self, posts: Iterable[PostDetail], durable: bool = True) -> int:
+        """
+        批量保存攻略
+
+        与逐个 save_post 相比：JSON 写为紧凑格式，索引在一个事务内更新，
+        fsync 在全部文件写完后集中进行（目录只 fsync 一次）。
+        同一 post_id 出现多次时以最后一次为准。
+
+        Args:
+            posts: 攻略序列
+            durable: 是否在返回前 fsync 到磁盘
+
+        Returns:
+            保存的攻略数量
+        """
+        unique: Dict[str, PostDetail] = {post.post_id: post for post in posts}
+        if not unique:
+            return 0
+
+        written = []
+        for post in unique.values():
+            file_path = self.posts_dir / f"{post.post_id}.json"
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self._to_dict(post), f, ensure_ascii=False, separators=(",", ":"))
+            written.append((post, file_path))
+
+        if durable:
+            for _, file_path in written:
+                fd = os.open(file_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._fsync_dir(self.posts_dir)
+
+        versions = [(post, file_path, os.stat(file_path)) for post, file_path in written]
+        self.index.upsert_many(
+            (post, file_path.name, stat.st_mtime) for post, file_path, stat in versions
+        )
+        for post, _, stat in versions:
+            self.cache.put(post.post_id, (stat.st_mtime_ns, stat.st_size), post)
+
+        return len(written)
+
+    def import_batches(
+        self,
+        collected_dir: str = "./collected_posts",
+        workers: int = 4
+    ) -> int:
+        """
+        导入收集目录下全部 batch_* 批次（并行解析，一次批量写入）
+
+        按批次名（时间戳）顺序合并，同一笔记以最新批次为准。
+
+        Args:
+            collected_dir: 收集目录
+            workers: 并行解析的线程数
+
+        Returns:
+            导入的攻略数量
+        """
+        batch_dirs = sorted(
+            path for path in Path(collected_dir).glob("batch_*") if path.is_dir()
+        )
+        if not batch_dirs:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(load_batch, batch_dirs))
+
+        return self.save_posts(post for batch in batches for post in batch)
+
+    @staticmethod
+    def _fsync_dir(dir_path: Path) -> None:
+        """fsync 目录（使新建文件的目录项持久化，不支持的平台忽略）"""
+        try:
+            fd = os.open(dir_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _to_dict(post: PostDetail) -> dict:
+        """PostDetail 转换为存储格式"""
+        return {
             "post_id": post.post_id,
             "url": post.url,
             "title": post.title,
@@ -55,19 +181,23 @@ class LocalStorage:
             "saved_at": datetime.now().isoformat()
         }
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
     def get_post(self, post_id: str) -> Optional[PostDetail]:
         """获取单个攻略"""
         file_path = self.posts_dir / f"{post_id}.json"
+        return self.cache.get(post_id, file_path, self._load_post_file)
 
-        if not file_path.exists():
+    def _load_post_file(self, file_path: Path) -> Optional[PostDetail]:
+        """解析攻略文件（失败返回 None）"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return self._to_post(json.load(f))
+        except Exception as e:
+            print(f"读取文件失败 {file_path}: {e}")
             return None
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
+    @staticmethod
+    def _to_post(data: dict) -> PostDetail:
+        """字典转换为 PostDetail"""
         return PostDetail(
             post_id=data["post_id"],
             url=data["url"],
@@ -83,44 +213,83 @@ class LocalStorage:
             location=data.get("location")
         )
 
-    def get_all_posts(self) -> List[PostDetail]:
-        """获取所有攻略"""
-        posts = []
-        for file_path in self.posts_dir.glob("*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                post = PostDetail(
-                    post_id=data["post_id"],
-                    url=data["url"],
-                    title=data["title"],
-                    content=data["content"],
-                    author=data["author"],
-                    likes=data["likes"],
-                    comments=data["comments"],
-                    collects=data["collects"],
-                    images=data.get("images", []),
-                    tags=data.get("tags", []),
-                    publish_time=data.get("publish_time"),
-                    location=data.get("location")
-                )
-                posts.append(post)
-            except Exception as e:
-                print(f"读取文件失败 {file_path}: {e}")
-                continue
+    def get_all_posts(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[PostDetail]:
+        """
+        获取所有攻略（按互动率排序）
 
-        # 按互动率排序
-        posts.sort(key=lambda p: p.engagement_rate, reverse=True)
-        return posts
+        Args:
+            limit: 最大数量（None 表示全部）
+            offset: 偏移量
+        """
+        return self.index.list_posts(limit=limit, offset=offset)
 
-    def get_posts_by_destination(self, destination: str) -> List[PostDetail]:
-        """按目的地获取攻略"""
-        all_posts = self.get_all_posts()
-        return [
-            p for p in all_posts
-            if destination in p.title or destination in p.content or destination in p.tags
+    def get_posts_by_destination(
+        self,
+        destination: str,
+        limit: Optional[int] = None
+    ) -> List[PostDetail]:
+        """按目的地获取攻略（全文检索，按相关性与互动率综合排序）"""
+        self._refresh_search_index()
+        post_ids = [
+            post_id for post_id, _ in self.search_index.search(destination, limit=limit)
         ]
+        return self.index.get_many(post_ids)
+
+    def _refresh_search_index(self) -> None:
+        """
+        同步全文检索索引：首次全量构建，之后只应用变更日志中新增、修改或删除的帖子
+        （包括本进程的 save_post 和其他进程对索引的写入）
+        """
+        with self._search_lock:
+            if self._search_marker is None:
+                # 先取日志位置再全量读取，期间的写入会在下次同步时重复应用（幂等）
+                marker = self.index.change_marker()
+                self.search_index.add_many(self.index.list_posts())
+                self._search_marker = marker
+                return
+
+            updated, removed, marker = self.index.changes_since(self._search_marker)
+            self.search_index.add_many(updated)
+            for post_id in removed:
+                self.search_index.remove(post_id)
+            self._search_marker = marker
+
+    def post_metrics(self) -> PostMetrics:
+        """
+        攻略指标列式快照（索引未变化时复用上次的快照）
+
+        Returns:
+            PostMetrics
+        """
+        with self._metrics_lock:
+            signature = self.index.signature()
+            if self._metrics is None or signature != self._metrics_signature:
+                self._metrics = PostMetrics.from_columns(self.index.metric_columns())
+                self._metrics_signature = signature
+            return self._metrics
+
+    def get_posts_by_tag(
+        self,
+        tag: str,
+        limit: Optional[int] = None
+    ) -> List[PostDetail]:
+        """按标签获取攻略（倒排索引精确匹配）"""
+        return self.index.find_by_term(tag, limit=limit)
+
+    def reindex(self) -> int:
+        """
+        与磁盘文件重新同步索引（外部直接写入 JSON 文件后调用）
+
+        Returns:
+            重新索引的文件数量
+        """
+        changed = self.index.sync(self.posts_dir, self._load_post_file)
+        self._refresh_search_index()
+        return changed
 
     # ==================== 旅行计划存储 ====================
 
@@ -0,0 +1,115 @@
+"""
+攻略 LRU 缓存 - 进程内缓存解析后的 PostDetail
+
+以文件的 mtime 和大小作为版本号：文件被其他进程改写后自动失效；
+通过 LocalStorage.save_post 写入时直接更新缓存。
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from ..core.domain.models.post import PostDetail
+
+
+# (mtime_ns, size)
+FileVersion = Tuple[int, int]
+
+
+def file_version(file_path: Path) -> Optional[FileVersion]:
+    """读取文件版本（文件不存在返回 None）"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PostCache:
+    """有界 LRU 缓存：post_id → PostDetail"""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最多缓存的帖子数量
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[FileVersion, PostDetail]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        post_id: str,
+        file_path: Path,
+        loader: Callable[[Path], Optional[PostDetail]]
+    ) -> Optional[PostDetail]:
+        """
+        获取帖子（版本一致时命中缓存，否则调用 loader 重新解析）
+
+        Args:
+            post_id: 帖子 ID
+            file_path: 帖子文件路径
+            loader: 文件解析函数
+
+        Returns:
+            帖子，文件不存在或解析失败返回 None
+        """
+        version = file_version(file_path)
+        if version is None:
+            self.invalidate(post_id)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(post_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        post = loader(file_path)
+        if post is not None:
+            self.put(post_id, version, post)
+        return post
+
+    def put(self, post_id: str, version: FileVersion, post: PostDetail) -> None:
+        """
+        写入缓存
+
+        Args:
+            post_id: 帖子 ID
+            version: 文件版本
+            post: 帖子
+        """
+        with self._lock:
+            self._entries[post_id] = (version, post)
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, post_id: str) -> None:
+        """移除缓存项"""
+        with self._lock:
+            self._entries.pop(post_id, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """命中统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
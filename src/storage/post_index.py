@@ -0,0 +1,373 @@
+"""
+攻略索引 - 基于 SQLite 的持久化查询索引
+
+LocalStorage 以 JSON 文件为主存储，本索引保存解析后的字段、互动率，
+以及标签/地点的倒排表，使列表和筛选不再需要逐个读取、解析 JSON 文件。
+
+表结构：
+- posts: 帖子字段 + engagement_rate（已建索引，按互动率排序无需全表排序）
+- post_terms: (term, post_id) 倒排表，term 来自标签和地点
+- post_changes: 变更日志，每个 post_id 一行，seq 在每次写入/删除时递增，
+  供内存中的全文检索索引只应用变化的帖子
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.domain.models.post import PostDetail
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    url TEXT,
+    title TEXT,
+    content TEXT,
+    author TEXT,
+    likes INTEGER,
+    comments INTEGER,
+    collects INTEGER,
+    images TEXT,
+    tags TEXT,
+    publish_time TEXT,
+    location TEXT,
+    engagement_rate REAL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_engagement ON posts (engagement_rate DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_file ON posts (file_name);
+CREATE TABLE IF NOT EXISTS post_terms (
+    term TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    PRIMARY KEY (term, post_id)
+);
+CREATE INDEX IF NOT EXISTS idx_post_terms_post ON post_terms (post_id);
+CREATE TABLE IF NOT EXISTS post_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_id TEXT NOT NULL UNIQUE
+);
+"""
+
+POST_COLUMNS = (
+    "post_id, url, title, content, author, likes, comments, collects, "
+    "images, tags, publish_time, location"
+)
+
+# 单条语句的参数个数上限（旧版 SQLite 的 SQLITE_MAX_VARIABLE_NUMBER 为 999）
+MAX_SQL_PARAMS = 900
+
+
+def normalize_term(term: str) -> str:
+    """标签/地点归一化（去掉 # 前缀和空白）"""
+    return term.strip().lstrip("#").strip()
+
+
+class PostIndex:
+    """攻略查询索引"""
+
+    def __init__(self, db_path: Path):
+        """
+        初始化索引
+
+        Args:
+            db_path: SQLite 文件路径
+        """
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        打开连接（每次操作独立连接，支持多进程共享同一个索引文件）
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ==================== 写入 ====================
+
+    def upsert(self, post: PostDetail, file_name: str, mtime: float) -> None:
+        """
+        写入或更新帖子
+
+        Args:
+            post: 帖子
+            file_name: 对应的 JSON 文件名
+            mtime: 文件修改时间
+        """
+        with self._connect() as conn:
+            self._upsert(conn, post, file_name, mtime)
+
+    def upsert_many(self, entries: Iterable[Tuple[PostDetail, str, float]]) -> int:
+        """
+        批量写入或更新帖子（单个事务）
+
+        Args:
+            entries: (帖子, JSON 文件名, 文件修改时间) 序列
+
+        Returns:
+            写入的帖子数量
+        """
+        count = 0
+        with self._connect() as conn:
+            for post, file_name, mtime in entries:
+                self._upsert(conn, post, file_name, mtime)
+                count += 1
+        return count
+
+    def remove(self, post_id: str) -> None:
+        """删除帖子"""
+        with self._connect() as conn:
+            self._delete(conn, post_id)
+
+    def sync(self, posts_dir: Path, loader) -> int:
+        """
+        与目录中的 JSON 文件同步（只重新解析新增或修改过的文件）
+
+        Args:
+            posts_dir: 攻略目录
+            loader: 文件解析函数 (Path) -> Optional[PostDetail]
+
+        Returns:
+            重新索引的文件数量
+        """
+        with self._connect() as conn:
+            indexed: Dict[str, tuple] = {
+                file_name: (post_id, mtime)
+                for post_id, file_name, mtime in conn.execute(
+                    "SELECT post_id, file_name, mtime FROM posts"
+                )
+            }
+
+            changed = 0
+            seen = set()
+            with os.scandir(posts_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    mtime = entry.stat().st_mtime
+                    if entry.name in indexed and indexed[entry.name][1] == mtime:
+                        continue
+
+                    post = loader(Path(entry.path))
+                    if post is None:
+                        continue
+                    self._upsert(conn, post, entry.name, mtime)
+                    changed += 1
+
+            # 文件已被删除的记录
+            for file_name, (post_id, _) in indexed.items():
+                if file_name not in seen:
+                    self._delete(conn, post_id)
+
+        return changed
+
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        post: PostDetail,
+        file_name: str,
+        mtime: float
+    ) -> None:
+        """在已打开的连接中写入帖子及其倒排项"""
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO posts (
+                post_id, file_name, mtime, url, title, content, author,
+                likes, comments, collects, images, tags, publish_time,
+                location, engagement_rate
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                post.post_id, file_name, mtime, post.url, post.title,
+                post.content, post.author, post.likes, post.comments,
+                post.collects,
+                json.dumps(post.images, ensure_ascii=False),
+                json.dumps(post.tags, ensure_ascii=False),
+                post.publish_time, post.location, post.engagement_rate,
+            )
+        )
+
+        terms = {normalize_term(tag) for tag in post.tags}
+        if post.location:
+            terms.add(normalize_term(post.location))
+        terms.discard("")
+
+        conn.execute("DELETE FROM post_terms WHERE post_id = ?", (post.post_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO post_terms (term, post_id) VALUES (?, ?)",
+            [(term, post.post_id) for term in terms]
+        )
+        self._log_change(conn, post.post_id)
+
+    def _delete(self, conn: sqlite3.Connection, post_id: str) -> None:
+        """在已打开的连接中删除帖子及其倒排项"""
+        conn.execute("DELETE FROM post_terms WHERE post_id = ?", (post_id,))
+        conn.execute("DELETE FROM posts WHERE post_id = ?", (post_id,))
+        self._log_change(conn, post_id)
+
+    @staticmethod
+    def _log_change(conn: sqlite3.Connection, post_id: str) -> None:
+        """记录变更（REPLACE 删除旧行，新行获得更大的 seq）"""
+        conn.execute("INSERT OR REPLACE INTO post_changes (post_id) VALUES (?)", (post_id,))
+
+    # ==================== 查询 ====================
+
+    def count(self) -> int:
+        """帖子总数"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def signature(self) -> tuple:
+        """
+        索引内容签名（帖子数量 + 最新修改时间）
+
+        用于发现其他进程对索引的写入。
+        """
+        with self._connect() as conn:
+            return tuple(conn.execute("SELECT COUNT(*), MAX(mtime) FROM posts").fetchone())
+
+    def change_marker(self) -> int:
+        """当前变更日志位置（最大 seq，空日志为 0）"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM post_changes").fetchone()[0]
+
+    def changes_since(self, marker: int) -> Tuple[List[PostDetail], List[str], int]:
+        """
+        读取某个日志位置之后变化的帖子（包括其他进程的写入）
+
+        Args:
+            marker: 上次读取到的日志位置（见 change_marker）
+
+        Returns:
+            (新增或修改的帖子, 已删除的帖子 ID, 新的日志位置)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, post_id FROM post_changes WHERE seq > ? ORDER BY seq",
+                (marker,)
+            ).fetchall()
+        if not rows:
+            return [], [], marker
+
+        post_ids = [post_id for _, post_id in rows]
+        updated = self.get_many(post_ids)
+        present = {post.post_id for post in updated}
+        removed = [post_id for post_id in post_ids if post_id not in present]
+        return updated, removed, rows[-1][0]
+
+    def metric_columns(self) -> Dict[str, tuple]:
+        """
+        按列读取指标字段（构造 analytics.PostMetrics 快照用，不解析 JSON 字段）
+
+        Returns:
+            列名 → 值元组（post_id / author / destination / likes / comments / collects / publish_time）
+        """
+        names = ("post_id", "author", "destination", "likes", "comments", "collects", "publish_time")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT post_id, author, location, likes, comments, collects, publish_time "
+                "FROM posts"
+            ).fetchall()
+        columns = list(zip(*rows)) if rows else [() for _ in names]
+        return dict(zip(names, columns))
+
+    def get_many(self, post_ids: List[str]) -> List[PostDetail]:
+        """
+        按 ID 批量读取帖子（保持传入顺序，不存在的 ID 跳过）
+
+        Args:
+            post_ids: 帖子 ID 列表
+
+        Returns:
+            帖子列表
+        """
+        if not post_ids:
+            return []
+
+        rows = []
+        with self._connect() as conn:
+            # 分块查询，避免超出 SQLite 的参数个数上限
+            for start in range(0, len(post_ids), MAX_SQL_PARAMS):
+                chunk = post_ids[start:start + MAX_SQL_PARAMS]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows.extend(conn.execute(
+                    f"SELECT {POST_COLUMNS} FROM posts WHERE post_id IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        posts = {row[0]: self._row_to_post(row) for row in rows}
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+    def list_posts(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[PostDetail]:
+        """
+        按互动率降序列出帖子
+
+        Args:
+            limit: 最大数量（None 表示全部）
+            offset: 偏移量
+
+        Returns:
+            帖子列表
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {POST_COLUMNS} FROM posts "
+                "ORDER BY engagement_rate DESC LIMIT ? OFFSET ?",
+                (limit if limit is not None else -1, offset)
+            ).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def find_by_term(self, term: str, limit: Optional[int] = None) -> List[PostDetail]:
+        """
+        通过倒排表按标签/地点精确查找
+
+        Args:
+            term: 标签或地点
+            limit: 最大数量
+
+        Returns:
+            帖子列表（按互动率降序）
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {POST_COLUMNS} FROM posts "
+                "WHERE post_id IN (SELECT post_id FROM post_terms WHERE term = ?) "
+                "ORDER BY engagement_rate DESC LIMIT ?",
+                (normalize_term(term), limit if limit is not None else -1)
+            ).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    @staticmethod
+    def _row_to_post(row: tuple) -> PostDetail:
+        """数据库行转换为 PostDetail"""
+        (post_id, url, title, content, author, likes, comments, collects,
+         images, tags, publish_time, location) = row
+        return PostDetail(
+            post_id=post_id,
+            url=url,
+            title=title,
+            content=content,
+            author=author,
+            likes=likes,
+            comments=comments,
+            collects=collects,
+            images=json.loads(images) if images else [],
+            tags=json.loads(tags) if tags else [],
+            publish_time=publish_time,
+            location=location
+        )
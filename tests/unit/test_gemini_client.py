@@ -0,0 +1,116 @@
+"""
+GeminiClient 响应缓存测试
+"""
+
+import pytest
+
+from src.infrastructure.external.ai.gemini_client import GeminiClient
+from src.infrastructure.external.ai.response_cache import LLMResponseCache
+from src.infrastructure.utils.config import settings
+
+
+class FakeResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """记录调用次数的 LangChain 客户端替身"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return FakeResponse(self.content)
+
+
+@pytest.fixture
+def client(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), max_temperature=0.3)
+    client = GeminiClient(api_key="test-key", cache=cache)
+    llms = {}
+
+    def get_llm(temperature):
+        return llms.setdefault(temperature, FakeLLM('```json\n{"attractions": ["宽窄巷子"]}\n```'))
+
+    client._get_llm = get_llm
+    client.fake_llms = llms
+    return client
+
+
+def test_explicit_zero_temperature_is_kept(tmp_path):
+    client = GeminiClient(api_key="test-key", temperature=0.0, cache=LLMResponseCache(cache_dir=str(tmp_path)))
+    assert client.temperature == 0.0
+    assert client.cache.is_cacheable(client.temperature)
+
+
+@pytest.mark.asyncio
+async def test_structured_extraction_served_from_cache(client):
+    schema = {"attractions": ["string"]}
+
+    first = await client.extract_structured_data("成都攻略", schema)
+    second = await client.extract_structured_data("成都攻略", schema)
+
+    assert first == second == {"attractions": ["宽窄巷子"]}
+    llm = client.fake_llms[settings.GEMINI_EXTRACTION_TEMPERATURE]
+    assert llm.calls == 1
+    assert client.cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_default_temperature_chat_not_cached(client):
+    await client.chat("生成行程")
+    await client.chat("生成行程")
+
+    assert client.fake_llms[client.temperature].calls == 2
+
+
+class PromptRecordingLLM:
+    """记录每次请求提示词的 LangChain 客户端替身"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1][1]
+        self.prompts.append(prompt)
+        return FakeResponse(f"要点{len(self.prompts)}")
+
+
+@pytest.mark.asyncio
+async def test_condense_reuses_cached_map_summaries(client, monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_BATCH_MAX_CHARS", 50)
+    llm = PromptRecordingLLM()
+    client._get_llm = lambda temperature: llm
+    guides = ["宽窄巷子" * 10, "锦里" * 20]
+
+    await client._condense_guides(guides, "成都")
+    first_calls = len(llm.prompts)
+    await client._condense_guides(guides + ["春熙路" * 15], "成都")
+
+    new_prompts = llm.prompts[first_calls:]
+    assert first_calls == 2
+    assert len(new_prompts) == 1
+    assert "春熙路" in new_prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_entity_fields_normalized_to_names(client):
+    async def extract_batch(texts):
+        return [{
+            "index": 1,
+            "attractions": [{"name": "宽窄巷子"}, "锦里", {"title": "无名称"}, 3, " "],
+            "restaurants": "陈麻婆豆腐",
+            "prices": [{"item": "门票", "price": 50}, {"price": 10}, "免费"],
+        }]
+
+    client._extract_batch = extract_batch
+    results = await client.extract_guide_entities(["成都攻略"])
+
+    assert results == [{
+        "attractions": ["宽窄巷子", "锦里"],
+        "restaurants": ["陈麻婆豆腐"],
+        "prices": [{"item": "门票", "price": 50}],
+    }]
@@ -0,0 +1,44 @@
+"""
+LocalStorage 全文检索索引增量同步测试
+"""
+
+from src.core.domain.models.post import PostDetail
+from src.storage.local_storage import LocalStorage
+
+
+def make_post(post_id: str, title: str) -> PostDetail:
+    return PostDetail(
+        post_id=post_id,
+        url=f"https://www.xiaohongshu.com/explore/{post_id}",
+        title=title,
+        content=title,
+        author="作者",
+        likes=10,
+        comments=1,
+        collects=2,
+    )
+
+
+def test_search_index_applies_only_changed_posts(tmp_path):
+    storage = LocalStorage(data_dir=str(tmp_path))
+    storage.save_posts([make_post("a1", "成都美食"), make_post("b2", "重庆火锅")])
+    assert [p.post_id for p in storage.get_posts_by_destination("成都")] == ["a1"]
+
+    # 另一个进程写入和删除（共享同一个 SQLite 索引）
+    other = LocalStorage(data_dir=str(tmp_path))
+    other.save_post(make_post("c3", "成都熊猫基地"))
+    other.index.remove("a1")
+
+    applied = []
+    add_many = storage.search_index.add_many
+
+    def recording_add_many(posts):
+        posts = list(posts)
+        applied.extend(post.post_id for post in posts)
+        add_many(posts)
+
+    storage.search_index.add_many = recording_add_many
+
+    assert [p.post_id for p in storage.get_posts_by_destination("成都")] == ["c3"]
+    assert applied == ["c3"]
+    assert "b2" in storage.search_index
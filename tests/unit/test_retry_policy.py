@@ -0,0 +1,25 @@
+"""
+失败分类测试
+"""
+
+import pytest
+
+from src.infrastructure.external.xiaohongshu.retry_policy import LLM_QUOTA, classify_failure
+
+
+@pytest.mark.parametrize("message", [
+    "429 RESOURCE_EXHAUSTED",
+    "Error code: 429",
+    "HTTP/1.1 429",
+    "status_code=429",
+])
+def test_quota_status_codes(message):
+    assert classify_failure(Exception(message)) == LLM_QUOTA
+
+
+@pytest.mark.parametrize("message", [
+    "failed to open https://www.xiaohongshu.com/explore/64f1a4290000000013012345",
+    "note 6429abc not found",
+])
+def test_429_inside_ids_is_not_quota(message):
+    assert classify_failure(Exception(message)) != LLM_QUOTA
@@ -9,6 +9,7 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+import json
 import sys
 
 # 添加项目路径
@@ -159,6 +160,27 @@ async def api_get_posts(destination: str = None):
     }
 
 
+@app.get("/api/storage/stats")
+async def api_storage_stats():
+    """存储缓存统计 API"""
+    return {
+        "indexed_posts": storage.index.count(),
+        "post_cache": storage.cache.stats()
+    }
+
+
+@app.get("/api/analytics/destinations")
+async def api_destination_analytics(min_engagement_rate: float = 0.05):
+    """按目的地聚合的攻略指标 API（列式快照，向量化计算）"""
+    summary = storage.post_metrics().destination_summary(min_engagement_rate)
+    return {
+        "count": len(summary),
+        "destinations": json.loads(
+            summary.round(4).reset_index().to_json(orient="records", force_ascii=False)
+        )
+    }
+
+
 @app.get("/api/plans")
 async def api_get_plans():
     """获取旅行计划列表 API"""